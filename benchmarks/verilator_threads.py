@@ -0,0 +1,90 @@
+"""Compare Verilator build and run times across thread / -j settings.
+
+Usage: python benchmarks/verilator_threads.py [--lanes N] [--cycles N]
+
+Generates a wide synthetic datapath (independent pipelined lanes, so the
+model parallelizes well) and builds it once per configuration with the
+compile cache disabled. Skips when verilator is not installed.
+"""
+
+from __future__ import annotations
+import argparse
+import os
+import shutil
+import sys
+import time
+
+from fpga_testgen import simulator
+from fpga_testgen.config import settings
+
+
+def _design(lanes: int) -> str:
+    body = []
+    for i in range(lanes):
+        body.append(
+            f"    reg [31:0] acc{i}, mix{i};\n"
+            f"    always @(posedge clk) begin\n"
+            f"        mix{i} <= (seed ^ 32'd{i * 2654435761 % 2**32}) + (mix{i} << 3) - (mix{i} >> 5);\n"
+            f"        acc{i} <= acc{i} + (mix{i} * 32'd{i + 3}) ^ acc{i} >> 7;\n"
+            f"    end\n"
+        )
+    fold = " ^ ".join(f"acc{i}" for i in range(lanes))
+    return (
+        "module bench(input clk, input [31:0] seed, output [31:0] out);\n"
+        + "".join(body)
+        + f"    assign out = {fold};\nendmodule\n"
+    )
+
+
+def _testbench(cycles: int) -> str:
+    return f"""module bench_tb;
+    reg clk = 0;
+    wire [31:0] out;
+    bench dut(.clk(clk), .seed(32'hdeadbeef), .out(out));
+    always #1 clk = ~clk;
+    initial begin
+        repeat ({cycles}) @(posedge clk);
+        $display("PASS: %h", out);
+        $finish;
+    end
+endmodule
+"""
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--lanes", type=int, default=400)
+    parser.add_argument("--cycles", type=int, default=200_000)
+    args = parser.parse_args()
+
+    if not shutil.which("verilator"):
+        print("verilator not installed, skipping")
+        return 0
+
+    design, tb = [_design(args.lanes)], _testbench(args.cycles)
+    cpus = os.cpu_count() or 1
+    configs = [(1, 1), (1, cpus), (min(4, cpus), cpus), (min(8, cpus), cpus)]
+    settings.compile_cache = False
+    settings.verilator_mt_min_lines = 0
+
+    print(f"{'threads':>7} {'-j':>4} {'build s':>9} {'run s':>8}")
+    for threads, jobs in dict.fromkeys(configs):
+        settings.verilator_threads = threads
+        settings.verilator_build_jobs = jobs
+        start = time.perf_counter()
+        compiled = simulator.compile_simulation(design, tb, "verilator")
+        built = time.perf_counter() - start
+        if compiled.failure:
+            print("\n".join(compiled.failure.errors), file=sys.stderr)
+            return 1
+        start = time.perf_counter()
+        result = simulator.run_simulation(compiled)
+        ran = time.perf_counter() - start
+        shutil.rmtree(compiled.workdir, ignore_errors=True)
+        status = "" if result.success else "  (FAILED)"
+        print(f"{threads:>7} {jobs:>4} {built:>9.2f} {ran:>8.2f}{status}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
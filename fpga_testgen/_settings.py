@@ -0,0 +1,62 @@
+"""Settings model (imported lazily through ``config``)."""
+
+import shutil
+from pathlib import Path
+from pydantic_settings import BaseSettings
+
+
+class Settings(BaseSettings):
+    gemini_api_key: str = ""
+    gemini_model: str = "gemini-3.1-pro-preview"
+    default_simulator: str = "iverilog"
+    max_retries: int = 3
+    sim_timeout: int = 30
+    sim_cpu_limit: int = 60  # seconds of CPU per job (RLIMIT_CPU), 0 = unlimited
+    sim_memory_limit_mb: int = 4096  # address space per process (RLIMIT_AS), 0 = unlimited
+    sim_max_output_mb: int = 1024  # any single file written (RLIMIT_FSIZE), 0 = unlimited
+    sim_max_vcd_mb: int = 512  # dump.vcd size cap, 0 = unlimited
+    sim_seeds: int = 1  # random seeds per testbench (+seed=1..N), merged coverage
+    sim_jobs: int = 0  # concurrent runs of one compiled testbench, 0 = CPU count
+    inline_output_kb: int = 64  # larger stdout/stderr is kept as head + tail, full text on disk
+    artifact_max_mb: int = 2048  # artifact store size before LRU eviction
+    core_budget: int = 0  # cores shared by all concurrent builds/runs, 0 = CPU count
+    verilator_build_jobs: int = 0  # make -j for Verilator builds, 0 = from core budget
+    verilator_threads: int = 0  # model threads (--threads), 0 = by design size (never by load)
+    verilator_max_threads: int = 8
+    verilator_mt_min_lines: int = 2000  # smaller designs are built single-threaded
+    verilator_opt: str = "-O3"
+    verilator_x_assign: str = "fast"
+    template_fast_path: bool = True
+    preflight: bool = True  # elaboration-only check before every full compile + run
+    coverage_target: float = 90.0
+    cache_dir: Path = Path.home() / ".cache" / "fpga-testgen"
+    compile_cache: bool = True
+    compile_cache_entries: int = 256
+    candidate_dedup: bool = True  # answer equivalent candidate testbenches from an index
+    candidate_index_entries: int = 256
+    near_duplicate_threshold: float = 0.9  # shingle Jaccard similarity flagged in the retry prompt
+    mutation_testing: bool = False  # score passing testbenches by mutation kill rate
+    max_mutants: int = 64
+    waveform_cache_entries: int = 64  # indexed VCDs kept for the web UI
+    history_enabled: bool = True  # record runs and reuse passing testbenches
+    history_db: Path | None = None  # default: <cache_dir>/history.db
+    sim_workers: str = ""  # comma-separated worker URLs (http://host:port); empty = simulate locally
+    worker_timeout: int = 900  # seconds to wait for one remote simulate call
+    worker_refresh: int = 30  # seconds between capability/load polls of the workers
+    worker_token: str = ""  # shared secret workers require and the dispatcher sends, empty = none
+    profile_dir: Path | None = None  # server: write a Chrome trace per generate/simulate request
+    profile_python: bool = False  # also cProfile Python hot paths (<trace>.prof)
+    server_port: int = 8000
+    shared_cache: bool = False  # passing LLM answers shared across processes (on in multi-worker serve)
+    shared_cache_mb: int = 512
+    drain_timeout: int = 60  # seconds a stopping server worker waits for in-flight requests
+
+    model_config = {"env_file": ".env", "extra": "ignore"}
+
+    @property
+    def has_iverilog(self) -> bool:
+        return shutil.which("iverilog") is not None
+
+    @property
+    def has_verilator(self) -> bool:
+        return shutil.which("verilator") is not None
@@ -0,0 +1,145 @@
+"""File-backed store for large run artifacts (logs, VCDs, testbenches)."""
+
+from __future__ import annotations
+import json
+import os
+import shutil
+import threading
+import time
+import uuid
+import zlib
+from collections.abc import Iterator
+from dataclasses import asdict, dataclass
+from functools import lru_cache
+from pathlib import Path
+from .config import settings
+
+CHUNK = 1 << 16
+
+_CONTENT_TYPES = {
+    "log": "text/plain; charset=utf-8",
+    "testbench": "text/plain; charset=utf-8",
+    "vcd": "text/plain; charset=utf-8",
+}
+
+
+@dataclass
+class Artifact:
+    id: str
+    name: str
+    kind: str  # "log" | "vcd" | "testbench"
+    size: int
+    created_at: float
+
+    @property
+    def content_type(self) -> str:
+        return _CONTENT_TYPES.get(self.kind, "application/octet-stream")
+
+
+class ArtifactStore:
+    """Artifacts as ``<id>`` data files plus ``<id>.json`` metadata.
+
+    The total size is capped at ``max_bytes``; the least recently used
+    artifacts are evicted first (reads refresh the mtime). The directory
+    may be shared by several processes: the running total is only
+    recounted from disk when it passes the cap, and entries another
+    process removes meanwhile are skipped.
+    """
+
+    def __init__(self, root: Path, max_bytes: int) -> None:
+        self.root = root
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._total: int | None = None  # bytes stored, as of the last scan plus our puts
+        root.mkdir(parents=True, exist_ok=True)
+
+    def path(self, artifact_id: str) -> Path:
+        if not artifact_id.isalnum():
+            raise KeyError(artifact_id)
+        return self.root / artifact_id
+
+    def put_file(self, source: Path, name: str, kind: str) -> Artifact:
+        """Add a file, hard-linking when possible instead of copying."""
+        artifact_id = uuid.uuid4().hex
+        dest = self.path(artifact_id)
+        try:
+            os.link(source, dest)
+        except OSError:
+            shutil.copyfile(source, dest)
+        return self._register(artifact_id, name, kind)
+
+    def put_text(self, text: str, name: str, kind: str) -> Artifact:
+        artifact_id = uuid.uuid4().hex
+        self.path(artifact_id).write_text(text)
+        return self._register(artifact_id, name, kind)
+
+    def _register(self, artifact_id: str, name: str, kind: str) -> Artifact:
+        artifact = Artifact(artifact_id, name, kind, self.path(artifact_id).stat().st_size, time.time())
+        (self.root / f"{artifact_id}.json").write_text(json.dumps(asdict(artifact)))
+        with self._lock:
+            if self._total is None:
+                self._total = self._scan()[1]
+            else:
+                self._total += artifact.size
+            if self._total > self.max_bytes:
+                self._evict()
+        return artifact
+
+    def get(self, artifact_id: str) -> Artifact | None:
+        try:
+            meta = self.root / f"{self.path(artifact_id).name}.json"
+            artifact = Artifact(**json.loads(meta.read_text()))
+        except (KeyError, OSError, ValueError):
+            return None
+        os.utime(meta)
+        return artifact
+
+    def read(self, artifact_id: str, start: int = 0, end: int | None = None) -> Iterator[bytes]:
+        """Stream bytes ``[start, end]`` (inclusive, like an HTTP range)."""
+        with open(self.path(artifact_id), "rb") as f:
+            f.seek(start)
+            remaining = None if end is None else end - start + 1
+            while remaining is None or remaining > 0:
+                chunk = f.read(CHUNK if remaining is None else min(CHUNK, remaining))
+                if not chunk:
+                    break
+                if remaining is not None:
+                    remaining -= len(chunk)
+                yield chunk
+
+    def read_gzip(self, artifact_id: str) -> Iterator[bytes]:
+        """Stream the whole artifact gzip-compressed."""
+        gz = zlib.compressobj(6, zlib.DEFLATED, 31)
+        for chunk in self.read(artifact_id):
+            out = gz.compress(chunk)
+            if out:
+                yield out
+        yield gz.flush()
+
+    def _scan(self) -> tuple[list[tuple[float, int, Path]], int]:
+        """(mtime, size, meta path) of every artifact, oldest first, and their total size."""
+        entries = []
+        for meta in self.root.glob("*.json"):
+            try:
+                mtime = meta.stat().st_mtime
+                size = json.loads(meta.read_text())["size"]
+            except (OSError, ValueError, KeyError):
+                continue  # removed by another process, or half-written
+            entries.append((mtime, size, meta))
+        entries.sort(key=lambda e: e[0])
+        return entries, sum(size for _, size, _ in entries)
+
+    def _evict(self) -> None:
+        entries, total = self._scan()
+        for _, size, meta in entries:
+            if total <= self.max_bytes:
+                break
+            (self.root / meta.stem).unlink(missing_ok=True)
+            meta.unlink(missing_ok=True)
+            total -= size
+        self._total = total
+
+
+@lru_cache(maxsize=1)
+def get_store() -> ArtifactStore:
+    return ArtifactStore(settings.cache_dir / "artifacts", settings.artifact_max_mb * 1024 * 1024)
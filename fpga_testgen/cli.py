@@ -1,35 +1,50 @@
 """CLI entry point."""
 
 from __future__ import annotations
-import json
 from pathlib import Path
+from typing import TYPE_CHECKING
 import click
-from .config import settings
+
+if TYPE_CHECKING:
+    from .schemas import MutationReport
 
 
 @click.group()
-def cli():
+@click.option("--profile", default=None, type=click.Path(dir_okay=False, path_type=Path),
+              help="Write a Chrome trace of the pipeline stages to this file")
+@click.option("--profile-python", is_flag=True, help="With --profile, also write cProfile stats (<trace>.prof)")
+@click.pass_context
+def cli(ctx: click.Context, profile: Path | None, profile_python: bool):
     """FPGA TestGen — LLM-based FPGA testbench auto-generation tool."""
-    pass
+    if profile:
+        from . import tracing
+
+        ctx.call_on_close(lambda: click.echo(f"Trace written to: {profile}", err=True))
+        ctx.with_resource(tracing.profile(profile, python=profile_python))
 
 
 @cli.command()
-@click.argument("file", type=click.Path(exists=True, path_type=Path))
-@click.option("--module", "-m", default=None, help="Module name (auto-detected if omitted)")
+@click.argument("files", nargs=-1, required=True, type=click.Path(exists=True, path_type=Path))
+@click.option("--module", "-m", default=None, help="Top module name (auto-detected if omitted)")
 @click.option("--output", "-o", default=None, type=click.Path(path_type=Path), help="Output directory")
-@click.option("--retries", "-r", default=None, type=int, help=f"Max retries (default: {settings.max_retries})")
+@click.option("--retries", "-r", default=None, type=int, help="Max retries (default: settings.max_retries)")
 @click.option("--simulator", "-s", default=None, type=click.Choice(["iverilog", "verilator"]))
-def generate(file: Path, module: str | None, output: Path | None, retries: int | None, simulator: str | None):
-    """Generate a testbench for a Verilog file."""
+@click.option("--template/--no-template", default=None, help="Try a template testbench before the LLM")
+@click.option("--fresh", is_flag=True, help="Do not reuse a passing testbench from the run history")
+def generate(files: tuple[Path, ...], module: str | None, output: Path | None, retries: int | None,
+             simulator: str | None, template: bool | None, fresh: bool):
+    """Generate a testbench for a Verilog design (one or more files)."""
+    from .design import DesignGraph
     from .pipeline import run_pipeline
 
-    rtl_source = file.read_text()
-    click.echo(f"Parsing {file.name}...")
+    click.echo(f"Parsing {', '.join(f.name for f in files)}...")
+    graph = DesignGraph.from_files(list(files))
 
-    result = run_pipeline(rtl_source, module, simulator, retries)
+    result = run_pipeline(graph, module, simulator, retries, use_template=template, reuse=not fresh)
 
     click.echo(f"Module: {result.module.name}")
     click.echo(f"Ports: {len(result.module.ports)}")
+    click.echo(f"Source: {result.source}")
     click.echo(f"Attempts: {result.attempts}")
 
     if result.sim_result and result.sim_result.success:
@@ -47,9 +62,13 @@ def generate(file: Path, module: str | None, output: Path | None, retries: int |
             fsm = result.coverage.fsm_coverage
             click.echo(f"FSM Coverage: {fsm['coverage_pct']}% "
                         f"({len(fsm['visited_states'])}/{len(fsm['declared_states'])} states)")
+            if fsm["transition_coverage_pct"] is not None:
+                click.echo(f"Transition Coverage: {fsm['transition_coverage_pct']}%")
+    if result.mutation:
+        _echo_mutation(result.mutation)
 
     # Save output
-    out_dir = output or file.parent
+    out_dir = output or files[0].parent
     tb_path = out_dir / f"{result.module.name}_tb.v"
     tb_path.write_text(result.testbench)
     click.echo(f"\nTestbench saved to: {tb_path}")
@@ -60,43 +79,125 @@ def generate(file: Path, module: str | None, output: Path | None, retries: int |
         click.echo(f"Simulation log: {log_path}")
 
 
+def _echo_mutation(report: MutationReport) -> None:
+    click.echo(f"\nMutation Score: {report.score}% ({report.killed}/{report.total} mutants killed)")
+    for err in report.errors:
+        click.echo(f"  {err}")
+    for survivor in report.survivors:
+        click.echo(f"  survived: {survivor}")
+
+
+def _parse_overrides(values: tuple[str, ...]) -> dict[str, int]:
+    from .parser import eval_const_expr
+
+    overrides = {}
+    for item in values:
+        name, sep, expr = item.partition("=")
+        if not sep:
+            raise click.BadParameter(f"expected NAME=VALUE, got '{item}'")
+        overrides[name.strip()] = eval_const_expr(expr)
+    return overrides
+
+
 @cli.command()
 @click.argument("file", type=click.Path(exists=True, path_type=Path))
-def parse(file: Path):
+@click.option("--module", "-m", default=None, help="Module name (first module if omitted)")
+@click.option("--param", "-P", "params", multiple=True, help="Parameter override NAME=VALUE")
+def parse(file: Path, module: str | None, params: tuple[str, ...]):
     """Parse a Verilog file and show module info."""
     from .parser import parse_verilog
 
-    module = parse_verilog(file.read_text())
-    click.echo(f"Module: {module.name}")
+    mod = parse_verilog(file.read_text(), module_name=module, overrides=_parse_overrides(params))
+    click.echo(f"Module: {mod.name}")
     click.echo("Ports:")
-    for p in module.ports:
+    for p in mod.ports:
         click.echo(f"  {p}")
-    if module.parameters:
+    if mod.parameters:
         click.echo("Parameters:")
-        for param in module.parameters:
-            click.echo(f"  {param}")
+        for param in mod.parameters:
+            name = param.partition("=")[0]
+            resolved = f"  (= {mod.param_values[name]})" if name in mod.param_values else ""
+            click.echo(f"  {param}{resolved}")
+    if mod.clock or mod.reset:
+        click.echo(f"Clock: {mod.clock.name if mod.clock else '-'}  "
+                   f"Reset: {mod.reset.name if mod.reset else '-'}")
+    click.echo(f"Input bits (excl. clock/reset): {mod.total_input_bits}")
+
+
+@cli.command()
+@click.argument("files", nargs=-1, required=True, type=click.Path(exists=True, path_type=Path))
+def hierarchy(files: tuple[Path, ...]):
+    """Show the module instance hierarchy of a multi-file design."""
+    from .design import DesignGraph
+
+    graph = DesignGraph.from_files(list(files))
+
+    def show(name: str, depth: int) -> None:
+        click.echo(f"{'  ' * depth}{name}  ({graph.nodes[name].file})")
+        for child in graph.children(name):
+            show(child, depth + 1)
+
+    for top in graph.tops():
+        show(top, 0)
+        missing = graph.missing(top)
+        if missing:
+            click.echo(f"  missing: {', '.join(missing)}")
 
 
 @cli.command("simulate")
-@click.argument("design", type=click.Path(exists=True, path_type=Path))
+@click.argument("design", nargs=-1, required=True, type=click.Path(exists=True, path_type=Path))
 @click.argument("testbench", type=click.Path(exists=True, path_type=Path))
+@click.option("--top", "-t", default=None, help="Top module (default: the DUT the testbench instantiates)")
 @click.option("--simulator", "-s", default=None, type=click.Choice(["iverilog", "verilator"]))
-def simulate_cmd(design: Path, testbench: Path, simulator: str | None):
-    """Run simulation with existing design and testbench."""
+@click.option("--seeds", "-n", default=None, type=int, help="Run with +seed=1..N (one compile)")
+def simulate_cmd(design: tuple[Path, ...], testbench: Path, top: str | None, simulator: str | None,
+                 seeds: int | None):
+    """Run simulation with existing design file(s) and testbench."""
+    from .design import DesignGraph
     from .simulator import simulate
 
-    result = simulate(design.read_text(), testbench.read_text(), simulator)
+    tb_source = testbench.read_text()
+    graph = DesignGraph.from_files(list(design))
+    top = graph.resolve_top(top, testbench=tb_source)
+
+    result = simulate(graph.sources_for(top), tb_source, simulator,
+                      seeds=range(1, seeds + 1) if seeds else None)
+    for run in result.seed_runs:
+        click.echo(f"  seed {run.seed}: {'PASS' if run.success else 'FAIL'}")
     if result.success:
         click.secho("Simulation PASSED", fg="green")
     else:
         click.secho("Simulation FAILED", fg="red")
         for err in result.errors:
             click.echo(f"  {err}")
+    if result.resources:
+        r = result.resources
+        click.echo(f"Resources: {r.cpu_seconds:.2f}s CPU, {r.peak_rss_kb // 1024} MB peak RSS, "
+                   f"{r.bytes_written // 1024} KB written")
     if result.stdout:
         click.echo("\n--- Simulation Output ---")
         click.echo(result.stdout)
 
 
+@cli.command()
+@click.argument("design", nargs=-1, required=True, type=click.Path(exists=True, path_type=Path))
+@click.argument("testbench", type=click.Path(exists=True, path_type=Path))
+@click.option("--top", "-t", default=None, help="Top module (default: the DUT the testbench instantiates)")
+@click.option("--simulator", "-s", default=None, type=click.Choice(["iverilog", "verilator"]))
+@click.option("--max-mutants", "-n", default=None, type=int, help="Mutant budget (default: settings.max_mutants)")
+@click.option("--jobs", "-j", default=None, type=int, help="Parallel mutant runs")
+def mutate(design: tuple[Path, ...], testbench: Path, top: str | None, simulator: str | None,
+           max_mutants: int | None, jobs: int | None):
+    """Score a testbench by how many injected RTL mutants it detects."""
+    from .design import DesignGraph
+    from .mutation import run_mutation_testing
+
+    tb_source = testbench.read_text()
+    graph = DesignGraph.from_files(list(design))
+    top = graph.resolve_top(top, testbench=tb_source)
+    _echo_mutation(run_mutation_testing(graph.sources_for(top), tb_source, simulator, max_mutants, jobs))
+
+
 @cli.command()
 @click.argument("vcd_file", type=click.Path(exists=True, path_type=Path))
 @click.argument("design", type=click.Path(exists=True, path_type=Path))
@@ -115,17 +216,159 @@ def coverage(vcd_file: Path, design: Path):
         click.echo(f"  {sig:20s} {cov:5.1f}% {bar}")
     if report.fsm_coverage:
         fsm = report.fsm_coverage
-        click.echo(f"\nFSM Coverage: {fsm['coverage_pct']}%")
+        click.echo(f"\nFSM Coverage ({fsm['state_register']}): {fsm['coverage_pct']}%")
         click.echo(f"  Declared: {fsm['declared_states']}")
         click.echo(f"  Visited:  {fsm['visited_states']}")
+        if fsm["transition_coverage_pct"] is not None:
+            taken = {(a, b) for a, b, _ in fsm["visited_transitions"]}
+            click.echo(f"Transition Coverage: {fsm['transition_coverage_pct']}%")
+            for a, b in fsm["declared_transitions"]:
+                mark = "x" if (a, b) in taken else " "
+                click.echo(f"  [{mark}] {a} -> {b}")
     click.echo(f"\nTotal Score: {report.total_score}%")
 
 
+@cli.group()
+def golden():
+    """Capture and replay golden output traces."""
+    pass
+
+
+@golden.command("capture")
+@click.argument("design", type=click.Path(exists=True, path_type=Path))
+@click.option("--output", "-o", default=None, type=click.Path(path_type=Path), help="Trace file (.npz)")
+@click.option("--simulator", "-s", default=None, type=click.Choice(["iverilog", "verilator"]))
+def golden_capture(design: Path, output: Path | None, simulator: str | None):
+    """Record DUT outputs of a trusted baseline revision."""
+    from .golden import capture_golden, save_trace
+
+    trace = capture_golden(design.read_text(), simulator)
+    out = output or design.with_suffix(".golden.npz")
+    save_trace(trace, out)
+    click.echo(f"Captured {trace.samples} samples of {len(trace.signals)} outputs")
+    click.echo(f"Golden trace saved to: {out}")
+
+
+@golden.command("check")
+@click.argument("design", type=click.Path(exists=True, path_type=Path))
+@click.argument("trace", type=click.Path(exists=True, path_type=Path))
+@click.option("--simulator", "-s", default=None, type=click.Choice(["iverilog", "verilator"]))
+def golden_check(design: Path, trace: Path, simulator: str | None):
+    """Check a new revision against a golden trace."""
+    from .golden import check_against_golden, load_trace
+
+    result = check_against_golden(design.read_text(), load_trace(trace), simulator)
+    if result.success:
+        click.secho("Golden check PASSED", fg="green")
+    else:
+        click.secho("Golden check FAILED", fg="red")
+        for err in result.errors:
+            click.echo(f"  {err}")
+        raise SystemExit(1)
+
+
+@cli.command()
+@click.argument("directory", type=click.Path(exists=True, file_okay=False, path_type=Path))
+@click.option("--jobs", "-j", default=None, type=int, help="Parallel simulations (default: CPU count)")
+@click.option("--manifest", default=None, type=click.Path(path_type=Path),
+              help="Manifest from the previous run (default: DIRECTORY/.fpga-testgen-regress.json)")
+@click.option("--simulator", "-s", default=None, type=click.Choice(["iverilog", "verilator"]))
+@click.option("--force", is_flag=True, help="Ignore the manifest and re-simulate everything")
+def regress(directory: Path, jobs: int | None, manifest: Path | None, simulator: str | None, force: bool):
+    """Re-run the testbenches in DIRECTORY whose design or testbench changed."""
+    from .regression import run_regression
+
+    entries = run_regression(directory, manifest, jobs, simulator, force)
+    failed = 0
+    for e in entries:
+        status = click.style("PASS", fg="green") if e.passed else click.style("FAIL", fg="red")
+        score = f"{e.coverage['total_score']:5.1f}%" if e.coverage else "    -"
+        click.echo(f"  {status}  {score}  {'cached' if e.reused else 'ran   '}  {e.testbench} ({e.top or '?'})")
+        if not e.passed:
+            failed += 1
+            for err in e.errors[:5]:
+                click.echo(f"        {err}")
+    ran = sum(not e.reused for e in entries)
+    click.echo(f"\n{len(entries)} testbenches: {ran} simulated, {len(entries) - ran} cached, {failed} failed")
+    if failed:
+        raise SystemExit(1)
+
+
+@cli.command()
+@click.option("--module", "-m", default=None, help="Only runs of this module")
+@click.option("--passed/--failed", default=None, help="Filter by simulation result")
+@click.option("--limit", "-n", default=20, type=int, help="Runs per page")
+@click.option("--before", default=None, type=int, help="Show runs older than this run id")
+@click.option("--show", default=None, type=int, help="Print the testbench of one run")
+def history(module: str | None, passed: bool | None, limit: int, before: int | None, show: int | None):
+    """List recorded pipeline runs, newest first."""
+    from datetime import datetime
+    from .history import get_store
+
+    store = get_store()
+    if show is not None:
+        run = store.get(show)
+        if run is None:
+            raise click.ClickException(f"Run {show} not found")
+        click.echo(f"// run {run.id}: {run.module_name} ({run.source}, {'PASS' if run.passed else 'FAIL'})")
+        click.echo(run.testbench)
+        return
+
+    runs = store.query(module_name=module, passed=passed, before=before, limit=limit)
+    for r in runs:
+        when = datetime.fromtimestamp(r.created_at).strftime("%Y-%m-%d %H:%M")
+        score = f"{r.score:5.1f}%" if r.score is not None else "    -"
+        status = click.style("PASS", fg="green") if r.passed else click.style("FAIL", fg="red")
+        click.echo(f"{r.id:7d}  {when}  {status}  {score}  {r.source:8s} {r.simulator:9s} {r.module_name}")
+    if len(runs) == limit:
+        click.echo(f"\nMore: fpga-testgen history --before {runs[-1].id}")
+
+
+@cli.command()
+@click.option("--port", "-p", default=8100, type=int, help="Worker port")
+@click.option("--host", default="127.0.0.1", help="Worker host (0.0.0.0 to accept other machines)")
+@click.option("--verbose", "-v", is_flag=True, help="Log every request")
+def worker(port: int, host: str, verbose: bool):
+    """Run a remote simulation worker (point settings.sim_workers at it).
+
+    The worker runs whatever Verilog it is sent; set WORKER_TOKEN on the
+    worker and its clients before exposing it beyond localhost.
+    """
+    from .config import settings
+    from .worker import WorkerServer, capabilities
+
+    if host not in ("127.0.0.1", "localhost", "::1") and not settings.worker_token:
+        click.secho("Warning: no WORKER_TOKEN set; anyone who can reach this port can run code here",
+                    fg="yellow", err=True)
+    server = WorkerServer((host, port), verbose, settings.worker_token)
+    caps = capabilities()
+    click.echo(f"Simulation worker on {host}:{server.server_address[1]} "
+               f"(simulators: {', '.join(caps['simulators']) or 'none'}, cores: {caps['cores']})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
 @cli.command()
 @click.option("--port", "-p", default=8000, type=int, help="Server port")
 @click.option("--host", default="0.0.0.0", help="Server host")
-def serve(port: int, host: str):
+@click.option("--workers", "-w", default=1, type=int, help="Server processes sharing the port and caches")
+@click.option("--preload", is_flag=True, help="Import the app once before forking workers")
+@click.option("--reload/--no-reload", default=None, help="Restart on code changes (default: on for one worker)")
+@click.option("--drain-timeout", default=None, type=int,
+              help="Seconds to let in-flight jobs finish on shutdown (default: settings.drain_timeout)")
+def serve(port: int, host: str, workers: int, preload: bool, reload: bool | None, drain_timeout: int | None):
     """Start the web UI server."""
-    import uvicorn
-    click.echo(f"Starting FPGA TestGen server on {host}:{port}")
-    uvicorn.run("fpga_testgen.server:app", host=host, port=port, reload=True)
+    if workers == 1 and not preload:
+        import uvicorn
+        click.echo(f"Starting FPGA TestGen server on {host}:{port}")
+        uvicorn.run("fpga_testgen.server:app", host=host, port=port, reload=reload is not False)
+        return
+    if reload:
+        raise click.UsageError("--reload only works with a single worker and no --preload")
+    from .serving import serve as serve_prefork
+
+    serve_prefork(host, port, workers, preload, drain_timeout)
@@ -1,26 +1,41 @@
-"""Application configuration."""
+"""Application configuration.
 
-import shutil
-from pydantic_settings import BaseSettings
+``settings`` is created on first attribute access, so importing the package
+(e.g. for ``fpga-testgen parse``) neither imports pydantic-settings nor
+reads ``.env``.
+"""
 
+from __future__ import annotations
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any
 
-class Settings(BaseSettings):
-    gemini_api_key: str = ""
-    gemini_model: str = "gemini-3.1-pro-preview"
-    default_simulator: str = "iverilog"
-    max_retries: int = 3
-    sim_timeout: int = 30
-    server_port: int = 8000
+if TYPE_CHECKING:
+    from ._settings import Settings
 
-    model_config = {"env_file": ".env", "extra": "ignore"}
 
-    @property
-    def has_iverilog(self) -> bool:
-        return shutil.which("iverilog") is not None
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    from ._settings import Settings
 
-    @property
-    def has_verilator(self) -> bool:
-        return shutil.which("verilator") is not None
+    return Settings()
 
 
-settings = Settings()
+class _LazySettings:
+    """Proxy that builds the real ``Settings`` on first use."""
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(get_settings(), name)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        setattr(get_settings(), name, value)
+
+
+settings: Settings = _LazySettings()  # type: ignore[assignment]
+
+
+def __getattr__(name: str) -> Any:
+    if name == "Settings":
+        from ._settings import Settings
+
+        return Settings
+    raise AttributeError(name)
@@ -0,0 +1,75 @@
+"""Machine-wide CPU core budget shared by every fpga-testgen process.
+
+Each running build or simulation holds a lease file under
+``<cache_dir>/cores``; an ``fcntl`` lock serializes reading and writing
+them. Leases of processes that died without releasing are ignored.
+"""
+
+from __future__ import annotations
+import fcntl
+import os
+import uuid
+from contextlib import contextmanager
+from collections.abc import Iterator
+from pathlib import Path
+from .config import settings
+
+
+def budget() -> int:
+    return settings.core_budget or os.cpu_count() or 1
+
+
+def _root() -> Path:
+    root = settings.cache_dir / "cores"
+    root.mkdir(parents=True, exist_ok=True)
+    return root
+
+
+def _alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+def _in_use(root: Path) -> int:
+    used = 0
+    for lease in root.glob("*.lease"):
+        pid, _, _ = lease.stem.partition("-")
+        if not _alive(int(pid)):
+            lease.unlink(missing_ok=True)
+            continue
+        try:
+            used += int(lease.read_text())
+        except (OSError, ValueError):
+            pass
+    return used
+
+
+def free_cores() -> int:
+    root = _root()
+    with open(root / ".lock", "w") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        return max(0, budget() - _in_use(root))
+
+
+@contextmanager
+def lease(want: int, minimum: int = 1) -> Iterator[int]:
+    """Hold up to ``want`` cores (never fewer than ``minimum``) for the block.
+
+    Yields the number granted. The budget is advisory: when it is exhausted
+    the caller still gets ``minimum`` cores rather than waiting.
+    """
+    root = _root()
+    path = root / f"{os.getpid()}-{uuid.uuid4().hex}.lease"
+    with open(root / ".lock", "w") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        granted = max(minimum, min(want, budget() - _in_use(root)))
+        path.write_text(str(granted))
+    try:
+        yield granted
+    finally:
+        path.unlink(missing_ok=True)
@@ -1,20 +1,26 @@
 """VCD-based coverage analysis."""
 
 from __future__ import annotations
-import re
 from pathlib import Path
-from vcdvcd import VCDVCD
-from .schemas import CoverageReport, VerilogModule
+from typing import TYPE_CHECKING
+from .schemas import CoverageReport, FsmInfo, VerilogModule
+from .tracing import span
 
+if TYPE_CHECKING:
+    from vcdvcd import VCDVCD
 
-def _compute_toggle_coverage(vcd: VCDVCD) -> dict[str, float]:
+
+_SKIP_SIGNALS = frozenset(("clk", "clock", "CLK", "rst", "rst_n", "reset"))
+
+
+def _compute_toggle_coverage(vcd: VCDVCD, skip: frozenset[str] = _SKIP_SIGNALS) -> dict[str, float]:
     """Compute toggle coverage: percentage of bits that toggled 0→1 and 1→0."""
     toggle_cov = {}
 
     for signal_name in vcd.signals:
         # Skip clock and reset signals
         base = signal_name.split(".")[-1]
-        if base in ("clk", "clock", "CLK", "rst", "rst_n", "reset"):
+        if base in skip:
             continue
 
         tv = vcd[signal_name].tv
@@ -36,87 +42,149 @@ def _compute_toggle_coverage(vcd: VCDVCD) -> dict[str, float]:
     return toggle_cov
 
 
-def _detect_fsm_coverage(
-    vcd: VCDVCD, module: VerilogModule
-) -> dict | None:
-    """Detect FSM state register and compute state coverage."""
-    # Find state-like parameters
-    state_params = {}
-    for param in module.parameters:
-        name, _, val = param.partition("=")
-        name = name.strip()
-        val = val.strip()
-        if name.upper() in ("IDLE", "INIT", "DONE", "WAIT", "READ", "WRITE",
-                            "GREEN", "YELLOW", "RED", "S0", "S1", "S2", "S3",
-                            "STATE_A", "STATE_B", "STATE_C"):
-            state_params[name] = val
-
-    if not state_params:
-        return None
+def _find_signal(vcd: VCDVCD, name: str) -> str | None:
+    """VCD signal for a DUT register, preferring the deepest scope."""
+    matches = [sig for sig in vcd.signals if sig.split(".")[-1].split("[")[0] == name]
+    return max(matches, key=lambda sig: sig.count("."), default=None)
 
-    # Find state signal in VCD
-    state_signal = None
-    for sig in vcd.signals:
-        base = sig.split(".")[-1]
-        if base in ("state", "current_state", "cs", "fsm_state"):
-            state_signal = sig
-            break
 
-    if not state_signal:
+def _fsm_coverage(vcd: VCDVCD, fsm: FsmInfo) -> dict | None:
+    signal = _find_signal(vcd, fsm.state_reg)
+    if signal is None:
         return None
 
-    tv = vcd[state_signal].tv
-    visited_values = set()
-    for _, val in tv:
-        try:
-            visited_values.add(int(val, 2))
-        except ValueError:
-            visited_values.add(val)
-
-    declared_values = set()
-    for val in state_params.values():
-        # Parse binary: 2'b00 → 0
-        m = re.match(r"\d+'b([01]+)", val)
-        if m:
-            declared_values.add(int(m.group(1), 2))
-        else:
+    names = list(fsm.states)
+    encodings = [fsm.states[n] for n in names]
+    index = {enc: i for i, enc in enumerate(encodings)}
+    n = len(names)
+
+    # Single pass over value changes: each raw VCD value string is decoded
+    # once, then every change costs one dict lookup and one matrix increment.
+    decoded: dict[str, int | None] = {}
+    visited = [False] * n
+    adjacency = [[0] * n for _ in range(n)]
+    prev = None
+    for _, val in vcd[signal].tv:
+        i = decoded.get(val, -1)
+        if i == -1:
             try:
-                declared_values.add(int(val))
+                i = index.get(int(val, 2))
             except ValueError:
-                pass
-
-    if not declared_values:
-        return None
-
-    covered = visited_values & declared_values
-    pct = (len(covered) / len(declared_values)) * 100 if declared_values else 0
-
-    return {
-        "declared_states": sorted(declared_values),
+                i = None  # X/Z
+            decoded[val] = i
+        if i is None:
+            prev = None
+            continue
+        visited[i] = True
+        if prev is not None and prev != i:
+            adjacency[prev][i] += 1
+        prev = i
+
+    declared_arcs = [(names.index(a), names.index(b)) for a, b in fsm.transitions]
+    visited_arcs = [(a, b) for a in range(n) for b in range(n) if adjacency[a][b]]
+    covered_arcs = [arc for arc in declared_arcs if adjacency[arc[0]][arc[1]]]
+
+    covered = {encodings[i] for i in range(n) if visited[i]}
+    pct = len(covered) / len(set(encodings)) * 100
+    report = {
+        "state_register": fsm.state_reg,
+        "state_names": dict(fsm.states),
+        "declared_states": sorted(set(encodings)),
         "visited_states": sorted(covered),
         "coverage_pct": round(pct, 1),
+        "declared_transitions": [[names[a], names[b]] for a, b in declared_arcs],
+        "visited_transitions": [[names[a], names[b], adjacency[a][b]] for a, b in visited_arcs],
+        "transition_coverage_pct": None,
     }
+    if declared_arcs:
+        report["transition_coverage_pct"] = round(len(covered_arcs) / len(declared_arcs) * 100, 1)
+    return report
+
+
+def _detect_fsm_coverage(
+    vcd: VCDVCD, module: VerilogModule
+) -> dict | None:
+    """Compute state and transition (arc) coverage for inferred FSMs.
+
+    The largest FSM is reported at the top level; all of them are listed
+    under ``fsms`` when the module has more than one.
+    """
+    reports = [r for fsm in module.fsms if (r := _fsm_coverage(vcd, fsm))]
+    if not reports:
+        return None
+    reports.sort(key=lambda r: len(r["declared_states"]), reverse=True)
+    primary = dict(reports[0])
+    if len(reports) > 1:
+        primary["fsms"] = reports
+    return primary
 
 
 def analyze_coverage(
     vcd_path: Path, module: VerilogModule
 ) -> CoverageReport:
     """Analyze VCD file for coverage metrics."""
-    vcd = VCDVCD(str(vcd_path))
+    from vcdvcd import VCDVCD
 
-    toggle = _compute_toggle_coverage(vcd)
-    overall = sum(toggle.values()) / len(toggle) if toggle else 0.0
-    fsm = _detect_fsm_coverage(vcd, module)
+    with span("coverage", profile=True, vcd_bytes=vcd_path.stat().st_size):
+        vcd = VCDVCD(str(vcd_path))
+
+        skip = _SKIP_SIGNALS | {p.name for p in (module.clock, module.reset) if p}
+        toggle = _compute_toggle_coverage(vcd, skip)
+        overall = sum(toggle.values()) / len(toggle) if toggle else 0.0
+        fsm = _detect_fsm_coverage(vcd, module)
 
+    return CoverageReport(
+        toggle_coverage=toggle,
+        overall_toggle=round(overall, 1),
+        fsm_coverage=fsm,
+        total_score=_total_score(overall, fsm),
+    )
+
+
+def _total_score(overall: float, fsm: dict | None) -> float:
     # Total score: weighted average
     scores = [overall]
     if fsm:
         scores.append(fsm["coverage_pct"])
-    total = sum(scores) / len(scores)
-
+        if fsm["transition_coverage_pct"] is not None:
+            scores.append(fsm["transition_coverage_pct"])
+    return round(sum(scores) / len(scores), 1)
+
+
+def _merge_fsm(a: dict, b: dict) -> dict:
+    merged = dict(a)
+    merged["visited_states"] = sorted(set(a["visited_states"]) | set(b["visited_states"]))
+    merged["coverage_pct"] = round(len(merged["visited_states"]) / len(a["declared_states"]) * 100, 1)
+    counts = {(x, y): c for x, y, c in a["visited_transitions"]}
+    for x, y, c in b["visited_transitions"]:
+        counts[(x, y)] = counts.get((x, y), 0) + c
+    merged["visited_transitions"] = [[x, y, c] for (x, y), c in counts.items()]
+    declared = a["declared_transitions"]
+    if declared:
+        taken = sum((x, y) in counts for x, y in declared)
+        merged["transition_coverage_pct"] = round(taken / len(declared) * 100, 1)
+    if "fsms" in a and "fsms" in b:
+        merged["fsms"] = [_merge_fsm(x, y) for x, y in zip(a["fsms"], b["fsms"])]
+    return merged
+
+
+def merge_coverage(reports: list[CoverageReport]) -> CoverageReport:
+    """Union of several runs' coverage (e.g. one per random seed).
+
+    A signal counts as toggled if any run toggled it; FSM states and
+    transitions are unioned and transition counts summed.
+    """
+    toggle: dict[str, float] = {}
+    fsm = None
+    for report in reports:
+        for sig, cov in report.toggle_coverage.items():
+            toggle[sig] = max(cov, toggle.get(sig, 0.0))
+        if report.fsm_coverage:
+            fsm = _merge_fsm(fsm, report.fsm_coverage) if fsm else report.fsm_coverage
+    overall = sum(toggle.values()) / len(toggle) if toggle else 0.0
     return CoverageReport(
         toggle_coverage=toggle,
         overall_toggle=round(overall, 1),
         fsm_coverage=fsm,
-        total_score=round(total, 1),
+        total_score=_total_score(overall, fsm),
     )
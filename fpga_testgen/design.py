@@ -0,0 +1,171 @@
+"""Hierarchical designs: module instance graph over many source files."""
+
+from __future__ import annotations
+import hashlib
+from collections.abc import Callable
+from dataclasses import dataclass, replace
+from functools import lru_cache
+from pathlib import Path
+from .parser import normalize_source, parse_modules
+from .schemas import VerilogModule
+
+# Set by ``shared_cache.share_parses()`` in multi-process servers
+_shared_parse: Callable[[str], tuple[VerilogModule, ...]] | None = None
+
+
+@lru_cache(maxsize=512)
+def _parse_file(source: str) -> tuple[VerilogModule, ...]:
+    """Parse cache keyed by file content — unchanged files are never reparsed."""
+    if _shared_parse is not None:
+        return _shared_parse(source)
+    return tuple(parse_modules(source))
+
+
+@dataclass
+class ModuleNode:
+    module: VerilogModule
+    file: str
+
+
+class DesignGraph:
+    """Module instance dependency graph built from one or more source files.
+
+    Per-module digests are Merkle hashes over the module's normalized text
+    and its children's digests, so editing a leaf only changes the digests
+    of that leaf and the modules that (transitively) instantiate it.
+    """
+
+    def __init__(self) -> None:
+        self.files: dict[str, str] = {}
+        self.nodes: dict[str, ModuleNode] = {}
+        self._digests: dict[str, str] = {}
+
+    @classmethod
+    def from_source(cls, source: str, name: str = "design.v") -> DesignGraph:
+        graph = cls()
+        graph.add_source(name, source)
+        return graph
+
+    @classmethod
+    def from_files(cls, paths: list[Path]) -> DesignGraph:
+        graph = cls()
+        for path in paths:
+            graph.add_source(str(path), Path(path).read_text())
+        return graph
+
+    def add_source(self, name: str, source: str) -> None:
+        """Add or replace a source file, invalidating only affected digests."""
+        stale = {n for n, node in self.nodes.items() if node.file == name}
+        modules = _parse_file(source)
+        stale |= {m.name for m in modules}
+        for mod_name in stale:
+            self._invalidate(mod_name)
+        for mod_name in [n for n, node in self.nodes.items() if node.file == name]:
+            del self.nodes[mod_name]
+        self.files[name] = source
+        for m in modules:
+            self.nodes[m.name] = ModuleNode(module=m, file=name)
+
+    def _invalidate(self, name: str) -> None:
+        for mod_name in {name} | self.dependents(name):
+            self._digests.pop(mod_name, None)
+
+    def module(self, name: str) -> VerilogModule:
+        if name not in self.nodes:
+            raise ValueError(f"Module '{name}' not found")
+        return self.nodes[name].module
+
+    def children(self, name: str) -> list[str]:
+        return [c for c in self.module(name).instances if c in self.nodes]
+
+    def missing(self, top: str) -> list[str]:
+        """Instantiated module types in the cone of ``top`` with no definition."""
+        out: list[str] = []
+        for name in self.dependencies(top):
+            for c in self.nodes[name].module.instances:
+                if c not in self.nodes and c not in out:
+                    out.append(c)
+        return out
+
+    def tops(self) -> list[str]:
+        """Modules not instantiated by any other module."""
+        instantiated = {c for n in self.nodes for c in self.children(n)}
+        return [n for n in self.nodes if n not in instantiated]
+
+    def resolve_top(self, name: str | None = None, testbench: str | None = None) -> str:
+        """Pick the top module.
+
+        In order: the explicit name, the DUT a testbench instantiates, or the
+        first uninstantiated module in file order.
+        """
+        if name is not None:
+            self.module(name)
+            return name
+        if testbench is not None:
+            for tb in parse_modules(testbench):
+                for inst in tb.instances:
+                    if inst in self.nodes:
+                        return inst
+        roots = self.tops()
+        if not roots:
+            raise ValueError("No valid module declaration found")
+        return roots[0]
+
+    def dependencies(self, top: str) -> list[str]:
+        """``top`` and everything it instantiates, leaves first."""
+        order: list[str] = []
+        seen: set[str] = set()
+
+        def visit(n: str) -> None:
+            if n in seen:
+                return
+            seen.add(n)
+            for c in self.children(n):
+                visit(c)
+            order.append(n)
+
+        self.module(top)
+        visit(top)
+        return order
+
+    def dependents(self, name: str) -> set[str]:
+        """Modules that transitively instantiate ``name``."""
+        parents: dict[str, set[str]] = {}
+        for n, node in self.nodes.items():
+            for c in node.module.instances:
+                parents.setdefault(c, set()).add(n)
+        out: set[str] = set()
+        stack = [name]
+        while stack:
+            for p in parents.get(stack.pop(), ()):
+                if p not in out:
+                    out.add(p)
+                    stack.append(p)
+        return out
+
+    def files_for(self, top: str) -> list[str]:
+        """Only the files needed to elaborate ``top``, leaves first."""
+        files: list[str] = []
+        for n in self.dependencies(top):
+            f = self.nodes[n].file
+            if f not in files:
+                files.append(f)
+        return files
+
+    def sources_for(self, top: str) -> list[str]:
+        return [self.files[f] for f in self.files_for(top)]
+
+    def digest(self, name: str) -> str:
+        """Merkle digest of a module's normalized source and its dependencies."""
+        if name in self._digests:
+            return self._digests[name]
+        self._digests[name] = ""  # cycle guard
+        h = hashlib.sha256(normalize_source(self.module(name).raw_source).encode())
+        for c in self.children(name):
+            h.update(self.digest(c).encode())
+        self._digests[name] = h.hexdigest()
+        return self._digests[name]
+
+    def top_module(self, top: str) -> VerilogModule:
+        """Interface of ``top`` whose ``raw_source`` is all the source it needs."""
+        return replace(self.module(top), raw_source="\n".join(self.sources_for(top)))
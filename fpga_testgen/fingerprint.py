@@ -0,0 +1,134 @@
+"""Fingerprints of candidate testbenches, to skip re-simulating equivalent ones.
+
+A testbench is reduced to canonical tokens: comments and whitespace are
+dropped, number literals are normalized, and the text of ``$display``-style
+messages is replaced by a placeholder that only records whether the
+pass/fail check counts it as a failure (``simulator._is_failure``). Other
+strings, such as ``$dumpfile`` names and ``$value$plusargs`` formats, are
+kept verbatim.
+Two candidates with the same fingerprint compile and simulate identically.
+"""
+
+from __future__ import annotations
+import hashlib
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from functools import lru_cache
+from .config import settings
+from .schemas import CoverageReport, SimResult
+from .simulator import _is_failure
+
+SHINGLE = 5  # tokens per shingle for near-duplicate similarity
+
+_LEXEME = re.compile(
+    r'(?P<string>"(?:\\.|[^"\\\n])*")'
+    r"|(?P<comment>//[^\n]*|/\*.*?\*/)"
+    r"|(?P<number>(?:\d[\d_]*)?\s*'[sS]?[bBoOdDhH]\s*[0-9a-fA-FxXzZ?_]+|\d[\d_]*(?:\.\d+)?)"
+    r"|(?P<word>[$`]?[A-Za-z_][\w$]*)"
+    r"|(?P<space>\s+)"
+    r"|(?P<other>.)",
+    re.DOTALL,
+)
+_MESSAGE_TASK = re.compile(r"\$(?:display|write|monitor|strobe|fdisplay|fwrite|error|warning|info|fatal)\w*")
+
+
+def canonical_tokens(source: str) -> list[str]:
+    tokens: list[str] = []
+    in_message = False
+    for m in _LEXEME.finditer(source):
+        kind, text = m.lastgroup, m.group()
+        if kind in ("comment", "space"):
+            continue
+        if kind == "string" and in_message:
+            text = '"<fail>"' if _is_failure(text) else '"<msg>"'
+        elif kind == "number":
+            text = re.sub(r"[\s_]", "", text).lower()
+        elif kind == "word" and _MESSAGE_TASK.fullmatch(text):
+            in_message = True
+        elif text == ";":
+            in_message = False
+        tokens.append(text)
+    return tokens
+
+
+def _digest(tokens: list[str]) -> str:
+    return hashlib.sha256("\0".join(tokens).encode()).hexdigest()[:32]
+
+
+def fingerprint(source: str) -> str:
+    return _digest(canonical_tokens(source))
+
+
+def shingles(tokens: list[str]) -> frozenset[int]:
+    if len(tokens) <= SHINGLE:
+        return frozenset({hash(tuple(tokens))})
+    return frozenset(hash(tuple(tokens[i:i + SHINGLE])) for i in range(len(tokens) - SHINGLE + 1))
+
+
+def similarity(a: frozenset[int], b: frozenset[int]) -> float:
+    """Jaccard similarity of two shingle sets."""
+    if not a and not b:
+        return 1.0
+    return len(a & b) / len(a | b)
+
+
+@dataclass
+class Candidate:
+    fingerprint: str
+    sim_result: SimResult
+    coverage: CoverageReport | None
+    shingles: frozenset[int] = field(repr=False, default=frozenset())
+    hits: int = 0
+
+
+class CandidateIndex:
+    """LRU map of (design key, fingerprint) to a candidate's simulation outcome.
+
+    ``design_key`` must identify everything besides the testbench that
+    decides the outcome: design digest, simulator and seed count.
+    """
+
+    def __init__(self, max_entries: int) -> None:
+        self.max_entries = max_entries
+        self._entries: OrderedDict[tuple[str, str], Candidate] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def lookup(self, design_key: str, testbench: str) -> Candidate | None:
+        key = (design_key, fingerprint(testbench))
+        with self._lock:
+            candidate = self._entries.get(key)
+            if candidate:
+                self._entries.move_to_end(key)
+                candidate.hits += 1
+            return candidate
+
+    def add(
+        self, design_key: str, testbench: str, sim_result: SimResult, coverage: CoverageReport | None
+    ) -> Candidate:
+        tokens = canonical_tokens(testbench)
+        fp = _digest(tokens)
+        candidate = Candidate(fp, sim_result, coverage, shingles(tokens))
+        with self._lock:
+            self._entries[(design_key, fp)] = candidate
+            self._entries.move_to_end((design_key, fp))
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return candidate
+
+    def nearest(self, design_key: str, testbench: str) -> tuple[Candidate, float] | None:
+        """Most similar indexed candidate for the same design, with its similarity."""
+        own = shingles(canonical_tokens(testbench))
+        with self._lock:
+            others = [c for (k, _), c in self._entries.items() if k == design_key]
+        scored = [(c, similarity(own, c.shingles)) for c in others]
+        return max(scored, key=lambda cs: cs[1], default=None)
+
+
+@lru_cache(maxsize=1)
+def get_index() -> CandidateIndex:
+    return CandidateIndex(settings.candidate_index_entries)
@@ -1,12 +1,17 @@
 """Gemini API integration for testbench generation."""
 
 from __future__ import annotations
+import hashlib
 import json
 import re
-from google import genai
+from typing import TYPE_CHECKING
 from .config import settings
 from .schemas import VerilogModule
 from .prompts import SYSTEM_PROMPT, build_prompt, build_feedback_prompt
+from .tracing import span
+
+if TYPE_CHECKING:
+    from google import genai
 
 
 def _extract_json(text: str) -> dict:
@@ -30,34 +35,64 @@ def _extract_json(text: str) -> dict:
 def _create_client() -> genai.Client:
     if not settings.gemini_api_key:
         raise RuntimeError("GEMINI_API_KEY not set")
+    from google import genai  # heavy; only needed once we actually call the API
+
     return genai.Client(api_key=settings.gemini_api_key)
 
 
+def _user_prompt(
+    module: VerilogModule,
+    previous_errors: list[str] | None,
+    previous_tb: str | None,
+    hints: list[str] | None,
+) -> str:
+    if previous_errors and previous_tb:
+        return build_feedback_prompt(module, previous_tb, previous_errors, hints)
+    return build_prompt(module)
+
+
+def _cache_key(user_prompt: str) -> str:
+    material = "\0".join((settings.gemini_model, SYSTEM_PROMPT, user_prompt))
+    return hashlib.sha256(material.encode()).hexdigest()
+
+
 def generate_testbench(
     module: VerilogModule,
     previous_errors: list[str] | None = None,
     previous_tb: str | None = None,
+    hints: list[str] | None = None,
 ) -> tuple[str, str]:
     """Generate a testbench for the given module.
 
+    ``hints`` are extra notes for the retry prompt (e.g. that the previous
+    testbench duplicated an earlier failing one).
+
+    With ``settings.shared_cache`` on, a prompt whose answer was recorded
+    with ``remember_passing`` is answered from the cache in every server
+    worker without an API call.
+
     Returns (testbench_code, description).
     """
-    client = _create_client()
+    user_prompt = _user_prompt(module, previous_errors, previous_tb, hints)
 
-    if previous_errors and previous_tb:
-        user_prompt = build_feedback_prompt(module, previous_tb, previous_errors)
-    else:
-        user_prompt = build_prompt(module)
-
-    response = client.models.generate_content(
-        model=settings.gemini_model,
-        contents=[{"role": "user", "parts": [{"text": user_prompt}]}],
-        config={
-            "system_instruction": SYSTEM_PROMPT,
-            "response_mime_type": "application/json",
-            "temperature": 0.2,
-        },
-    )
+    if settings.shared_cache:
+        from .shared_cache import get_cache
+
+        cached = get_cache().get("llm", _cache_key(user_prompt))
+        if cached:
+            return cached
+
+    client = _create_client()
+    with span("llm", model=settings.gemini_model, feedback=bool(previous_errors and previous_tb)):
+        response = client.models.generate_content(
+            model=settings.gemini_model,
+            contents=[{"role": "user", "parts": [{"text": user_prompt}]}],
+            config={
+                "system_instruction": SYSTEM_PROMPT,
+                "response_mime_type": "application/json",
+                "temperature": 0.2,
+            },
+        )
 
     result = _extract_json(response.text)
     testbench = result.get("testbench", "")
@@ -67,3 +102,24 @@ def generate_testbench(
         raise ValueError("LLM returned empty testbench")
 
     return testbench, description
+
+
+def remember_passing(
+    module: VerilogModule,
+    testbench: str,
+    description: str,
+    previous_errors: list[str] | None = None,
+    previous_tb: str | None = None,
+    hints: list[str] | None = None,
+) -> None:
+    """Share a response whose testbench passed, keyed by the prompt that produced it.
+
+    Only passing answers are shared: a cached failing one would replay the
+    same failing retry chain for every later request on the design.
+    """
+    if not settings.shared_cache:
+        return
+    from .shared_cache import get_cache
+
+    user_prompt = _user_prompt(module, previous_errors, previous_tb, hints)
+    get_cache().put("llm", _cache_key(user_prompt), (testbench, description))
@@ -0,0 +1,161 @@
+"""Golden-model output traces: capture on a baseline RTL, replay as checks."""
+
+from __future__ import annotations
+from dataclasses import dataclass
+from pathlib import Path
+import numpy as np
+from .parser import parse_verilog
+from .schemas import SimResult, VerilogModule
+from .simulator import simulate
+from .template import synthesize_testbench
+
+_WORD = 64
+
+
+@dataclass
+class OutputTrace:
+    """DUT outputs sampled once per stimulus vector.
+
+    Each signal occupies ceil(width / 64) uint64 columns (LSB word first);
+    ``xmask`` has a bit set wherever the sampled value was X or Z.
+    """
+    signals: list[str]
+    widths: list[int]
+    values: np.ndarray  # (samples, words) uint64
+    xmask: np.ndarray   # (samples, words) uint64
+
+    @property
+    def samples(self) -> int:
+        return self.values.shape[0]
+
+    def columns(self) -> list[slice]:
+        cols, start = [], 0
+        for w in self.widths:
+            n = (w + _WORD - 1) // _WORD
+            cols.append(slice(start, start + n))
+            start += n
+        return cols
+
+
+def _pack(chars: np.ndarray, width: int) -> np.ndarray:
+    """Pack a (samples, width) array of 0/1 flags (MSB first) into uint64 words."""
+    bits = chars[:, ::-1].astype(np.uint64)  # LSB first
+    words = (width + _WORD - 1) // _WORD
+    out = np.zeros((chars.shape[0], words), dtype=np.uint64)
+    for k in range(words):
+        chunk = bits[:, k * _WORD:(k + 1) * _WORD]
+        shifts = np.arange(chunk.shape[1], dtype=np.uint64)
+        out[:, k] = np.bitwise_or.reduce(chunk << shifts, axis=1)
+    return out
+
+
+def read_trace(path: Path, module: VerilogModule) -> OutputTrace:
+    """Parse a ``$fdisplay`` trace written by the capture testbench."""
+    outputs = [p for p in module.ports if p.direction == "output"]
+    rows = [line.split() for line in Path(path).read_text().splitlines() if line.strip()]
+    values, xmask = [], []
+    for i, port in enumerate(outputs):
+        column = "".join(r[i].rjust(port.width, "0")[-port.width:] for r in rows)
+        chars = np.frombuffer(column.encode(), dtype=np.uint8).reshape(len(rows), port.width)
+        is_x = np.isin(chars, np.frombuffer(b"xXzZ", dtype=np.uint8))
+        values.append(_pack(chars == ord("1"), port.width))
+        xmask.append(_pack(is_x, port.width))
+    if not outputs:
+        empty = np.zeros((len(rows), 0), dtype=np.uint64)
+        return OutputTrace([], [], empty, empty.copy())
+    return OutputTrace(
+        signals=[p.name for p in outputs],
+        widths=[p.width for p in outputs],
+        values=np.hstack(values),
+        xmask=np.hstack(xmask),
+    )
+
+
+def save_trace(trace: OutputTrace, path: Path) -> None:
+    np.savez_compressed(
+        path,
+        signals=np.array(trace.signals, dtype=str),
+        widths=np.array(trace.widths, dtype=np.int64),
+        values=trace.values,
+        xmask=trace.xmask,
+    )
+
+
+def load_trace(path: Path) -> OutputTrace:
+    with np.load(path, allow_pickle=False) as data:
+        return OutputTrace(
+            signals=[str(s) for s in data["signals"]],
+            widths=[int(w) for w in data["widths"]],
+            values=data["values"],
+            xmask=data["xmask"],
+        )
+
+
+def _format(words: np.ndarray, mask: np.ndarray, width: int) -> str:
+    value = sum(int(w) << (_WORD * k) for k, w in enumerate(words))
+    xbits = sum(int(m) << (_WORD * k) for k, m in enumerate(mask))
+    if not xbits:
+        return f"{width}'h{value:x}"
+    return f"{width}'b" + "".join(
+        "x" if (xbits >> b) & 1 else str((value >> b) & 1) for b in reversed(range(width))
+    )
+
+
+def compare_traces(golden: OutputTrace, actual: OutputTrace, max_errors: int = 20) -> list[str]:
+    """Compare two traces sample by sample; X/Z in the golden trace is don't-care."""
+    if golden.signals != actual.signals or golden.widths != actual.widths:
+        return [f"FAIL: output ports differ from golden trace ({golden.signals} vs {actual.signals})"]
+
+    errors = []
+    n = min(golden.samples, actual.samples)
+    if golden.samples != actual.samples:
+        errors.append(f"FAIL: expected {golden.samples} samples, got {actual.samples}")
+
+    g_val, g_x = golden.values[:n], golden.xmask[:n]
+    a_val, a_x = actual.values[:n], actual.xmask[:n]
+    diff = ((g_val ^ a_val) | a_x) & ~g_x
+
+    mismatches = []
+    for name, width, col in zip(golden.signals, golden.widths, golden.columns()):
+        for row in np.flatnonzero(diff[:, col].any(axis=1)):
+            mismatches.append((int(row), name, width, col))
+    mismatches.sort(key=lambda m: m[0])
+
+    for row, name, width, col in mismatches[:max_errors]:
+        expected = _format(g_val[row, col], g_x[row, col], width)
+        got = _format(a_val[row, col], a_x[row, col], width)
+        errors.append(f"FAIL: sample {row}: {name} expected {expected} got {got}")
+    if len(mismatches) > max_errors:
+        errors.append(f"FAIL: ... {len(mismatches) - max_errors} more mismatches")
+    return errors
+
+
+def capture_golden(rtl_source: str, simulator: str | None = None) -> OutputTrace:
+    """Drive template stimulus through a trusted RTL revision and record its outputs."""
+    module = parse_verilog(rtl_source)
+    testbench, _ = synthesize_testbench(module, trace=True)
+    result = simulate(module.raw_source, testbench, simulator)
+    if result.trace_path is None:
+        raise RuntimeError("Golden capture failed: " + "; ".join(result.errors or ["no trace written"]))
+    return read_trace(result.trace_path, module)
+
+
+def check_against_golden(
+    rtl_source: str, golden: OutputTrace, simulator: str | None = None
+) -> SimResult:
+    """Replay the capture stimulus on a new revision and compare against ``golden``."""
+    module = parse_verilog(rtl_source)
+    testbench, _ = synthesize_testbench(module, trace=True)
+    result = simulate(module.raw_source, testbench, simulator)
+    if result.trace_path is None:
+        return result
+
+    errors = compare_traces(golden, read_trace(result.trace_path, module))
+    return SimResult(
+        success=not errors,
+        stdout=result.stdout,
+        stderr=result.stderr,
+        vcd_path=result.vcd_path,
+        errors=errors,
+        trace_path=result.trace_path,
+    )
@@ -0,0 +1,173 @@
+"""Run history: every pipeline result, indexed in a local SQLite database."""
+
+from __future__ import annotations
+import json
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from .config import settings
+from .schemas import CoverageReport, PipelineResult
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id          INTEGER PRIMARY KEY AUTOINCREMENT,
+    created_at  REAL    NOT NULL,
+    module_name TEXT    NOT NULL,
+    module_hash TEXT    NOT NULL,
+    simulator   TEXT    NOT NULL,
+    source      TEXT    NOT NULL,
+    passed      INTEGER NOT NULL,
+    attempts    INTEGER NOT NULL,
+    score       REAL,
+    cpu_seconds REAL,
+    description TEXT    NOT NULL,
+    testbench   TEXT    NOT NULL,
+    sim_output  TEXT    NOT NULL,
+    errors      TEXT    NOT NULL,
+    coverage    TEXT
+);
+CREATE INDEX IF NOT EXISTS runs_hash    ON runs (module_hash, simulator, passed, id);
+CREATE INDEX IF NOT EXISTS runs_module  ON runs (module_name, id);
+CREATE INDEX IF NOT EXISTS runs_created ON runs (created_at);
+CREATE INDEX IF NOT EXISTS runs_passed  ON runs (passed, id);
+"""
+
+# Listing columns: everything except the large text blobs
+_SUMMARY = (
+    "id, created_at, module_name, module_hash, simulator, source, passed, attempts, score, cpu_seconds"
+)
+
+
+@dataclass
+class RunRecord:
+    id: int
+    created_at: float
+    module_name: str
+    module_hash: str
+    simulator: str
+    source: str
+    passed: bool
+    attempts: int
+    score: float | None
+    cpu_seconds: float | None
+    description: str = ""
+    testbench: str = ""
+    sim_output: str = ""
+    errors: list[str] | None = None
+    coverage: CoverageReport | None = None
+
+
+def _record(row: sqlite3.Row) -> RunRecord:
+    data = dict(row)
+    data["passed"] = bool(data["passed"])
+    if "errors" in data:
+        data["errors"] = json.loads(data["errors"])
+    if data.get("coverage"):
+        data["coverage"] = CoverageReport(**json.loads(data["coverage"]))
+    return RunRecord(**data)
+
+
+class RunStore:
+    """Append-only run log.
+
+    Listings use keyset pagination (``before=<id>``) over the indexes, so a
+    page costs the same with a hundred runs or a million.
+    """
+
+    def __init__(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(str(path), check_same_thread=False, isolation_level=None)
+        self._db.row_factory = sqlite3.Row
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        self._db.close()
+
+    def record(self, result: PipelineResult, module_hash: str, simulator: str) -> int:
+        sim = result.sim_result
+        cov = result.coverage
+        row = (
+            time.time(),
+            result.module.name,
+            module_hash,
+            simulator,
+            result.source,
+            int(bool(sim and sim.success)),
+            result.attempts,
+            cov.total_score if cov else None,
+            sim.resources.cpu_seconds if sim and sim.resources else None,
+            result.description,
+            result.testbench,
+            sim.stdout if sim else "",
+            json.dumps(sim.errors if sim else []),
+            json.dumps(vars(cov)) if cov else None,
+        )
+        with self._lock:
+            cur = self._db.execute(
+                "INSERT INTO runs (created_at, module_name, module_hash, simulator, source, passed,"
+                " attempts, score, cpu_seconds, description, testbench, sim_output, errors, coverage)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                row,
+            )
+            return cur.lastrowid
+
+    def get(self, run_id: int) -> RunRecord | None:
+        with self._lock:
+            row = self._db.execute("SELECT * FROM runs WHERE id = ?", (run_id,)).fetchone()
+        return _record(row) if row else None
+
+    def query(
+        self,
+        module_name: str | None = None,
+        module_hash: str | None = None,
+        passed: bool | None = None,
+        since: float | None = None,
+        before: int | None = None,
+        limit: int = 50,
+    ) -> list[RunRecord]:
+        """Newest-first run summaries (no testbench/output text).
+
+        Pass the last ``id`` of a page as ``before`` to fetch the next one.
+        """
+        where, args = [], []
+        for clause, value in (
+            ("module_name = ?", module_name),
+            ("module_hash = ?", module_hash),
+            ("passed = ?", None if passed is None else int(passed)),
+            ("created_at >= ?", since),
+            ("id < ?", before),
+        ):
+            if value is not None:
+                where.append(clause)
+                args.append(value)
+        sql = f"SELECT {_SUMMARY} FROM runs"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY id DESC LIMIT ?"
+        with self._lock:
+            rows = self._db.execute(sql, (*args, limit)).fetchall()
+        return [_record(r) for r in rows]
+
+    def find_passing(self, module_hash: str, simulator: str, min_score: float = 0.0) -> RunRecord | None:
+        """Best-scoring passing run for this exact design and simulator.
+
+        Runs scoring below ``min_score`` (or without coverage) are ignored.
+        """
+        with self._lock:
+            row = self._db.execute(
+                "SELECT * FROM runs WHERE module_hash = ? AND simulator = ? AND passed = 1 AND score >= ?"
+                " ORDER BY score DESC, id DESC LIMIT 1",
+                (module_hash, simulator, min_score),
+            ).fetchone()
+        return _record(row) if row else None
+
+
+@lru_cache(maxsize=1)
+def get_store() -> RunStore:
+    return RunStore(settings.history_db or settings.cache_dir / "history.db")
@@ -0,0 +1,335 @@
+"""Mutation testing: score how many injected RTL bugs a testbench catches.
+
+All mutants live in one copy of the design, each guarded by a runtime
+select (``+mutant=N``), so the design is compiled once and every mutant is
+just another run of the same binary.
+"""
+
+from __future__ import annotations
+import re
+import shutil
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from . import cores
+from .config import settings
+from .schemas import MutationReport
+from .tracing import bind
+
+SELECT = "fpga_testgen_mutant"
+
+_COMMENT = re.compile(r"//[^\n]*|/\*.*?\*/", re.DOTALL)
+_DECL = re.compile(
+    r"\b(?:parameter|localparam|genvar|integer|real|reg|wire|logic|input|output|inout)\b[^;]*;"
+)
+_HEADER = re.compile(r"\bmodule\s+\w+\s*(?:#\s*\(.*?\))?\s*(?:\(.*?\))?\s*;", re.DOTALL)
+_ASSIGN = re.compile(
+    r"(?:(?<=[;:)\s])|^)(?P<lhs>\w+(?:\s*\[[^\]]*\])*|\{[^{}]*\})\s*(?P<op><=|=)(?!=)\s*(?P<rhs>[^;]+);",
+    re.MULTILINE,
+)
+_IF = re.compile(r"\bif\s*\(")
+_LITERAL = re.compile(r"\d+\s*'[sS]?[bBoOdDhH]\s*[0-9a-fA-F_]+|\b\d+\b(?!\s*')")
+_OPERATOR = re.compile(r"===|!==|<<<|>>>|<<|>>|==|!=|<=|>=|&&|\|\||~\^|\^~|[+\-*&|^<>~!]")
+
+_SWAPS = {
+    "+": "-", "-": "+", "*": "+",
+    "&": "|", "|": "&", "^": "&",
+    "<<": ">>", ">>": "<<",
+    "==": "!=", "!=": "==",
+    "<": ">=", ">=": "<", ">": "<=", "<=": ">",
+    "&&": "||", "||": "&&",
+}
+
+
+@dataclass
+class Mutant:
+    id: int
+    file: int  # index into the design sources
+    line: int
+    kind: str  # "operator" | "constant" | "condition"
+    original: str
+    mutated: str
+
+    def describe(self) -> str:
+        return f"line {self.line}: {self.kind} {self.original.strip()} -> {self.mutated.strip()}"
+
+
+def _mask_comments(source: str) -> str:
+    """Blank out comments, keeping every offset (and newline) in place."""
+    return _COMMENT.sub(lambda m: re.sub(r"[^\n]", " ", m.group()), source)
+
+
+def _mask(text: str, pattern: re.Pattern) -> str:
+    return pattern.sub(lambda m: re.sub(r"[^\n]", " ", m.group()), text)
+
+
+def _depths(text: str) -> list[int]:
+    """Parenthesis/bracket nesting depth before each character."""
+    out, depth = [], 0
+    for ch in text:
+        out.append(depth)
+        if ch in "([{":
+            depth += 1
+        elif ch in ")]}":
+            depth -= 1
+    return out
+
+
+def _close_paren(text: str, open_at: int) -> int:
+    depth = 0
+    for i in range(open_at, len(text)):
+        if text[i] == "(":
+            depth += 1
+        elif text[i] == ")":
+            depth -= 1
+            if depth == 0:
+                return i
+    return -1
+
+
+_WORD = re.compile(r"[A-Za-z_$][\w$]*")
+_DELAY = re.compile(r"[\w.']+")
+_BLOCK = re.compile(r"\b(begin|fork|end|join(?:_any|_none)?)\b")
+_CASE = re.compile(r"\b(case[xz]?|endcase)\b")
+_PROCESS = re.compile(r"\b(?:always(?:_comb|_ff|_latch)?|initial)\b")
+_SUBPROGRAM = re.compile(r"\b(function|task)\b(.*?)\bend\1\b", re.DOTALL)
+_SUBPROGRAM_NAME = re.compile(
+    r"\s*(?:automatic\s+)?(?:signed\s+)?(?:(?:integer|real|reg)\s+)?(?:\[[^\]]*\]\s*)?(\w+)"
+)
+_CONST_DECL = re.compile(r"\b(?:parameter|localparam)\b[^;]*;")
+
+
+def _skip_space(text: str, i: int) -> int:
+    while i < len(text) and text[i].isspace():
+        i += 1
+    return i
+
+
+def _matching(pattern: re.Pattern, text: str, i: int) -> int:
+    """End of the block opened by the keyword at ``i`` (begin/end, case/endcase)."""
+    depth = 0
+    for m in pattern.finditer(text, i):
+        depth += -1 if m.group().startswith(("end", "join")) else 1
+        if depth == 0:
+            return m.end()
+    return len(text)
+
+
+def _statement_end(text: str, i: int) -> int:
+    """Index just past the procedural statement starting at ``i``."""
+    i = _skip_space(text, i)
+    while i < len(text) and text[i] in "@#":  # event or delay control
+        i = _skip_space(text, i + 1)
+        if text.startswith("(", i):
+            i = _close_paren(text, i) + 1
+        elif text.startswith("*", i):
+            i += 1
+        elif m := _DELAY.match(text, i):
+            i = m.end()
+        i = _skip_space(text, i)
+    word = _WORD.match(text, i)
+    keyword = word.group() if word else ""
+    if keyword in ("begin", "fork"):
+        return _matching(_BLOCK, text, i)
+    if keyword in ("case", "casex", "casez"):
+        return _matching(_CASE, text, i)
+    if keyword in ("if", "for", "while", "repeat", "forever"):
+        j = _skip_space(text, word.end())
+        if keyword != "forever" and text.startswith("(", j):
+            j = _close_paren(text, j) + 1
+        end = _statement_end(text, j)
+        if keyword == "if":
+            after = _skip_space(text, end)
+            if re.match(r"else\b", text[after:after + 5]):
+                end = _statement_end(text, after + 4)
+        return end
+    semi = text.find(";", i)
+    return len(text) if semi < 0 else semi + 1
+
+
+def _inside(at: int, spans: list[tuple[int, int]]) -> bool:
+    return any(start <= at < end for start, end in spans)
+
+
+def _procedural_spans(text: str) -> list[tuple[int, int]]:
+    """Bodies of always/initial blocks and of functions and tasks.
+
+    Outside them, ``if`` conditions (generate-if, with or without the
+    ``generate`` keyword) must stay constant. So must functions called
+    from parameter declarations or such conditions, so those are left out.
+    """
+    processes = [(m.start(), _statement_end(text, m.end())) for m in _PROCESS.finditer(text)]
+    subprograms = [(m.start(), m.end(), _SUBPROGRAM_NAME.match(m.group(2))) for m in _SUBPROGRAM.finditer(text)]
+    procedural = processes + [(start, end) for start, end, _ in subprograms]
+
+    constant = [m.group() for m in _CONST_DECL.finditer(text)]
+    constant += [
+        text[m.end():_close_paren(text, m.end() - 1)]
+        for m in _IF.finditer(text) if not _inside(m.start(), procedural)
+    ]
+    constant_text = "\n".join(constant)
+    return processes + [
+        (start, end) for start, end, name in subprograms
+        if not (name and re.search(rf"\b{name.group(1)}\s*\(", constant_text))
+    ]
+
+
+def _expr_mutants(expr: str) -> list[tuple[str, str, str]]:
+    """(kind, original, mutated) variants of one expression."""
+    in_index, depth = [], 0  # inside [...]: bit selects stay untouched
+    for ch in expr:
+        depth += ch == "["
+        in_index.append(depth > 0)
+        depth -= ch == "]"
+
+    out = []
+    for m in _OPERATOR.finditer(expr):
+        op, at = m.group(), m.start()
+        if in_index[at]:
+            continue
+        before = expr[:at].rstrip()
+        binary = bool(before) and (before[-1].isalnum() or before[-1] in "_)]}'")
+        if op in ("~", "!") and not binary:
+            out.append(("operator", expr, expr[:at] + expr[m.end():]))
+        elif binary and op in _SWAPS:
+            out.append(("operator", expr, expr[:at] + _SWAPS[op] + expr[m.end():]))
+    for m in _LITERAL.finditer(expr):
+        if in_index[m.start()] or expr[m.end():].lstrip().startswith("{"):
+            continue  # bit select or replication count
+        lit = m.group()
+        out.append(("constant", expr, f"{expr[:m.start()]}({lit} ^ 1'b1){expr[m.end():]}"))
+    return out
+
+
+def _guard(original: str, variants: list[tuple[int, str]]) -> str:
+    expr = f"({original})"
+    for mid, mutated in reversed(variants):
+        expr = f"({SELECT} == {mid}) ? ({mutated}) : {expr}"
+    return expr
+
+
+def generate_mutants(
+    design_sources: list[str], max_mutants: int | None = None
+) -> tuple[list[str], list[Mutant]]:
+    """Return the mutated sources (all mutants guarded) and the mutant list.
+
+    Mutants are operator swaps/removals and constant flips on the right-hand
+    side of continuous and procedural assignments, plus negated ``if``
+    conditions. Only procedural code and ``assign`` statements are
+    mutated: the mutant select is a runtime variable, so anything that
+    must be constant at elaboration (generate conditions, ``defparam``,
+    constant functions) is left alone. ``max_mutants`` keeps an evenly
+    spaced subset.
+    """
+    limit = max_mutants if max_mutants is not None else settings.max_mutants
+    sites = []  # (file, start, end, [(kind, original, mutated)])
+    for fi, source in enumerate(design_sources):
+        text = _mask_comments(source)
+        scan = _mask(text, _DECL)
+        depth = _depths(text)
+        procedural = _procedural_spans(text)
+        for m in _ASSIGN.finditer(scan):
+            if depth[m.start("lhs")] != 0 or scan[m.start("lhs"):].startswith(("if", "for", "while")):
+                continue
+            before = scan[max(0, m.start("lhs") - 64):m.start("lhs")]
+            if not _inside(m.start(), procedural) and not re.search(r"\bassign\s*$", before):
+                continue
+            variants = _expr_mutants(text[m.start("rhs"):m.end("rhs")])
+            if variants:
+                sites.append((fi, m.start("rhs"), m.end("rhs"), variants))
+        for m in _IF.finditer(scan):
+            if not _inside(m.start(), procedural):
+                continue
+            close = _close_paren(scan, m.end() - 1)
+            if close > 0:
+                cond = text[m.end():close]
+                sites.append((fi, m.end(), close, [("condition", cond, f"!({cond})")]))
+
+    sites.sort(key=lambda site: site[:2])
+    total = sum(len(v) for *_, v in sites)
+    keep = set(range(total))
+    if limit and total > limit:
+        keep = {round(i * (total - 1) / (limit - 1)) for i in range(limit)} if limit > 1 else {0}
+
+    mutants: list[Mutant] = []
+    edits: dict[int, list[tuple[int, int, str]]] = {}
+    n = 0
+    for fi, start, end, variants in sites:
+        chosen = []
+        for kind, original, mutated in variants:
+            if n in keep:
+                mid = len(mutants) + 1
+                line = design_sources[fi].count("\n", 0, start) + 1
+                mutants.append(Mutant(mid, fi, line, kind, original, mutated))
+                chosen.append((mid, mutated))
+            n += 1
+        if chosen:
+            edits.setdefault(fi, []).append((start, end, _guard(design_sources[fi][start:end], chosen)))
+
+    mutated_sources = []
+    for fi, source in enumerate(design_sources):
+        for start, end, text in sorted(edits.get(fi, []), reverse=True):
+            source = source[:start] + text + source[end:]
+        mutated_sources.append(_declare_select(source) if fi in edits else source)
+    return mutated_sources, mutants
+
+
+def _declare_select(source: str) -> str:
+    """Declare the mutant select right after every module header."""
+    decl = (
+        f"\n    integer {SELECT} = 0;"
+        f'\n    initial if (!$value$plusargs("mutant=%d", {SELECT})) {SELECT} = 0;\n'
+    )
+    masked = _mask_comments(source)
+    for m in reversed(list(_HEADER.finditer(masked))):
+        source = source[:m.end()] + decl + source[m.end():]
+    return source
+
+
+def run_mutation_testing(
+    design_sources: list[str],
+    testbench: str,
+    simulator: str | None = None,
+    max_mutants: int | None = None,
+    jobs: int | None = None,
+) -> MutationReport:
+    """Compile all mutants once and run each one; a failing run kills its mutant."""
+    from .simulator import compile_simulation, run_simulation
+
+    sources, mutants = generate_mutants(design_sources, max_mutants)
+    if not mutants:
+        return MutationReport(total=0, killed=0, score=0.0)
+
+    compiled = compile_simulation(sources, testbench, simulator)
+    if compiled.failure:
+        return MutationReport(total=len(mutants), killed=0, score=0.0, errors=compiled.failure.errors)
+
+    def run(mid: int) -> bool:
+        workdir = Path(tempfile.mkdtemp(prefix="fpga_testgen_mut_"))
+        try:
+            return run_simulation(compiled, [f"+mutant={mid}"], workdir).success
+        finally:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    try:
+        if not run(0):
+            return MutationReport(
+                total=len(mutants), killed=0, score=0.0,
+                errors=["Testbench fails on the unmutated design"],
+            )
+        # Runs are subprocesses, so threads are enough to keep every core busy
+        workers = jobs or settings.sim_jobs or max(1, cores.budget() // compiled.threads)
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            outcomes = list(pool.map(bind(run), [m.id for m in mutants]))
+    finally:
+        shutil.rmtree(compiled.workdir, ignore_errors=True)
+
+    survivors = [m.describe() for m, passed in zip(mutants, outcomes) if passed]
+    killed = len(mutants) - len(survivors)
+    return MutationReport(
+        total=len(mutants),
+        killed=killed,
+        score=round(100.0 * killed / len(mutants), 1),
+        survivors=survivors,
+    )
@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 import re
-from .schemas import VerilogModule, VerilogPort
+from .schemas import FsmInfo, VerilogModule, VerilogPort
 
 
 def _strip_comments(source: str) -> str:
@@ -11,16 +11,165 @@ def _strip_comments(source: str) -> str:
     return source
 
 
-def _parse_width(width_str: str | None) -> int:
+# --- Constant expressions ---
+
+_TOKEN = re.compile(
+    r"\s*(?:"
+    r"(?P<num>(?:\d[\d_]*)?\s*'[sS]?[bBoOdDhH]\s*[0-9a-fA-FxXzZ_?]+|\d[\d_]*)"
+    r"|(?P<name>\$?[A-Za-z_]\w*)"
+    r"|(?P<op><<<|>>>|===|!==|\*\*|<<|>>|<=|>=|==|!=|&&|\|\||~&|~\||~\^|\^~|[-+*/%<>&|^~!?:(),])"
+    r")"
+)
+
+# Binary operators by precedence, loosest first (Verilog-2001 table 5-4).
+_BINARY = [
+    {"||"}, {"&&"}, {"|", "~|"}, {"^", "~^", "^~"}, {"&", "~&"},
+    {"==", "!=", "===", "!=="}, {"<", "<=", ">", ">="},
+    {"<<", ">>", "<<<", ">>>"}, {"+", "-"}, {"*", "/", "%"}, {"**"},
+]
+
+
+def _literal(text: str) -> int:
+    text = text.replace("_", "").replace(" ", "")
+    if "'" not in text:
+        return int(text)
+    size, _, rest = text.partition("'")
+    rest = rest.lstrip("sS")
+    base = {"b": 2, "o": 8, "d": 10, "h": 16}[rest[0].lower()]
+    digits = rest[1:]
+    if re.search(r"[xXzZ?]", digits):
+        raise ValueError(f"Literal with X/Z is not a constant: {text}")
+    value = int(digits, base)
+    return value & ((1 << int(size)) - 1) if size else value
+
+
+def _clog2(x: int) -> int:
+    return max(0, (x - 1).bit_length())
+
+
+def _apply(op: str, a: int, b: int) -> int:
+    if op in ("/", "%") and b == 0:
+        raise ValueError("Division by zero in constant expression")
+    return {
+        "||": lambda: int(bool(a) or bool(b)), "&&": lambda: int(bool(a) and bool(b)),
+        "|": lambda: a | b, "~|": lambda: ~(a | b), "^": lambda: a ^ b,
+        "~^": lambda: ~(a ^ b), "^~": lambda: ~(a ^ b), "&": lambda: a & b,
+        "~&": lambda: ~(a & b), "==": lambda: int(a == b), "!=": lambda: int(a != b),
+        "===": lambda: int(a == b), "!==": lambda: int(a != b), "<": lambda: int(a < b),
+        "<=": lambda: int(a <= b), ">": lambda: int(a > b), ">=": lambda: int(a >= b),
+        "<<": lambda: a << b, "<<<": lambda: a << b, ">>": lambda: a >> b,
+        ">>>": lambda: a >> b, "+": lambda: a + b, "-": lambda: a - b,
+        "*": lambda: a * b, "/": lambda: int(a / b), "%": lambda: a - b * int(a / b),
+        "**": lambda: a ** b,
+    }[op]()
+
+
+class _ConstExpr:
+    """Recursive-descent evaluator for Verilog constant expressions."""
+
+    def __init__(self, expr: str, params: dict[str, int]):
+        self.tokens: list[tuple[str, str]] = []
+        pos = 0
+        expr = expr.strip()
+        while pos < len(expr):
+            m = _TOKEN.match(expr, pos)
+            if not m or m.end() == pos:
+                raise ValueError(f"Unsupported constant expression: {expr}")
+            kind = m.lastgroup
+            self.tokens.append((kind, m.group(kind)))
+            pos = m.end()
+        self.pos = 0
+        self.params = params
+
+    def _peek(self) -> str | None:
+        return self.tokens[self.pos][1] if self.pos < len(self.tokens) else None
+
+    def _next(self) -> tuple[str, str]:
+        if self.pos >= len(self.tokens):
+            raise ValueError("Unexpected end of constant expression")
+        tok = self.tokens[self.pos]
+        self.pos += 1
+        return tok
+
+    def _expect(self, value: str) -> None:
+        if self._next()[1] != value:
+            raise ValueError(f"Expected '{value}' in constant expression")
+
+    def parse(self) -> int:
+        value = self._ternary()
+        if self.pos != len(self.tokens):
+            raise ValueError(f"Unexpected token '{self._peek()}' in constant expression")
+        return value
+
+    def _ternary(self) -> int:
+        cond = self._binary(0)
+        if self._peek() != "?":
+            return cond
+        self._next()
+        a = self._ternary()
+        self._expect(":")
+        b = self._ternary()
+        return a if cond else b
+
+    def _binary(self, level: int) -> int:
+        if level == len(_BINARY):
+            return self._unary()
+        left = self._binary(level + 1)
+        while self._peek() in _BINARY[level]:
+            op = self._next()[1]
+            # ** is right-associative
+            right = self._binary(level if op == "**" else level + 1)
+            left = _apply(op, left, right)
+        return left
+
+    def _unary(self) -> int:
+        tok = self._peek()
+        if tok in ("+", "-", "!", "~"):
+            self._next()
+            v = self._unary()
+            return {"+": v, "-": -v, "!": int(not v), "~": ~v}[tok]
+        return self._primary()
+
+    def _primary(self) -> int:
+        kind, text = self._next()
+        if text == "(":
+            v = self._ternary()
+            self._expect(")")
+            return v
+        if kind == "num":
+            return _literal(text)
+        if kind == "name":
+            if text == "$clog2":
+                self._expect("(")
+                v = self._ternary()
+                self._expect(")")
+                return _clog2(v)
+            if text not in self.params:
+                raise ValueError(f"Unknown parameter '{text}'")
+            return self.params[text]
+        raise ValueError(f"Unexpected token '{text}' in constant expression")
+
+
+def eval_const_expr(expr: str, params: dict[str, int] | None = None) -> int:
+    """Evaluate a Verilog constant expression such as ``WIDTH*2-1``."""
+    return _ConstExpr(expr, params or {}).parse()
+
+
+def _parse_width(width_str: str | None, params: dict[str, int] | None = None) -> int:
     if not width_str:
         return 1
-    m = re.match(r"\[(\d+):(\d+)\]", width_str.strip())
+    m = re.match(r"\[(.+):(.+)\]", width_str.strip())
     if m:
-        return abs(int(m.group(1)) - int(m.group(2))) + 1
+        try:
+            msb = eval_const_expr(m.group(1), params)
+            lsb = eval_const_expr(m.group(2), params)
+        except ValueError:
+            return 1
+        return abs(msb - lsb) + 1
     return 1
 
 
-def _parse_ansi_ports(header: str) -> list[VerilogPort]:
+def _parse_ansi_ports(header: str, params: dict[str, int] | None = None) -> list[VerilogPort]:
     """Parse ANSI-style ports from module header."""
     ports = []
     pattern = re.compile(
@@ -36,23 +185,23 @@ def _parse_ansi_ports(header: str) -> list[VerilogPort]:
         ports.append(VerilogPort(
             direction=m.group(1),
             name=name,
-            width=_parse_width(m.group(2)),
+            width=_parse_width(m.group(2), params),
         ))
     return ports
 
 
-def _parse_body_ports(body: str) -> list[VerilogPort]:
+def _parse_body_ports(body: str, params: dict[str, int] | None = None) -> list[VerilogPort]:
     """Parse non-ANSI-style port declarations from module body."""
     ports = []
     pattern = re.compile(
         r"(input|output|inout)\s+(?:(?:wire|reg)\s+)?"
         r"(?:signed\s+)?"
-        r"(\[\d+:\d+\])?\s*"
+        r"(\[[^\]]+\])?\s*"
         r"([^;]+);"
     )
     for m in pattern.finditer(body):
         direction = m.group(1)
-        width = _parse_width(m.group(2))
+        width = _parse_width(m.group(2), params)
         names = [n.strip() for n in m.group(3).split(",") if n.strip()]
         for name in names:
             clean = re.match(r"(\w+)", name)
@@ -61,46 +210,274 @@ def _parse_body_ports(body: str) -> list[VerilogPort]:
     return ports
 
 
+def _param_decls(source: str) -> list[tuple[str, str, str]]:
+    """All (keyword, name, expression) parameter/localparam assignments.
+
+    Handles comma-separated lists such as ``parameter A = 0, B = 1;`` and
+    header lists such as ``#(parameter W = 8, D = 4)``.
+    """
+    decls = []
+    type_prefix = re.compile(r"\s*(?:(?:integer|signed|unsigned|real)\s+)*(?:\[[^\]]*\]\s*)?")
+    assign = re.compile(r"\s*(\w+)\s*=\s*")
+    for kw in re.finditer(r"\b(parameter|localparam)\b", source):
+        pos = type_prefix.match(source, kw.end()).end()
+        while True:
+            m = assign.match(source, pos)
+            if not m:
+                break
+            depth, i = 0, m.end()
+            while i < len(source):
+                c = source[i]
+                if c in "({[":
+                    depth += 1
+                elif c in ")}]":
+                    if depth == 0:
+                        break
+                    depth -= 1
+                elif c in ",;" and depth == 0:
+                    break
+                i += 1
+            decls.append((kw.group(1), m.group(1), source[m.end():i].strip()))
+            if i >= len(source) or source[i] != "," or re.match(r",\s*(?:parameter|localparam)\b", source[i:]):
+                break
+            pos = i + 1
+    return decls
+
+
 def _parse_parameters(source: str) -> list[str]:
     params = []
     seen = set()
     # All parameter declarations (both header and body)
-    for m in re.finditer(r"\bparameter\s+(?:\[[^\]]+\]\s*)?(\w+)\s*=\s*([^;,\)]+)", source):
-        name = m.group(1)
-        if name not in seen:
+    for kind, name, expr in _param_decls(source):
+        if kind == "parameter" and name not in seen:
             seen.add(name)
-            params.append(f"{name}={m.group(2).strip()}")
+            params.append(f"{name}={expr}")
     return params
 
 
-def parse_verilog(source: str) -> VerilogModule:
-    """Parse a Verilog source file and extract module interface."""
-    clean = _strip_comments(source)
+def _resolve_parameters(
+    source: str, overrides: dict[str, int] | None = None
+) -> dict[str, int]:
+    """Evaluate parameter/localparam values in declaration order.
+
+    ``overrides`` replace parameter (not localparam) defaults, like an
+    instance ``#(...)`` override would. Unresolvable expressions are skipped.
+    """
+    overrides = overrides or {}
+    values: dict[str, int] = {}
+    for kind, name, expr in _param_decls(source):
+        if name in values:
+            continue
+        if kind == "parameter" and name in overrides:
+            values[name] = overrides[name]
+            continue
+        try:
+            values[name] = eval_const_expr(expr, values)
+        except ValueError:
+            pass
+    return values
+
+
+_NOT_MODULES = {
+    "module", "function", "task", "input", "output", "inout", "wire", "reg",
+    "integer", "real", "time", "genvar", "parameter", "localparam", "assign",
+    "always", "initial", "begin", "end", "else", "if", "case", "casez", "casex",
+    "for", "while", "repeat", "forever", "generate", "return", "posedge", "negedge",
+    "and", "or", "nand", "nor", "xor", "xnor", "not", "buf", "bufif0", "bufif1",
+    "notif0", "notif1", "pullup", "pulldown", "automatic", "signed", "unsigned",
+    "wait", "disable", "fork", "join", "force", "release", "deassign", "defparam",
+    "default", "endcase", "endgenerate", "endfunction", "endtask", "event", "specify",
+    "tri", "wand", "wor", "supply0", "supply1",
+}
+
+
+def _parse_instances(body: str) -> list[str]:
+    """Return the module types instantiated in a module body, in order."""
+    pattern = re.compile(
+        r"(?:^|[;\s])([A-Za-z_]\w*)\b"
+        r"(?:\s*#\s*\((?:[^()]|\([^()]*\))*\)\s*|\s+)"  # parameters, or at least a space
+        r"([A-Za-z_]\w*)\b\s*(?:\[[^\]]*\]\s*)?\("
+    )
+    types: list[str] = []
+    for m in pattern.finditer(body):
+        mod_type, inst = m.group(1), m.group(2)
+        if mod_type in _NOT_MODULES or inst in _NOT_MODULES:
+            continue
+        if mod_type not in types:
+            types.append(mod_type)
+    return types
+
+
+# --- FSM inference ---
+
+_CASE_LABEL = re.compile(r"((?:[A-Za-z_]\w*\s*,\s*)*[A-Za-z_]\w*)\s*:(?!=)")
+
+
+def _case_blocks(body: str) -> list[tuple[str, str]]:
+    """(selector, item text) for every ``case (ident)`` statement, nesting-aware."""
+    blocks = []
+    stack: list[tuple[str | None, int]] = []
+    for m in re.finditer(r"\b(case[zx]?|endcase)\b", body):
+        if m.group(1) == "endcase":
+            if stack:
+                selector, start = stack.pop()
+                if selector:
+                    blocks.append((selector, body[start:m.start()]))
+            continue
+        sel = re.match(r"\s*\(\s*(\w+)\s*\)", body[m.end():])
+        if sel:
+            stack.append((sel.group(1), m.end() + sel.end()))
+        else:
+            stack.append((None, m.end()))
+    return blocks
+
+
+def _case_items(block: str, constants: dict[str, int]) -> list[tuple[list[str], str]]:
+    """Split a case body into (labels, item text) for constant-labelled items."""
+    starts = []
+    for m in _CASE_LABEL.finditer(block):
+        i = m.start() - 1
+        while i >= 0 and block[i].isspace():
+            i -= 1
+        if i >= 0 and block[i] in "?[:":
+            continue  # ternary branch or part-select, not a case label
+        names = [n.strip() for n in m.group(1).split(",")]
+        if names == ["default"]:
+            starts.append((m.start(), m.end(), []))
+        elif all(n in constants for n in names):
+            starts.append((m.start(), m.end(), names))
+    items = []
+    for k, (_, end, names) in enumerate(starts):
+        stop = starts[k + 1][0] if k + 1 < len(starts) else len(block)
+        items.append((names, block[end:stop]))
+    return items
+
+
+def _assigned_constants(text: str, target: str, constants: dict[str, int]) -> list[str]:
+    """Constant names appearing on the right-hand side of assignments to ``target``."""
+    out: list[str] = []
+    for m in re.finditer(rf"\b{re.escape(target)}\s*<?=(?!=)\s*([^;]+);", text):
+        for name in re.findall(r"[A-Za-z_]\w*", m.group(1)):
+            if name in constants and name not in out:
+                out.append(name)
+    return out
+
+
+def _infer_fsms(body: str, constants: dict[str, int]) -> list[FsmInfo]:
+    """Infer state registers from ``case`` statements over parameter labels.
+
+    A case selector is a state register when it (or the next-state variable
+    it is loaded from) is assigned the same constants it is cased on.
+    Declared transitions are the constants assigned inside each case item.
+    """
+    fsms: dict[str, FsmInfo] = {}
+    for selector, block in _case_blocks(body):
+        items = _case_items(block, constants)
+        labels = {n for names, _ in items for n in names}
+        if len(labels) < 2:
+            continue
 
+        targets = [selector]
+        next_reg = None
+        for m in re.finditer(rf"\b{re.escape(selector)}\s*<?=(?!=)\s*(\w+)\s*;", body):
+            cand = m.group(1)
+            if cand not in constants and _assigned_constants(body, cand, constants):
+                next_reg = cand
+                targets.append(cand)
+                break
+
+        assigned = {n for t in targets for n in _assigned_constants(body, t, constants)}
+        if not assigned & labels:
+            continue
+
+        fsm = fsms.setdefault(selector, FsmInfo(state_reg=selector, states={}, next_reg=next_reg))
+        for name in sorted(labels | assigned, key=lambda n: (constants[n], n)):
+            fsm.states.setdefault(name, constants[name])
+        fsm.next_reg = fsm.next_reg or next_reg
+        for names, text in items:
+            dests = [d for t in targets for d in _assigned_constants(text, t, constants)]
+            for src in names:
+                for dst in dests:
+                    if dst != src and (src, dst) not in fsm.transitions:
+                        fsm.transitions.append((src, dst))
+    return list(fsms.values())
+
+
+def normalize_source(source: str) -> str:
+    """Comment-stripped, whitespace-collapsed source used for content hashing."""
+    return " ".join(_strip_comments(source).split())
+
+
+def _parse_module(
+    clean: str, raw_source: str, overrides: dict[str, int] | None = None
+) -> VerilogModule:
     # Find module declaration
     mod_match = re.search(
-        r"module\s+(\w+)\s*(?:#\s*\(.*?\))?\s*\((.*?)\)\s*;",
+        r"module\s+(\w+)\s*(?:#\s*\(.*?\))?\s*(?:\((.*?)\))?\s*;",
         clean, re.DOTALL
     )
     if not mod_match:
         raise ValueError("No valid module declaration found")
 
     name = mod_match.group(1)
-    header = mod_match.group(2)
+    header = mod_match.group(2) or ""
+    body_end = clean.find("endmodule", mod_match.end())
+    body = clean[mod_match.end():body_end] if body_end != -1 else clean[mod_match.end():]
+
+    param_values = _resolve_parameters(clean, overrides)
 
     # Try ANSI-style first (ports declared in header)
-    ports = _parse_ansi_ports(header)
+    ports = _parse_ansi_ports(header, param_values)
     if not ports:
         # Fall back to non-ANSI (ports declared in body)
-        body_end = clean.find("endmodule")
-        body = clean[mod_match.end():body_end] if body_end != -1 else clean[mod_match.end():]
-        ports = _parse_body_ports(body)
+        ports = _parse_body_ports(body, param_values)
 
-    parameters = _parse_parameters(clean)
+    parameters = []
+    for param in _parse_parameters(clean):
+        pname = param.partition("=")[0]
+        if overrides and pname in overrides:
+            param = f"{pname}={overrides[pname]}"
+        parameters.append(param)
 
     return VerilogModule(
         name=name,
         ports=ports,
         parameters=parameters,
-        raw_source=source,
+        raw_source=raw_source,
+        instances=_parse_instances(body),
+        param_values=param_values,
+        fsms=_infer_fsms(body, param_values),
     )
+
+
+def parse_modules(source: str) -> list[VerilogModule]:
+    """Parse every module in a source file.
+
+    Each module's ``raw_source`` is its own (comment-stripped) text.
+    """
+    clean = _strip_comments(source)
+    modules = []
+    for m in re.finditer(r"\bmodule\b.*?\bendmodule\b", clean, re.DOTALL):
+        block = m.group()
+        modules.append(_parse_module(block, block))
+    return modules
+
+
+def parse_verilog(
+    source: str,
+    module_name: str | None = None,
+    overrides: dict[str, int] | None = None,
+) -> VerilogModule:
+    """Parse a Verilog source file and extract module interface.
+
+    Picks ``module_name`` if given, otherwise the first module in the file.
+    ``overrides`` set parameter values used to resolve port widths.
+    """
+    clean = _strip_comments(source)
+    if module_name is None:
+        return _parse_module(clean, source, overrides)
+
+    for m in re.finditer(r"\bmodule\b.*?\bendmodule\b", clean, re.DOTALL):
+        if re.match(rf"module\s+{re.escape(module_name)}\b", m.group()):
+            return _parse_module(m.group(), source, overrides)
+    raise ValueError(f"Module '{module_name}' not found")
@@ -1,35 +1,221 @@
 """Pipeline orchestrator: parse → generate → simulate → coverage."""
 
 from __future__ import annotations
-from pathlib import Path
 from .config import settings
-from .parser import parse_verilog
-from .generator import generate_testbench
+from .design import DesignGraph
+from .fingerprint import get_index
+from .preflight import check_design, format_diagnostics, preflight
+from .generator import generate_testbench, remember_passing
 from .simulator import simulate
-from .coverage import analyze_coverage
-from .schemas import PipelineResult, VerilogModule
+from .coverage import analyze_coverage, merge_coverage
+from .template import synthesize_testbench
+from .schemas import CoverageReport, PipelineResult, SimResult, VerilogModule
+from .tracing import span
+
+
+def _analyze(sim_result: SimResult, module: VerilogModule) -> CoverageReport | None:
+    if sim_result.vcd_path and sim_result.vcd_path.exists():
+        try:
+            return analyze_coverage(sim_result.vcd_path, module)
+        except Exception:
+            pass  # Coverage analysis is best-effort
+    return None
+
+
+def _simulate(
+    design_sources: list[str], testbench: str, simulator: str | None, module: VerilogModule
+) -> tuple[SimResult, CoverageReport | None]:
+    """Simulate (sweeping ``settings.sim_seeds`` seeds) and analyze a passing run.
+
+    A testbench that fails the pre-flight elaboration check is returned
+    as failed without a full compile. Seed coverage is merged wave by wave;
+    the sweep stops once a wave adds no coverage or the merged score
+    reaches 100%.
+    """
+    if settings.preflight:
+        failure = preflight(design_sources, testbench, simulator)
+        if failure:
+            return failure, None
+    if settings.sim_seeds <= 1:
+        sim_result = simulate(design_sources, testbench, simulator)
+        if not sim_result.success:
+            return sim_result, None
+        return sim_result, sim_result.coverage or _analyze(sim_result, module)
+
+    sweep = _CoverageSweep(module)
+    seeds = range(1, settings.sim_seeds + 1)
+    sim_result = simulate(design_sources, testbench, simulator, seeds=seeds, stop_when=sweep)
+    return sim_result, (sim_result.coverage or sweep.merged) if sim_result.success else None
+
+
+def _evaluate(
+    design_key: str, design_sources: list[str], testbench: str, simulator: str | None, module: VerilogModule
+) -> tuple[SimResult, CoverageReport | None, list[str]]:
+    """``_simulate`` through the candidate index, plus hints for the retry prompt.
+
+    A testbench equivalent to an indexed one (same fingerprint) is answered
+    from the index without simulating. A failing testbench that is a near
+    duplicate of an earlier failing one is flagged.
+    """
+    if not settings.candidate_dedup:
+        return (*_simulate(design_sources, testbench, simulator, module), [])
+
+    index = get_index()
+    hit = index.lookup(design_key, testbench)
+    if hit:
+        hints = []
+        if not hit.sim_result.success:
+            hints.append(
+                "This testbench is functionally identical to an earlier failing one (only whitespace, "
+                "comments or message text differ) and fails the same way. Change the stimulus or checks."
+            )
+        return hit.sim_result, hit.coverage, hints
+
+    near = index.nearest(design_key, testbench)
+    sim_result, coverage = _simulate(design_sources, testbench, simulator, module)
+    index.add(design_key, testbench, sim_result, coverage)
+    hints = []
+    if near and not sim_result.success:
+        other, score = near
+        if score >= settings.near_duplicate_threshold and not other.sim_result.success:
+            hints.append(
+                f"This testbench is {round(score * 100)}% the same as an earlier failing one. "
+                "Make a substantive change instead of a small edit."
+            )
+    return sim_result, coverage, hints
+
+
+class _CoverageSweep:
+    """``stop_when`` for a seed sweep: merge each wave's coverage, stop once saturated."""
+
+    def __init__(self, module: VerilogModule) -> None:
+        self.module = module
+        self.reports: list[CoverageReport] = []
+        self.merged: CoverageReport | None = None
+
+    def __call__(self, wave: list[SimResult]) -> bool:
+        before = self.merged.total_score if self.merged else -1.0
+        self.reports.extend(r for r in (_analyze(run, self.module) for run in wave) if r)
+        if not self.reports:
+            return False
+        self.merged = merge_coverage(self.reports)
+        return self.merged.total_score >= 100.0 or self.merged.total_score <= before
 
 
 def run_pipeline(
-    rtl_source: str,
+    rtl_source: str | DesignGraph,
     module_name: str | None = None,
     simulator: str | None = None,
     max_retries: int | None = None,
+    use_template: bool | None = None,
+    reuse: bool = True,
 ) -> PipelineResult:
     """Run the full testbench generation pipeline.
 
-    1. Parse RTL to extract module interface
-    2. Generate testbench via Gemini API
-    3. Simulate with iverilog/verilator
-    4. Analyze coverage from VCD
-    5. On failure, feed errors back to LLM and retry (up to max_retries)
+    1. Parse RTL (one or many files) and resolve the top module
+    2. Reuse a stored passing testbench for an identical design that met
+       the coverage target, if any (skipped with ``reuse=False``)
+    3. Try a template testbench; return it if it reaches the coverage target
+    4. Generate testbench via Gemini API
+    5. Check that it elaborates, then simulate with iverilog/verilator
+    6. Analyze coverage from VCD
+    7. On failure, feed errors back to LLM and retry (up to max_retries)
+    8. Optionally score the passing testbench with mutation testing
+
+    A passing template testbench is kept as the result if the LLM fails.
+    Only the files the top module depends on are passed to the simulator.
+    Every generated result is recorded in the run history.
     """
     retries = max_retries if max_retries is not None else settings.max_retries
+    template = use_template if use_template is not None else settings.template_fast_path
+    sim_name = simulator or settings.default_simulator
 
     # Stage 1: Parse
-    module = parse_verilog(rtl_source)
+    with span("parse"):
+        graph = rtl_source if isinstance(rtl_source, DesignGraph) else DesignGraph.from_source(rtl_source)
+        top = graph.resolve_top(module_name)
+        module = graph.top_module(top)
+        design_sources = graph.sources_for(top)
+        design_hash = graph.digest(top)
+
+    store = None
+    if settings.history_enabled:
+        from .history import get_store
+
+        store = get_store()
+        hit = None
+        if reuse:
+            with span("history_lookup"):
+                hit = store.find_passing(design_hash, sim_name, settings.coverage_target)
+        if hit:
+            return PipelineResult(
+                module=module,
+                testbench=hit.testbench,
+                description=hit.description,
+                sim_result=SimResult(success=True, stdout=hit.sim_output, stderr=""),
+                coverage=hit.coverage,
+                attempts=0,
+                source="history",
+            )
+
+    design_key = f"{design_hash}:{sim_name}:{settings.sim_seeds}"
+    with span("generate", module=module.name):
+        result = _generate(module, design_sources, simulator, retries, template, design_key)
+    if settings.mutation_testing and result.sim_result and result.sim_result.success:
+        from .mutation import run_mutation_testing
+
+        with span("mutation"):
+            result.mutation = run_mutation_testing(design_sources, result.testbench, simulator)
+    if store:
+        store.record(result, design_hash, sim_name)
+    return result
+
+
+def _generate(
+    module: VerilogModule,
+    design_sources: list[str],
+    simulator: str | None,
+    retries: int,
+    template: bool,
+    design_key: str,
+) -> PipelineResult:
+    if settings.preflight:
+        # No testbench can pass against a design that does not elaborate
+        broken = [d for d in check_design(design_sources, module.name, simulator) if d.severity == "error"]
+        if broken:
+            return PipelineResult(
+                module=module,
+                testbench="",
+                description="",
+                sim_result=SimResult(
+                    success=False, stdout="", stderr="",
+                    errors=format_diagnostics(broken, design_sources, ""),
+                    diagnostics=broken,
+                ),
+                coverage=None,
+                attempts=0,
+            )
+
+    fallback: PipelineResult | None = None
+    if template:
+        with span("template"):
+            testbench, description = synthesize_testbench(module)
+            sim_result, coverage, _ = _evaluate(design_key, design_sources, testbench, simulator, module)
+        if sim_result.success:
+            fallback = PipelineResult(
+                module=module,
+                testbench=testbench,
+                description=description,
+                sim_result=sim_result,
+                coverage=coverage,
+                attempts=1,
+                source="template",
+            )
+            if coverage and coverage.total_score >= settings.coverage_target:
+                return fallback
 
     errors: list[str] = []
+    hints: list[str] = []
     previous_tb: str | None = None
     testbench = ""
     description = ""
@@ -37,24 +223,21 @@ def run_pipeline(
 
     for attempt in range(retries + 1):
         # Stage 2: Generate testbench
-        testbench, description = generate_testbench(
-            module,
-            previous_errors=errors if errors else None,
-            previous_tb=previous_tb,
-        )
+        prompt = {"previous_errors": errors or None, "previous_tb": previous_tb, "hints": hints or None}
+        try:
+            testbench, description = generate_testbench(module, **prompt)
+        except Exception:
+            if fallback:
+                return fallback
+            raise
 
-        # Stage 3: Simulate
-        sim_result = simulate(module.raw_source, testbench, simulator)
+        # Stage 3: Pre-flight elaboration, then simulate
+        # Stage 4: Coverage (merged over seeds)
+        with span("attempt", attempt=attempt + 1):
+            sim_result, coverage, hints = _evaluate(design_key, design_sources, testbench, simulator, module)
 
         if sim_result.success:
-            # Stage 4: Coverage
-            coverage = None
-            if sim_result.vcd_path and sim_result.vcd_path.exists():
-                try:
-                    coverage = analyze_coverage(sim_result.vcd_path, module)
-                except Exception:
-                    pass  # Coverage analysis is best-effort
-
+            remember_passing(module, testbench, description, **prompt)
             return PipelineResult(
                 module=module,
                 testbench=testbench,
@@ -68,6 +251,9 @@ def run_pipeline(
         errors = sim_result.errors
         previous_tb = testbench
 
+    if fallback:
+        return fallback
+
     # All retries exhausted
     return PipelineResult(
         module=module,
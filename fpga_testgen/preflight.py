@@ -0,0 +1,166 @@
+"""Pre-flight elaboration check, run before the full compile and simulation.
+
+``iverilog -t null`` and ``verilator --lint-only`` parse and elaborate the
+sources without generating code (no vvp output, no C++ build), so a
+testbench that does not compile is rejected in a fraction of the time.
+The design on its own is checked once per content and cached, so a broken
+DUT is reported as such instead of being blamed on every testbench.
+"""
+
+from __future__ import annotations
+import json
+import os
+import re
+import shutil
+import tempfile
+from collections.abc import Sequence
+from dataclasses import asdict
+from pathlib import Path
+from .config import settings
+from .schemas import Diagnostic, SimResult
+from .simulator import _cache_key, _capped, _run_job, _write_sources
+from .tracing import span
+
+_IVERILOG = re.compile(
+    r"^(?P<file>[\w./-]+\.s?v):(?P<line>\d+):\s*(?:(?P<severity>error|warning|sorry):\s*)?(?P<message>.*)$"
+)
+_VERILATOR = re.compile(
+    r"^%(?P<severity>Error|Warning)(?:-(?P<code>[A-Z0-9_]+))?:\s*"
+    r"(?P<file>[\w./-]+\.s?v):(?P<line>\d+):(?:\d+:)?\s*(?P<message>.*)$"
+)
+
+
+def parse_diagnostics(output: str, simulator: str) -> list[Diagnostic]:
+    """Structured messages from iverilog or Verilator output."""
+    pattern = _VERILATOR if simulator == "verilator" else _IVERILOG
+    out: list[Diagnostic] = []
+    for line in output.splitlines():
+        m = pattern.match(line.strip())
+        if not m:
+            continue
+        message = m["message"].strip()
+        if message.startswith(":") and out:
+            out[-1].message += f" {message[1:].strip()}"  # iverilog continuation line
+            continue
+        severity = (m["severity"] or "error").lower()
+        out.append(Diagnostic(
+            file=Path(m["file"]).name,
+            line=int(m["line"]),
+            severity="error" if severity == "sorry" else severity,  # "sorry" = unsupported
+            message=message,
+            code=m.groupdict().get("code"),
+        ))
+    return out
+
+
+def _command(simulator: str, files: list[Path], top: str | None) -> list[str]:
+    names = [f.name for f in files]
+    if simulator == "verilator":
+        return ["verilator", "--lint-only", "--timing", "-Wno-fatal",
+                *(["--top-module", top] if top else []), *names]
+    return ["iverilog", "-t", "null", *(["-s", top] if top else []), *names]
+
+
+def _cache_path(key: str) -> Path:
+    return settings.cache_dir / "preflight" / f"{key}.json"
+
+
+def _cache_load(key: str) -> list[Diagnostic] | None:
+    try:
+        return [Diagnostic(**d) for d in json.loads(_cache_path(key).read_text())]
+    except (OSError, ValueError, TypeError):
+        return None
+
+
+def _cache_save(key: str, diagnostics: list[Diagnostic]) -> None:
+    path = _cache_path(key)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}")
+    tmp.write_text(json.dumps([asdict(d) for d in diagnostics]))
+    os.replace(tmp, path)
+
+    entries = sorted(path.parent.glob("*.json"), key=lambda p: p.stat().st_mtime)
+    for old in entries[:max(0, len(entries) - settings.compile_cache_entries)]:
+        old.unlink(missing_ok=True)
+
+
+def _elaborate(
+    simulator: str, design_sources: Sequence[str], testbench: str | None, top: str | None
+) -> list[Diagnostic]:
+    if not shutil.which(simulator):
+        return []  # the full compile reports the missing tool
+    key = _cache_key(f"preflight-{simulator}", design_sources, testbench or "", top or "")
+    if settings.compile_cache:
+        cached = _cache_load(key)
+        if cached is not None:
+            return cached
+
+    tmpdir = Path(tempfile.mkdtemp(prefix="fpga_testgen_pre_"))
+    try:
+        files = _write_sources(tmpdir, design_sources, testbench or "")
+        if testbench is None:
+            files = files[:-1]
+        with span("preflight", simulator=simulator, testbench=testbench is not None):
+            job = _run_job(_command(simulator, files, top), tmpdir, "preflight")
+    finally:
+        shutil.rmtree(tmpdir, ignore_errors=True)
+    if job.limit_error:
+        return [Diagnostic("", 0, "error", job.limit_error)]  # not cached: may be transient
+
+    diagnostics = parse_diagnostics(f"{job.stdout}\n{job.stderr}", simulator)
+    if job.returncode != 0 and not any(d.severity == "error" for d in diagnostics):
+        last = [line for line in job.stderr.splitlines() if line.strip()]
+        message = last[-1].strip() if last else f"{simulator} exited with status {job.returncode}"
+        diagnostics.append(Diagnostic("", 0, "error", message))
+    if settings.compile_cache:
+        _cache_save(key, diagnostics)
+    return diagnostics
+
+
+def check_design(design_sources: Sequence[str], top: str, simulator: str | None = None) -> list[Diagnostic]:
+    """Elaborate the design alone with ``top`` as the root (cached by content)."""
+    return _elaborate(simulator or settings.default_simulator, design_sources, None, top)
+
+
+def check_testbench(
+    design_sources: Sequence[str], testbench: str, simulator: str | None = None
+) -> list[Diagnostic]:
+    """Elaborate the testbench against the design (cached by content)."""
+    return _elaborate(simulator or settings.default_simulator, design_sources, testbench, None)
+
+
+def _sources_by_file(design_sources: Sequence[str], testbench: str) -> dict[str, str]:
+    """Source text under the names ``_write_sources`` gives the files."""
+    names = ["design.v" if i == 0 else f"design_{i}.v" for i in range(len(design_sources))]
+    return {**dict(zip(names, design_sources)), "tb.v": testbench}
+
+
+def format_diagnostics(
+    diagnostics: Sequence[Diagnostic], design_sources: Sequence[str], testbench: str
+) -> list[str]:
+    """Error lines for the retry prompt, each followed by the offending source line."""
+    sources = _sources_by_file(design_sources, testbench)
+    out = []
+    for d in diagnostics:
+        text = str(d)
+        lines = sources.get(d.file, "").splitlines()
+        if 0 < d.line <= len(lines):
+            text += f"\n    {d.line} | {lines[d.line - 1].strip()}"
+        out.append(text)
+    return _capped(out)
+
+
+def preflight(
+    design_sources: Sequence[str], testbench: str, simulator: str | None = None
+) -> SimResult | None:
+    """Failed result when the testbench does not elaborate, else None."""
+    errors = [d for d in check_testbench(design_sources, testbench, simulator) if d.severity == "error"]
+    if not errors:
+        return None
+    return SimResult(
+        success=False,
+        stdout="",
+        stderr="",
+        errors=format_diagnostics(errors, design_sources, testbench),
+        diagnostics=errors,
+    )
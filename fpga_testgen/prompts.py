@@ -16,6 +16,9 @@ Requirements:
 - Include $dumpfile("dump.vcd") and $dumpvars(0, ...) for waveform capture
 - Use if/else with $display for pass/fail checks (not SystemVerilog assert)
 - Track pass_count and fail_count integers
+- Drive random stimulus with $random(seed), where `integer seed` is read at \
+time 0 via $value$plusargs("seed=%d", seed) (default 1); the testbench is run \
+with several seeds and must pass for all of them
 - Print final summary: "PASS: N tests passed" or "FAIL: N tests failed"
 - End simulation with $finish
 - Include a timeout watchdog: $finish after 100000 time units
@@ -42,29 +45,20 @@ Full source:
 def build_test_strategy(module: VerilogModule) -> str:
     strategies = ["- Verify reset behavior (if reset signal exists)"]
 
-    has_clk = any(p.name in ("clk", "clock", "CLK") for p in module.ports)
-    has_rst = any("rst" in p.name.lower() or "reset" in p.name.lower() for p in module.ports)
-    inputs = [p for p in module.ports if p.direction == "input" and p.name not in ("clk", "clock", "CLK")]
-    if has_rst:
-        inputs = [p for p in inputs if "rst" not in p.name.lower() and "reset" not in p.name.lower()]
-
-    total_input_bits = sum(p.width for p in inputs)
-
-    if total_input_bits <= 8:
+    if module.total_input_bits <= 8:
         strategies.append("- Exhaustive test: enumerate all input combinations")
     else:
         strategies.append("- Boundary value testing for all inputs (0, max, mid)")
         strategies.append("- Random input sampling (at least 20 random vectors)")
 
     # FSM detection
-    state_params = [p for p in module.parameters if p.split("=")[0] in
-                    ("IDLE", "STATE", "S0", "S1", "S2", "S3", "GREEN", "RED", "YELLOW",
-                     "INIT", "DONE", "WAIT", "READ", "WRITE")]
-    if state_params:
-        strategies.append("- FSM: attempt to visit all declared states")
-        strategies.append(f"  States: {', '.join(p.split('=')[0] for p in state_params)}")
-
-    if has_clk:
+    for fsm in module.fsms:
+        strategies.append(f"- FSM on '{fsm.state_reg}': visit all states and take every transition")
+        strategies.append(f"  States: {', '.join(fsm.states)}")
+        if fsm.transitions:
+            strategies.append(f"  Transitions: {', '.join(f'{a}->{b}' for a, b in fsm.transitions)}")
+
+    if module.clock:
         strategies.append("- Test sequential behavior over multiple clock cycles")
     else:
         strategies.append("- Test combinational logic with various input patterns")
@@ -77,8 +71,11 @@ def build_prompt(module: VerilogModule) -> str:
     return f"{build_rtl_context(module)}\n\n[Test Strategy]\n{build_test_strategy(module)}"
 
 
-def build_feedback_prompt(module: VerilogModule, previous_tb: str, errors: list[str]) -> str:
+def build_feedback_prompt(
+    module: VerilogModule, previous_tb: str, errors: list[str], hints: list[str] | None = None
+) -> str:
     error_text = "\n".join(errors)
+    notes = "\n[Notes]\n" + "\n".join(f"- {h}" for h in hints) + "\n" if hints else ""
     return f"""{build_rtl_context(module)}
 
 [Previous Testbench That Failed]
@@ -86,6 +83,6 @@ def build_feedback_prompt(module: VerilogModule, previous_tb: str, errors: list[
 
 [Errors]
 {error_text}
-
+{notes}
 Fix all errors and regenerate a complete, working testbench.
 Do not repeat the same mistakes."""
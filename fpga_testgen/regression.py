@@ -0,0 +1,134 @@
+"""Incremental regression: re-simulate only testbenches whose design changed."""
+
+from __future__ import annotations
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from .config import settings
+from .design import DesignGraph
+from .parser import normalize_source, parse_modules
+from .tracing import bind
+
+MANIFEST_NAME = ".fpga-testgen-regress.json"
+_MANIFEST_VERSION = 1
+
+
+@dataclass
+class RegressionEntry:
+    testbench: str  # path relative to the regression directory
+    top: str
+    key: str
+    passed: bool
+    errors: list[str] = field(default_factory=list)
+    coverage: dict | None = None
+    cpu_seconds: float | None = None
+    simulated_at: float = 0.0
+    reused: bool = False  # served from the manifest, not re-simulated
+
+
+def _is_testbench(path: Path) -> bool:
+    return path.stem.endswith("_tb") or path.stem.startswith("tb_")
+
+
+def pair_key(graph: DesignGraph, top: str, testbench: str, simulator: str) -> str:
+    """Content key of a (design cone, testbench, simulator) triple.
+
+    Uses the Merkle digest of ``top``, so editing any module the testbench
+    does not (transitively) instantiate leaves the key unchanged.
+    """
+    h = hashlib.sha256(graph.digest(top).encode())
+    h.update(normalize_source(testbench).encode())
+    h.update(simulator.encode())
+    return h.hexdigest()
+
+
+def load_manifest(path: Path) -> dict[str, RegressionEntry]:
+    try:
+        data = json.loads(path.read_text())
+    except (OSError, ValueError):
+        return {}
+    if data.get("version") != _MANIFEST_VERSION:
+        return {}
+    return {name: RegressionEntry(**entry) for name, entry in data["entries"].items()}
+
+
+def save_manifest(path: Path, entries: list[RegressionEntry]) -> None:
+    data = {
+        "version": _MANIFEST_VERSION,
+        "entries": {e.testbench: {**asdict(e), "reused": False} for e in entries},
+    }
+    tmp = path.with_name(f".{path.name}.{os.getpid()}")
+    tmp.write_text(json.dumps(data, indent=1))
+    os.replace(tmp, path)
+
+
+def _simulate_pair(
+    graph: DesignGraph, name: str, top: str, testbench: str, key: str, simulator: str
+) -> RegressionEntry:
+    from .pipeline import _analyze
+    from .simulator import simulate
+
+    result = simulate(graph.sources_for(top), testbench, simulator)
+    coverage = (result.coverage or _analyze(result, graph.top_module(top))) if result.success else None
+    return RegressionEntry(
+        testbench=name,
+        top=top,
+        key=key,
+        passed=result.success,
+        errors=result.errors,
+        coverage=asdict(coverage) if coverage else None,
+        cpu_seconds=result.resources.cpu_seconds if result.resources else None,
+        simulated_at=time.time(),
+    )
+
+
+def run_regression(
+    directory: Path,
+    manifest: Path | None = None,
+    jobs: int | None = None,
+    simulator: str | None = None,
+    force: bool = False,
+) -> list[RegressionEntry]:
+    """Run every ``*_tb.v``/``tb_*.v`` under ``directory`` against the design files there.
+
+    Pairs whose key matches the previous manifest reuse the stored result;
+    the rest are simulated in parallel. The manifest is rewritten afterwards.
+    """
+    sim = simulator or settings.default_simulator
+    manifest = manifest or directory / MANIFEST_NAME
+    previous = {} if force else load_manifest(manifest)
+
+    files = sorted(p for p in directory.rglob("*.v") if p.is_file())
+    graph = DesignGraph.from_files([p for p in files if not _is_testbench(p)])
+
+    entries: dict[str, RegressionEntry] = {}
+    todo = []
+    for path in (p for p in files if _is_testbench(p)):
+        name = str(path.relative_to(directory))
+        testbench = path.read_text()
+        duts = [i for tb in parse_modules(testbench) for i in tb.instances if i in graph.nodes]
+        if not duts:
+            entries[name] = RegressionEntry(name, "", "", False, errors=["Testbench instantiates no design module"])
+            continue
+        top = duts[0]
+        key = pair_key(graph, top, testbench, sim)
+        old = previous.get(name)
+        if old is not None and old.key == key:
+            old.reused = True
+            entries[name] = old
+        else:
+            todo.append((name, top, testbench, key))
+
+    with ThreadPoolExecutor(max_workers=jobs or os.cpu_count() or 1) as pool:
+        futures = [pool.submit(bind(_simulate_pair), graph, *args, sim) for args in todo]
+        for future in futures:
+            entry = future.result()
+            entries[entry.testbench] = entry
+
+    ordered = [entries[name] for name in sorted(entries)]
+    save_manifest(manifest, [e for e in ordered if e.key])
+    return ordered
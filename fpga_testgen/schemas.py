@@ -5,6 +5,18 @@ from dataclasses import dataclass, field
 from pathlib import Path
 
 
+CLOCK_NAMES = ("clk", "clock", "CLK")
+
+
+def is_reset_name(name: str) -> bool:
+    lower = name.lower()
+    return "rst" in lower or "reset" in lower
+
+
+def is_active_low(name: str) -> bool:
+    return name.lower().endswith(("n", "_ni", "_b"))
+
+
 @dataclass
 class VerilogPort:
     direction: str  # "input" | "output" | "inout"
@@ -16,12 +28,73 @@ class VerilogPort:
         return f"{self.direction} {w}{self.name}"
 
 
+@dataclass
+class FsmInfo:
+    state_reg: str
+    states: dict[str, int]  # state constant name -> encoding
+    transitions: list[tuple[str, str]] = field(default_factory=list)  # declared arcs, no self-loops
+    next_reg: str | None = None  # next-state variable, for two-process FSMs
+
+
 @dataclass
 class VerilogModule:
     name: str
     ports: list[VerilogPort]
     parameters: list[str]
     raw_source: str
+    instances: list[str] = field(default_factory=list)  # instantiated module types
+    param_values: dict[str, int] = field(default_factory=dict)  # resolved parameter/localparam
+    fsms: list[FsmInfo] = field(default_factory=list)  # inferred from case/assignment structure
+
+    # Precomputed port/parameter indexes (derived in __post_init__)
+    clock: VerilogPort | None = field(init=False, default=None)
+    reset: VerilogPort | None = field(init=False, default=None)
+    inputs: list[VerilogPort] = field(init=False, default_factory=list)
+    outputs: list[VerilogPort] = field(init=False, default_factory=list)
+    data_inputs: list[VerilogPort] = field(init=False, default_factory=list)  # minus clock/reset
+    total_input_bits: int = field(init=False, default=0)
+    state_params: dict[str, int] = field(init=False, default_factory=dict)
+
+    def __post_init__(self) -> None:
+        self.inputs = [p for p in self.ports if p.direction == "input"]
+        self.outputs = [p for p in self.ports if p.direction == "output"]
+        self.clock = next((p for p in self.inputs if p.name in CLOCK_NAMES), None)
+        self.reset = next((p for p in self.inputs if is_reset_name(p.name)), None)
+        self.data_inputs = [
+            p for p in self.inputs if p is not self.clock and not is_reset_name(p.name)
+        ]
+        self.total_input_bits = sum(p.width for p in self.data_inputs)
+        self.state_params = {n: v for fsm in self.fsms for n, v in fsm.states.items()}
+
+    @property
+    def reset_active_low(self) -> bool:
+        return self.reset is not None and is_active_low(self.reset.name)
+
+
+@dataclass
+class ResourceUsage:
+    cpu_seconds: float = 0.0  # user + system, including reaped children
+    peak_rss_kb: int = 0
+    bytes_written: int = 0  # growth of the job's working directory
+
+    def add(self, other: ResourceUsage) -> None:
+        self.cpu_seconds += other.cpu_seconds
+        self.peak_rss_kb = max(self.peak_rss_kb, other.peak_rss_kb)
+        self.bytes_written += other.bytes_written
+
+
+@dataclass
+class Diagnostic:
+    """One compiler/linter message, located in a simulator input file."""
+    file: str  # "tb.v", "design.v", "design_1.v", ... ("" when unlocated)
+    line: int
+    severity: str  # "error" | "warning"
+    message: str
+    code: str | None = None  # Verilator warning class, e.g. "WIDTH"
+
+    def __str__(self) -> str:
+        where = f"{self.file}:{self.line}: " if self.file else ""
+        return f"{where}{self.severity}: {self.message}"
 
 
 @dataclass
@@ -31,6 +104,16 @@ class SimResult:
     stderr: str
     vcd_path: Path | None = None
     errors: list[str] = field(default_factory=list)
+    diagnostics: list[Diagnostic] = field(default_factory=list)  # structured pre-flight messages
+    trace_path: Path | None = None
+    resources: ResourceUsage | None = None
+    seed: int | None = None  # +seed= plusarg of this run
+    build_config: dict | None = None  # Verilator threads / -j / optimization flags used
+    stdout_path: Path | None = None  # full output when stdout is only a head/tail excerpt
+    stderr_path: Path | None = None
+    seed_runs: list[SimResult] = field(default_factory=list)  # per-seed results of a sweep
+    coverage: CoverageReport | None = None  # computed by a remote worker (its VCD stays there)
+    worker: str | None = None  # URL of the remote worker that ran it
 
 
 @dataclass
@@ -41,6 +124,15 @@ class CoverageReport:
     total_score: float = 0.0
 
 
+@dataclass
+class MutationReport:
+    total: int
+    killed: int
+    score: float  # percent of mutants the testbench detects
+    survivors: list[str] = field(default_factory=list)  # undetected mutants
+    errors: list[str] = field(default_factory=list)
+
+
 @dataclass
 class PipelineResult:
     module: VerilogModule
@@ -49,3 +141,5 @@ class PipelineResult:
     sim_result: SimResult
     coverage: CoverageReport | None
     attempts: int
+    source: str = "llm"  # "template" | "llm" | "history"
+    mutation: MutationReport | None = None
@@ -3,11 +3,17 @@
 from __future__ import annotations
 import shutil
 from pathlib import Path
-from fastapi import FastAPI, HTTPException
+from typing import TYPE_CHECKING
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 from fastapi.staticfiles import StaticFiles
 from pydantic import BaseModel
 from .config import settings
+from .schemas import SimResult, VerilogModule
+
+if TYPE_CHECKING:
+    from .history import RunRecord
 
 app = FastAPI(title="FPGA TestGen", version="0.1.0")
 
@@ -19,13 +25,32 @@ app.add_middleware(
 )
 
 
+@app.middleware("http")
+async def trace_requests(request: Request, call_next):
+    """With ``settings.profile_dir`` set, trace every POST as ``<dir>/<endpoint>-<time>.json``."""
+    if settings.profile_dir is None or request.method != "POST":
+        return await call_next(request)
+    import time
+    import uuid
+    from . import tracing
+
+    name = request.url.path.strip("/").replace("/", "-")
+    path = settings.profile_dir / f"{name}-{time.strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:6]}.json"
+    with tracing.profile(path, python=settings.profile_python), tracing.span(request.url.path, category="request"):
+        return await call_next(request)
+
+
 # --- Request/Response models ---
 
 class GenerateRequest(BaseModel):
     rtl: str
+    files: dict[str, str] | None = None  # extra source files (submodules)
     module_name: str | None = None
     max_retries: int = 3
     simulator: str | None = None
+    use_template: bool | None = None
+    keep_vcd: bool = False  # store the VCD as a downloadable artifact
+    fresh: bool = False  # skip reusing a passing testbench from the run history
 
 
 class PortInfo(BaseModel):
@@ -38,6 +63,10 @@ class ModuleInfo(BaseModel):
     name: str
     ports: list[PortInfo]
     parameters: list[str]
+    param_values: dict[str, int] = {}
+    clock: str | None = None
+    reset: str | None = None
+    total_input_bits: int = 0
 
 
 class CoverageInfo(BaseModel):
@@ -47,6 +76,21 @@ class CoverageInfo(BaseModel):
     total_score: float
 
 
+class MutationInfo(BaseModel):
+    total: int
+    killed: int
+    score: float
+    survivors: list[str]
+    errors: list[str]
+
+
+class ArtifactInfo(BaseModel):
+    id: str  # fetch with /api/artifacts/{id}
+    name: str
+    kind: str
+    size: int
+
+
 class GenerateResponse(BaseModel):
     testbench: str
     description: str
@@ -56,10 +100,37 @@ class GenerateResponse(BaseModel):
     sim_errors: list[str]
     coverage: CoverageInfo | None = None
     attempts: int
+    source: str = "llm"
+    waveform_id: str | None = None  # pass to /api/waveform
+    mutation: MutationInfo | None = None
+    artifacts: dict[str, ArtifactInfo] = {}  # spilled "stdout"/"stderr", "vcd" if requested
+
+
+class WaveformSignal(BaseModel):
+    name: str
+    width: int
+    initial: int  # value held at ``start`` (-1 = X/Z)
+    kind: str  # "changes" | "buckets"
+    times: list[int]
+    values: list[int] | None = None  # kind == "changes"
+    bucket: int | None = None  # kind == "buckets": bucket width in time units
+    lo: list[int] | None = None
+    hi: list[int] | None = None
+    changes: list[int] | None = None
+
+
+class WaveformResponse(BaseModel):
+    signals: list[str]  # every signal in the trace
+    widths: list[int]
+    end_time: int
+    start: int
+    end: int
+    data: list[WaveformSignal]
 
 
 class ParseRequest(BaseModel):
     rtl: str
+    overrides: dict[str, int] | None = None  # parameter overrides for width resolution
 
 
 class ParseResponse(BaseModel):
@@ -70,13 +141,41 @@ class SimulateRequest(BaseModel):
     design: str
     testbench: str
     simulator: str | None = None
+    keep_vcd: bool = False  # store the VCD as a downloadable artifact
 
 
 class SimulateResponse(BaseModel):
     success: bool
-    stdout: str
+    stdout: str  # head/tail excerpt when large; full text in artifacts["stdout"]
     stderr: str
     errors: list[str]
+    artifacts: dict[str, ArtifactInfo] = {}
+
+
+class RunSummary(BaseModel):
+    id: int
+    created_at: float
+    module_name: str
+    module_hash: str
+    simulator: str
+    source: str
+    passed: bool
+    attempts: int
+    score: float | None = None
+    cpu_seconds: float | None = None
+
+
+class RunsResponse(BaseModel):
+    runs: list[RunSummary]
+    next_before: int | None = None  # pass as ?before= for the next page
+
+
+class RunDetail(RunSummary):
+    description: str
+    testbench: str
+    sim_output: str
+    errors: list[str]
+    coverage: CoverageInfo | None = None
 
 
 class HealthResponse(BaseModel):
@@ -86,6 +185,54 @@ class HealthResponse(BaseModel):
     gemini_configured: bool
 
 
+class JobInfo(BaseModel):
+    id: str
+    kind: str  # "generate" | "simulate"
+    pid: int  # server worker process running it
+    started_at: float
+    detail: str
+
+
+class JobsResponse(BaseModel):
+    running: int
+    pids: list[int]
+    jobs: list[JobInfo]
+
+
+def _store_artifacts(sim_result: SimResult | None, keep_vcd: bool = False) -> dict[str, ArtifactInfo]:
+    """Move spilled output (and the VCD, if asked for) into the artifact store.
+
+    Output that fit in the response excerpt stays inline only.
+    """
+    if not sim_result:
+        return {}
+    wanted = [(key, path, f"{key}.log", "log")
+              for key, path in (("stdout", sim_result.stdout_path), ("stderr", sim_result.stderr_path))]
+    if keep_vcd:
+        wanted.append(("vcd", sim_result.vcd_path, "dump.vcd", "vcd"))
+    wanted = [w for w in wanted if w[1] and w[1].exists()]
+    if not wanted:
+        return {}
+
+    from .artifacts import get_store
+
+    store = get_store()
+    stored = [(key, store.put_file(path, name, kind)) for key, path, name, kind in wanted]
+    return {key: ArtifactInfo(id=a.id, name=a.name, kind=a.kind, size=a.size) for key, a in stored}
+
+
+def _module_info(module: VerilogModule) -> ModuleInfo:
+    return ModuleInfo(
+        name=module.name,
+        ports=[PortInfo(direction=p.direction, name=p.name, width=p.width) for p in module.ports],
+        parameters=module.parameters,
+        param_values=module.param_values,
+        clock=module.clock.name if module.clock else None,
+        reset=module.reset.name if module.reset else None,
+        total_input_bits=module.total_input_bits,
+    )
+
+
 # --- Endpoints ---
 
 @app.get("/api/health", response_model=HealthResponse)
@@ -103,33 +250,33 @@ def parse_rtl(req: ParseRequest):
     from .parser import parse_verilog
 
     try:
-        module = parse_verilog(req.rtl)
+        module = parse_verilog(req.rtl, overrides=req.overrides)
     except ValueError as e:
         raise HTTPException(400, str(e))
 
-    return ParseResponse(
-        module=ModuleInfo(
-            name=module.name,
-            ports=[PortInfo(direction=p.direction, name=p.name, width=p.width) for p in module.ports],
-            parameters=module.parameters,
-        )
-    )
+    return ParseResponse(module=_module_info(module))
 
 
 @app.post("/api/generate", response_model=GenerateResponse)
 def generate(req: GenerateRequest):
+    from .design import DesignGraph
     from .pipeline import run_pipeline
+    from .shared_cache import get_cache
 
-    if not settings.gemini_api_key:
-        raise HTTPException(500, "GEMINI_API_KEY not configured")
+    graph = DesignGraph.from_source(req.rtl)
+    for name, source in (req.files or {}).items():
+        graph.add_source(name, source)
 
     try:
-        result = run_pipeline(
-            req.rtl,
-            module_name=req.module_name,
-            simulator=req.simulator,
-            max_retries=req.max_retries,
-        )
+        with get_cache().job("generate", req.module_name or ""):
+            result = run_pipeline(
+                graph,
+                module_name=req.module_name,
+                simulator=req.simulator,
+                max_retries=req.max_retries,
+                use_template=req.use_template,
+                reuse=not req.fresh,
+            )
     except Exception as e:
         raise HTTPException(500, str(e))
 
@@ -142,35 +289,184 @@ def generate(req: GenerateRequest):
             total_score=result.coverage.total_score,
         )
 
+    waveform_id = None
+    if result.sim_result and result.sim_result.vcd_path and result.sim_result.vcd_path.exists():
+        from .waveform import build_index, save_index
+
+        try:
+            waveform_id = save_index(build_index(result.sim_result.vcd_path))
+        except Exception:
+            pass  # Waveform browsing is best-effort
+
     return GenerateResponse(
         testbench=result.testbench,
         description=result.description,
-        module=ModuleInfo(
-            name=result.module.name,
-            ports=[PortInfo(direction=p.direction, name=p.name, width=p.width) for p in result.module.ports],
-            parameters=result.module.parameters,
-        ),
+        module=_module_info(result.module),
         sim_success=result.sim_result.success if result.sim_result else False,
         sim_output=result.sim_result.stdout if result.sim_result else "",
         sim_errors=result.sim_result.errors if result.sim_result else [],
         coverage=coverage,
         attempts=result.attempts,
+        source=result.source,
+        waveform_id=waveform_id,
+        mutation=MutationInfo(**vars(result.mutation)) if result.mutation else None,
+        artifacts=_store_artifacts(result.sim_result, req.keep_vcd),
     )
 
 
 @app.post("/api/simulate", response_model=SimulateResponse)
 def simulate_endpoint(req: SimulateRequest):
+    from .shared_cache import get_cache
     from .simulator import simulate
 
-    result = simulate(req.design, req.testbench, req.simulator)
+    with get_cache().job("simulate", req.simulator or settings.default_simulator):
+        result = simulate(req.design, req.testbench, req.simulator)
     return SimulateResponse(
         success=result.success,
         stdout=result.stdout,
         stderr=result.stderr,
         errors=result.errors,
+        artifacts=_store_artifacts(result, req.keep_vcd),
+    )
+
+
+@app.get("/api/jobs", response_model=JobsResponse)
+def list_jobs():
+    """Jobs running in every server worker process."""
+    from .shared_cache import get_cache
+
+    jobs = get_cache().jobs()
+    return JobsResponse(
+        running=len(jobs),
+        pids=sorted({j["pid"] for j in jobs}),
+        jobs=[JobInfo(**j) for j in jobs],
+    )
+
+
+@app.get("/api/artifacts/{artifact_id}")
+def get_artifact(artifact_id: str, request: Request):
+    """Download an artifact; honours ``Range: bytes=`` and gzip ``Accept-Encoding``."""
+    from .artifacts import get_store
+
+    store = get_store()
+    artifact = store.get(artifact_id)
+    if artifact is None:
+        raise HTTPException(404, f"Artifact {artifact_id} not found")
+    headers = {
+        "Accept-Ranges": "bytes",
+        "Content-Disposition": f'inline; filename="{artifact.name}"',
+    }
+
+    range_header = request.headers.get("range")
+    if range_header:
+        start, end = _parse_range(range_header, artifact.size)
+        headers["Content-Range"] = f"bytes {start}-{end}/{artifact.size}"
+        headers["Content-Length"] = str(end - start + 1)
+        return StreamingResponse(
+            store.read(artifact_id, start, end), status_code=206,
+            media_type=artifact.content_type, headers=headers,
+        )
+
+    if "gzip" in request.headers.get("accept-encoding", ""):
+        headers["Content-Encoding"] = "gzip"
+        headers["Vary"] = "Accept-Encoding"
+        return StreamingResponse(store.read_gzip(artifact_id), media_type=artifact.content_type, headers=headers)
+
+    headers["Content-Length"] = str(artifact.size)
+    return StreamingResponse(store.read(artifact_id), media_type=artifact.content_type, headers=headers)
+
+
+def _parse_range(header: str, size: int) -> tuple[int, int]:
+    """Single ``bytes=a-b`` / ``bytes=a-`` / ``bytes=-n`` range, inclusive."""
+    unit, _, spec = header.partition("=")
+    first, _, last = spec.split(",")[0].strip().partition("-")
+    try:
+        if unit.strip() != "bytes":
+            raise ValueError
+        if first:
+            start = int(first)
+            end = min(int(last), size - 1) if last else size - 1
+        else:
+            start, end = max(0, size - int(last)), size - 1
+    except ValueError:
+        raise HTTPException(416, "Invalid range", headers={"Content-Range": f"bytes */{size}"})
+    if start > end or start >= size:
+        raise HTTPException(416, "Range not satisfiable", headers={"Content-Range": f"bytes */{size}"})
+    return start, end
+
+
+@app.get("/api/waveform", response_model=WaveformResponse)
+def waveform(
+    id: str,
+    start: int = 0,
+    end: int | None = None,
+    signals: str | None = None,
+    points: int = 1000,
+):
+    """A time window of selected signals (comma-separated), at most ~``points`` entries each."""
+    from .waveform import load_index
+
+    try:
+        index = load_index(id)
+    except FileNotFoundError:
+        raise HTTPException(404, f"Waveform {id} not found")
+
+    names = signals.split(",") if signals else index.signals[:8]
+    unknown = [n for n in names if n not in index.signals]
+    if unknown:
+        raise HTTPException(400, f"Unknown signals: {', '.join(unknown)}")
+    end = index.end_time if end is None else end
+    points = max(16, min(points, 4000))
+    return WaveformResponse(
+        signals=index.signals,
+        widths=index.widths,
+        end_time=index.end_time,
+        start=start,
+        end=end,
+        data=[WaveformSignal(**d) for d in index.window(names, start, end, points)],
     )
 
 
+@app.get("/api/runs", response_model=RunsResponse)
+def list_runs(
+    module: str | None = None,
+    module_hash: str | None = None,
+    passed: bool | None = None,
+    since: float | None = None,
+    before: int | None = None,
+    limit: int = 50,
+):
+    from .history import get_store
+
+    limit = max(1, min(limit, 500))
+    runs = get_store().query(module, module_hash, passed, since, before, limit)
+    return RunsResponse(
+        runs=[RunSummary(**_summary_fields(r)) for r in runs],
+        next_before=runs[-1].id if len(runs) == limit else None,
+    )
+
+
+@app.get("/api/runs/{run_id}", response_model=RunDetail)
+def get_run(run_id: int):
+    from .history import get_store
+
+    run = get_store().get(run_id)
+    if run is None:
+        raise HTTPException(404, f"Run {run_id} not found")
+    return RunDetail(
+        **_summary_fields(run),
+        description=run.description,
+        testbench=run.testbench,
+        sim_output=run.sim_output,
+        errors=run.errors or [],
+        coverage=CoverageInfo(**vars(run.coverage)) if run.coverage else None,
+    )
+
+
+def _summary_fields(run: RunRecord) -> dict:
+    return {name: getattr(run, name) for name in RunSummary.model_fields}
+
+
 # Serve frontend static files (if built)
 _web_dist = Path(__file__).parent.parent / "web" / "dist"
 if _web_dist.exists():
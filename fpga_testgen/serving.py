@@ -0,0 +1,162 @@
+"""Pre-forking production server: N uvicorn workers sharing one socket.
+
+The parent binds the listening socket, optionally imports the app and its
+heavy dependencies once (``preload``, so forked workers share those pages
+copy-on-write and start warm), then forks the workers and restarts any
+that die (but not ones that keep failing at startup). Workers share the parse/LLM cache and job table through
+``shared_cache``.
+
+On SIGTERM/SIGINT the parent forwards SIGTERM: each worker stops
+accepting, lets in-flight requests (and their simulations) finish for up
+to ``drain_timeout`` seconds, then kills any simulation still running.
+Workers left after that are killed by the parent.
+"""
+
+from __future__ import annotations
+import os
+import signal
+import socket
+import sys
+import time
+import traceback
+
+QUICK_EXIT = 5.0  # a worker that dies this soon after starting is failing at startup
+MAX_QUICK_EXITS = 3  # consecutive quick exits before its slot is not restarted
+_PRELOAD = ("fpga_testgen.server", "fpga_testgen.pipeline", "fpga_testgen.coverage", "vcdvcd", "numpy")
+
+
+def _bind(host: str, port: int) -> socket.socket:
+    family = socket.AF_INET6 if ":" in host else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(2048)
+    sock.set_inheritable(True)
+    return sock
+
+
+def _preload() -> None:
+    import importlib
+
+    from .config import get_settings
+
+    get_settings()  # build the settings model before forking
+    for name in _PRELOAD:
+        try:
+            importlib.import_module(name)
+        except ImportError:
+            pass
+
+
+def _worker(sock: socket.socket, drain_timeout: int, log_level: str) -> None:
+    import uvicorn
+
+    from .shared_cache import share_parses
+    from .simulator import terminate_jobs
+
+    for sig in (signal.SIGTERM, signal.SIGINT, signal.SIGALRM):
+        signal.signal(sig, signal.SIG_DFL)
+    share_parses()
+    config = uvicorn.Config(
+        "fpga_testgen.server:app",
+        timeout_graceful_shutdown=drain_timeout,
+        log_level=log_level,
+    )
+    try:
+        uvicorn.Server(config).run(sockets=[sock])
+    finally:
+        terminate_jobs()
+
+
+def serve(
+    host: str = "0.0.0.0",
+    port: int = 8000,
+    workers: int = 2,
+    preload: bool = False,
+    drain_timeout: int | None = None,
+    log_level: str = "info",
+) -> None:
+    """Run ``workers`` server processes until SIGTERM/SIGINT, then drain them."""
+    from .config import settings
+
+    drain = settings.drain_timeout if drain_timeout is None else drain_timeout
+    settings.shared_cache = True
+    os.environ["SHARED_CACHE"] = "true"  # for anything that reloads settings in a worker
+    sock = _bind(host, port)
+    if preload:
+        _preload()
+
+    children: dict[int, int] = {}  # pid -> worker slot
+    started: dict[int, float] = {}  # slot -> when its current worker was spawned
+    quick_exits: dict[int, int] = {}  # slot -> consecutive exits soon after spawning
+    stopping = False
+
+    def spawn(slot: int) -> None:
+        pid = os.fork()
+        if pid == 0:
+            code = 0
+            try:
+                _worker(sock, drain, log_level)
+            except SystemExit as e:
+                code = e.code if isinstance(e.code, int) else 1
+            except BaseException:
+                traceback.print_exc()
+                code = 1
+            finally:
+                sys.stderr.flush()
+                os._exit(code)
+        children[pid] = slot
+        started[slot] = time.monotonic()
+
+    def stop(signum: int, frame) -> None:
+        nonlocal stopping
+        if stopping:
+            return
+        stopping = True
+        for pid in children:
+            _signal(pid, signal.SIGTERM)
+        signal.alarm(drain + 5)
+
+    def kill_stragglers(signum: int, frame) -> None:
+        for pid in children:
+            _signal(pid, signal.SIGKILL)
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+    signal.signal(signal.SIGALRM, kill_stragglers)
+
+    for slot in range(workers):
+        spawn(slot)
+    print(f"Serving on {host}:{sock.getsockname()[1]} with {workers} workers "
+          f"(pids {', '.join(map(str, children))})", file=sys.stderr, flush=True)
+
+    while children:
+        try:
+            pid, status = os.wait()
+        except ChildProcessError:
+            break
+        slot = children.pop(pid, None)
+        if slot is None or stopping:
+            continue
+        code = os.waitstatus_to_exitcode(status)
+        quick = time.monotonic() - started[slot] < QUICK_EXIT
+        quick_exits[slot] = quick_exits.get(slot, 0) + 1 if quick else 0
+        if quick_exits[slot] >= MAX_QUICK_EXITS:
+            print(f"Worker {pid} exited with status {code}; {MAX_QUICK_EXITS} quick exits in a row, "
+                  "not restarting it", file=sys.stderr, flush=True)
+            continue
+        print(f"Worker {pid} exited with status {code}, restarting", file=sys.stderr, flush=True)
+        time.sleep(1)  # no tight loop if workers die on startup
+        if not stopping:
+            spawn(slot)
+    signal.alarm(0)
+    sock.close()
+    if not stopping:
+        raise SystemExit("All server workers failed to start")
+
+
+def _signal(pid: int, sig: int) -> None:
+    try:
+        os.kill(pid, sig)
+    except ProcessLookupError:
+        pass
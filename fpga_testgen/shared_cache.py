@@ -0,0 +1,183 @@
+"""Cross-process cache and job table in one SQLite (WAL) file.
+
+Every server worker process opens the same ``<cache_dir>/shared.db``, so
+a parse or a passing LLM answer from one worker is a hit in all the others,
+and ``/api/jobs`` sees the jobs running in every worker. Compile artifacts
+and pre-flight results already live in files under ``cache_dir`` and are
+shared the same way without going through here.
+"""
+
+from __future__ import annotations
+import hashlib
+import os
+import pickle
+import sqlite3
+import threading
+import time
+import uuid
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, TypeVar
+from .config import settings
+
+T = TypeVar("T")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    namespace TEXT    NOT NULL,
+    key       TEXT    NOT NULL,
+    value     BLOB    NOT NULL,
+    size      INTEGER NOT NULL,
+    accessed  REAL    NOT NULL,
+    PRIMARY KEY (namespace, key)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed);
+CREATE TABLE IF NOT EXISTS jobs (
+    id         TEXT    PRIMARY KEY,
+    kind       TEXT    NOT NULL,
+    pid        INTEGER NOT NULL,
+    started_at REAL    NOT NULL,
+    detail     TEXT    NOT NULL
+);
+"""
+
+_MISSING = object()
+
+
+class SharedCache:
+    """Pickled values by (namespace, key), capped at ``max_bytes``.
+
+    Reads refresh an entry's access time; the least recently read entries
+    are evicted first.
+    """
+
+    def __init__(self, path: Path, max_bytes: int) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(str(path), check_same_thread=False, isolation_level=None, timeout=30)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        self._db.close()
+
+    def get(self, namespace: str, key: str, default: Any = None) -> Any:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT value FROM entries WHERE namespace = ? AND key = ?", (namespace, key)
+            ).fetchone()
+            if row is None:
+                return default
+            self._db.execute(
+                "UPDATE entries SET accessed = ? WHERE namespace = ? AND key = ?", (time.time(), namespace, key)
+            )
+        return pickle.loads(row[0])
+
+    def put(self, namespace: str, key: str, value: Any) -> None:
+        blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO entries (namespace, key, value, size, accessed) VALUES (?, ?, ?, ?, ?)",
+                (namespace, key, blob, len(blob), time.time()),
+            )
+            self._evict()
+
+    def memoize(self, namespace: str, material: str, compute: Callable[[], T]) -> T:
+        """Cached ``compute()`` keyed by the SHA-256 of ``material``."""
+        key = hashlib.sha256(material.encode()).hexdigest()
+        value = self.get(namespace, key, _MISSING)
+        if value is _MISSING:
+            value = compute()
+            self.put(namespace, key, value)
+        return value
+
+    def drop_namespaces(self, prefix: str, keep: str) -> None:
+        """Delete every namespace starting with ``prefix`` except ``keep``."""
+        with self._lock:
+            self._db.execute(
+                "DELETE FROM entries WHERE namespace LIKE ? AND namespace != ?", (f"{prefix}%", keep)
+            )
+
+    def _evict(self) -> None:
+        total = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        rows = self._db.execute("SELECT namespace, key, size FROM entries ORDER BY accessed").fetchall()
+        doomed = []
+        for namespace, key, size in rows:
+            if total <= self.max_bytes:
+                break
+            doomed.append((namespace, key))
+            total -= size
+        self._db.executemany("DELETE FROM entries WHERE namespace = ? AND key = ?", doomed)
+
+    # --- Jobs ---
+
+    @contextmanager
+    def job(self, kind: str, detail: str = "") -> Iterator[str]:
+        """Register a running job for the block (visible to every process)."""
+        job_id = uuid.uuid4().hex
+        with self._lock:
+            self._db.execute(
+                "INSERT INTO jobs (id, kind, pid, started_at, detail) VALUES (?, ?, ?, ?, ?)",
+                (job_id, kind, os.getpid(), time.time(), detail),
+            )
+        try:
+            yield job_id
+        finally:
+            with self._lock:
+                self._db.execute("DELETE FROM jobs WHERE id = ?", (job_id,))
+
+    def jobs(self) -> list[dict]:
+        """Running jobs, oldest first; rows left behind by dead processes are dropped."""
+        from .cores import _alive
+
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT id, kind, pid, started_at, detail FROM jobs ORDER BY started_at"
+            ).fetchall()
+            dead = {pid for _, _, pid, _, _ in rows if not _alive(pid)}
+            if dead:
+                self._db.executemany("DELETE FROM jobs WHERE pid = ?", [(pid,) for pid in dead])
+        keys = ("id", "kind", "pid", "started_at", "detail")
+        return [dict(zip(keys, row)) for row in rows if row[2] not in dead]
+
+
+@lru_cache(maxsize=1)
+def _open(pid: int) -> SharedCache:
+    return SharedCache(settings.cache_dir / "shared.db", settings.shared_cache_mb * 1024 * 1024)
+
+
+def get_cache() -> SharedCache:
+    """This process's connection (a fresh one after fork)."""
+    return _open(os.getpid())
+
+
+def _parse_namespace() -> str:
+    """``parse-<digest of the parser and schema code>``: a new parser never reads old results."""
+    h = hashlib.sha256()
+    for name in ("parser.py", "schemas.py"):
+        h.update(Path(__file__).with_name(name).read_bytes())
+    return f"parse-{h.hexdigest()[:16]}"
+
+
+def share_parses() -> None:
+    """Route ``DesignGraph`` file parses in this process through the shared cache.
+
+    Parses cached by other versions of the parser are dropped.
+    """
+    from . import design
+    from .parser import parse_modules
+
+    namespace = _parse_namespace()
+    get_cache().drop_namespaces("parse", namespace)
+
+    def parse(source: str) -> tuple:
+        return get_cache().memoize(namespace, source, lambda: tuple(parse_modules(source)))
+
+    design._shared_parse = parse
+    design._parse_file.cache_clear()
@@ -1,169 +1,595 @@
 """HDL simulator runner (iverilog / verilator)."""
 
 from __future__ import annotations
-import re
+import hashlib
+import os
+import resource
 import shutil
+import signal
 import subprocess
+import sys
 import tempfile
+import threading
+from collections.abc import Callable, Iterable, Sequence
+from dataclasses import dataclass, field, replace
+from functools import lru_cache
 from pathlib import Path
+from . import cores
 from .config import settings
-from .schemas import SimResult
+from .schemas import ResourceUsage, SimResult
+from .template import TRACE_FILE
+from .tracing import bind, span
 
 
-def _parse_errors(stderr: str) -> list[str]:
-    errors = []
-    for line in stderr.splitlines():
-        line = line.strip()
-        if line and ("error" in line.lower() or "Error" in line):
-            errors.append(line)
-    return errors
+MAX_ERRORS = 50  # error lines kept per result; the full log stays on disk
 
 
-def _check_test_results(stdout: str) -> list[str]:
+def _lines(output: str | Path) -> Iterable[str]:
+    if isinstance(output, Path):
+        with open(output, errors="replace") as f:
+            yield from f
+    else:
+        yield from output.splitlines()
+
+
+def _capped(errors: Iterable[str]) -> list[str]:
+    out, extra = [], 0
+    for err in errors:
+        if len(out) < MAX_ERRORS:
+            out.append(err)
+        else:
+            extra += 1
+    if extra:
+        out.append(f"... {extra} more")
+    return out
+
+
+def _parse_errors(stderr: str | Path) -> list[str]:
+    return _capped(
+        line.strip() for line in _lines(stderr)
+        if line.strip() and ("error" in line.lower() or "Error" in line)
+    )
+
+
+def _is_failure(line: str) -> bool:
+    """Whether an output line reports a failure (a ``fail_count`` summary does not)."""
+    return "FAIL" in line.upper() and "fail_count" not in line
+
+
+def _check_test_results(stdout: str | Path) -> list[str]:
     """Check for FAIL messages in simulation output."""
-    errors = []
-    for line in stdout.splitlines():
-        if "FAIL" in line.upper() and "fail_count" not in line:
-            errors.append(line.strip())
-    return errors
+    return _capped(line.strip() for line in _lines(stdout) if _is_failure(line))
+
+
+def _excerpt(path: Path) -> tuple[str, bool]:
+    """File text, or its head and tail when larger than ``inline_output_kb``."""
+    limit = settings.inline_output_kb * 1024
+    size = path.stat().st_size
+    if size <= limit:
+        return path.read_text(errors="replace"), False
+    with open(path, "rb") as f:
+        head = f.read(limit // 2)
+        f.seek(size - limit // 2)
+        tail = f.read()
+    skipped = size - len(head) - len(tail)
+    text = (
+        head.decode(errors="replace")
+        + f"\n... [{skipped} bytes truncated, full output in artifact] ...\n"
+        + tail.decode(errors="replace")
+    )
+    return text, True
+
+
+# --- Isolated subprocess jobs ---
+# Every compile/simulation step runs in its own session (process group) with
+# CPU, address-space and file-size rlimits. The whole group is killed on
+# timeout, on VCD overflow and after the leader exits, so Verilator's
+# make/g++ grandchildren can never outlive the job.
+
+@dataclass
+class _Job:
+    returncode: int
+    stdout: str  # inline excerpt, see _excerpt
+    stderr: str
+    stdout_path: Path
+    stderr_path: Path
+    stdout_spilled: bool = False  # excerpt is truncated; read stdout_path for all of it
+    stderr_spilled: bool = False
+    usage: ResourceUsage = field(default_factory=ResourceUsage)
+    limit_error: str | None = None  # set when a timeout or resource cap stopped the job
+
+    @property
+    def full_stdout(self) -> str | Path:
+        return self.stdout_path if self.stdout_spilled else self.stdout
+
+    @property
+    def full_stderr(self) -> str | Path:
+        return self.stderr_path if self.stderr_spilled else self.stderr
+
+
+# Sets the limits on itself, then execs the job: the limits are in place
+# before the job's first instruction, without a preexec_fn (which is not
+# safe with the threads that run jobs concurrently).
+_LIMIT_EXEC = (
+    "import os, resource, signal, sys\n"
+    "for sig in (signal.SIGPIPE, signal.SIGXFSZ): signal.signal(sig, signal.SIG_DFL)  # Python ignores them\n"
+    "for rlim, value in zip((resource.RLIMIT_CPU, resource.RLIMIT_AS, resource.RLIMIT_FSIZE), sys.argv[1:4]):\n"
+    "    if int(value) > 0: resource.setrlimit(rlim, (int(value), int(value)))\n"
+    "os.execvp(sys.argv[4], sys.argv[4:])\n"
+)
+
+
+@lru_cache(maxsize=1)
+def _prlimit() -> str | None:
+    return shutil.which("prlimit")
+
+
+def _limited(cmd: list[str], cpu_seconds: int, memory_bytes: int, fsize_bytes: int) -> list[str]:
+    """``cmd`` wrapped to run under the given rlimits (0 = unlimited).
+
+    Uses util-linux ``prlimit`` when installed, else a Python trampoline.
+    """
+    if cpu_seconds <= 0 and memory_bytes <= 0 and fsize_bytes <= 0:
+        return cmd
+    if prlimit := _prlimit():
+        flags = [f"--{name}={value}" for name, value in
+                 (("cpu", cpu_seconds), ("as", memory_bytes), ("fsize", fsize_bytes)) if value > 0]
+        return [prlimit, *flags, "--", *cmd]
+    return [sys.executable, "-I", "-S", "-c", _LIMIT_EXEC,
+            str(cpu_seconds), str(memory_bytes), str(fsize_bytes), *cmd]
+
+
+def _kill_group(pgid: int) -> None:
+    try:
+        os.killpg(pgid, signal.SIGKILL)
+    except (ProcessLookupError, PermissionError):
+        pass
+
+
+_active: set[int] = set()  # process groups of running jobs
+_active_lock = threading.Lock()
+
+
+def terminate_jobs() -> int:
+    """Kill every running compile/simulation job; returns how many there were.
+
+    For shutdown after the drain timeout: the killed jobs return as
+    failed results and no process group outlives the server.
+    """
+    with _active_lock:
+        groups = list(_active)
+    for pgid in groups:
+        _kill_group(pgid)
+    return len(groups)
+
+
+def _dir_bytes(path: Path) -> int:
+    total = 0
+    for entry in os.scandir(path):
+        if entry.is_dir(follow_symlinks=False):
+            total += _dir_bytes(Path(entry.path))
+        elif entry.is_file(follow_symlinks=False):
+            total += entry.stat().st_size
+    return total
+
+
+def _run_job(cmd: list[str], cwd: Path, name: str, watch: Path | None = None) -> _Job:
+    """Run ``cmd`` in an isolated process group and account for its resources.
+
+    stdout/stderr go to ``<name>.stdout``/``<name>.stderr`` in ``cwd`` so
+    they fall under RLIMIT_FSIZE like any other output file. ``watch`` (the
+    VCD) is additionally capped at ``settings.sim_max_vcd_mb``.
+    """
+    vcd_cap = settings.sim_max_vcd_mb * 1024 * 1024
+    stdout_path = cwd / f"{name}.stdout"
+    stderr_path = cwd / f"{name}.stderr"
+    bytes_before = _dir_bytes(cwd)
+
+    limited = _limited(
+        cmd,
+        settings.sim_cpu_limit,
+        settings.sim_memory_limit_mb * 1024 * 1024,
+        settings.sim_max_output_mb * 1024 * 1024,
+    )
+    with open(stdout_path, "wb") as out, open(stderr_path, "wb") as err:
+        proc = subprocess.Popen(
+            limited, cwd=str(cwd), stdin=subprocess.DEVNULL, stdout=out, stderr=err,
+            start_new_session=True,
+        )
+    with _active_lock:
+        _active.add(proc.pid)
+
+    waited: list[tuple[int, int, resource.struct_rusage]] = []
+    waiter = threading.Thread(target=lambda: waited.append(os.wait4(proc.pid, 0)), daemon=True)
+    waiter.start()
+
+    limit_error = None
+    deadline = settings.sim_timeout
+    elapsed = 0.0
+    while waiter.is_alive():
+        waiter.join(0.25)
+        elapsed += 0.25
+        if not waiter.is_alive():
+            break
+        if elapsed >= deadline:
+            limit_error = f"timed out after {deadline}s"
+        elif vcd_cap and watch is not None and watch.exists() and watch.stat().st_size > vcd_cap:
+            limit_error = f"VCD exceeded {settings.sim_max_vcd_mb} MB"
+        if limit_error:
+            _kill_group(proc.pid)
+            waiter.join()
+    _kill_group(proc.pid)  # reap anything the leader left behind
+    with _active_lock:
+        _active.discard(proc.pid)
+
+    _, status, ru = waited[0]
+    proc.returncode = os.waitstatus_to_exitcode(status)
+    if limit_error is None:
+        # Signalled directly, or reported by a wrapping shell as 128 + signal
+        sig = -proc.returncode if proc.returncode < 0 else proc.returncode - 128
+        if sig == signal.SIGXCPU:
+            limit_error = f"CPU limit of {settings.sim_cpu_limit}s exceeded"
+        elif sig == signal.SIGXFSZ:
+            limit_error = f"output file exceeded {settings.sim_max_output_mb} MB"
+
+    stdout, stdout_spilled = _excerpt(stdout_path)
+    stderr, stderr_spilled = _excerpt(stderr_path)
+    return _Job(
+        returncode=proc.returncode,
+        stdout=stdout,
+        stderr=stderr,
+        stdout_path=stdout_path,
+        stderr_path=stderr_path,
+        stdout_spilled=stdout_spilled,
+        stderr_spilled=stderr_spilled,
+        usage=ResourceUsage(
+            cpu_seconds=ru.ru_utime + ru.ru_stime,
+            peak_rss_kb=ru.ru_maxrss,
+            bytes_written=max(0, _dir_bytes(cwd) - bytes_before),
+        ),
+        limit_error=limit_error,
+    )
+
+
+def _compile_failed(job: _Job, usage: ResourceUsage) -> SimResult:
+    if job.limit_error:
+        errors = [f"Compilation stopped: {job.limit_error}"]
+    else:
+        errors = _parse_errors(job.full_stderr) or [job.stderr.strip()]
+    return SimResult(
+        success=False, stdout=job.stdout, stderr=job.stderr, errors=errors, resources=usage,
+        **_spilled(job),
+    )
+
+
+def _finish(tmpdir: Path, job: _Job, usage: ResourceUsage) -> SimResult:
+    """Build the SimResult for a completed simulation run."""
+    vcd_file = tmpdir / "dump.vcd"
+    trace_file = tmpdir / TRACE_FILE
+    if job.limit_error:
+        if job.limit_error.startswith("timed out"):
+            errors = ["Simulation timed out (possible infinite loop)"]
+        else:
+            errors = [f"Simulation stopped: {job.limit_error}"]
+        return SimResult(
+            success=False, stdout=job.stdout, stderr=job.stderr, errors=errors, resources=usage,
+            **_spilled(job),
+        )
+
+    test_errors = _check_test_results(job.full_stdout)
+    return SimResult(
+        success=job.returncode == 0 and not test_errors,
+        stdout=job.stdout,
+        stderr=job.stderr,
+        vcd_path=vcd_file if vcd_file.exists() else None,
+        errors=test_errors or _parse_errors(job.full_stderr),
+        trace_path=trace_file if trace_file.exists() else None,
+        resources=usage,
+        **_spilled(job),
+    )
+
+
+def _spilled(job: _Job) -> dict[str, Path | None]:
+    return {
+        "stdout_path": job.stdout_path if job.stdout_spilled else None,
+        "stderr_path": job.stderr_path if job.stderr_spilled else None,
+    }
+
+
+def _write_sources(tmpdir: Path, design_sources: Sequence[str], testbench_source: str) -> list[Path]:
+    """Write design files (design.v, design_1.v, ...) followed by tb.v."""
+    files = []
+    for i, src in enumerate(design_sources):
+        f = tmpdir / ("design.v" if i == 0 else f"design_{i}.v")
+        f.write_text(src)
+        files.append(f)
+    tb_file = tmpdir / "tb.v"
+    tb_file.write_text(testbench_source)
+    files.append(tb_file)
+    return files
+
+
+# --- Compile artifact cache ---
+# Keyed by the content of every compiled file, so editing one module only
+# misses for the tops whose file set includes it.
+
+def _cache_key(tool: str, design_sources: Sequence[str], testbench_source: str, flags: str = "") -> str:
+    h = hashlib.sha256(tool.encode())
+    h.update(flags.encode())
+    for src in [*design_sources, testbench_source]:
+        h.update(b"\0")
+        h.update(src.encode())
+    return h.hexdigest()
+
+
+def _cache_fetch(key: str, dest: Path) -> bool:
+    entry = settings.cache_dir / "compile" / key
+    cached = entry / dest.name
+    if not cached.exists():
+        return False
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    shutil.copy2(cached, dest)
+    os.utime(entry)
+    return True
+
+
+def _cache_store(key: str, artifact: Path) -> None:
+    root = settings.cache_dir / "compile"
+    entry = root / key
+    entry.mkdir(parents=True, exist_ok=True)
+    tmp = entry / f".{artifact.name}.{os.getpid()}"
+    shutil.copy2(artifact, tmp)
+    os.replace(tmp, entry / artifact.name)
+
+    entries = sorted(root.iterdir(), key=lambda p: p.stat().st_mtime)
+    for old in entries[:max(0, len(entries) - settings.compile_cache_entries)]:
+        shutil.rmtree(old, ignore_errors=True)
 
 
 def simulate(
-    design_source: str,
+    design_source: str | Sequence[str],
+    testbench_source: str,
+    simulator: str | None = None,
+    seeds: Sequence[int] | None = None,
+    stop_when: Callable[[list[SimResult]], bool] | None = None,
+) -> SimResult:
+    """Run simulation and return results.
+
+    ``design_source`` may be a single source or one source per file.
+
+    With ``seeds``, the testbench is compiled once and run with ``+seed=N``
+    for every seed, ``settings.sim_jobs`` runs at a time. After each wave
+    ``stop_when`` gets that wave's results and may end the sweep early;
+    a failing seed also ends it. The returned result aggregates the sweep
+    and lists each run in ``seed_runs``.
+
+    With ``settings.sim_workers`` set, the job is shipped to the least
+    loaded remote worker that supports ``simulator`` (see ``worker``).
+    """
+    if settings.sim_workers:
+        from .worker import get_dispatcher
+
+        return get_dispatcher(settings.sim_workers).simulate(
+            design_source, testbench_source, simulator, seeds, stop_when
+        )
+    return simulate_local(design_source, testbench_source, simulator, seeds, stop_when)
+
+
+def simulate_local(
+    design_source: str | Sequence[str],
     testbench_source: str,
     simulator: str | None = None,
+    seeds: Sequence[int] | None = None,
+    stop_when: Callable[[list[SimResult]], bool] | None = None,
+    scratch: list[Path] | None = None,
 ) -> SimResult:
-    """Run simulation and return results."""
+    """``simulate`` on this machine, ignoring ``settings.sim_workers``.
+
+    The job's working directory (compile output and every run's files) is
+    appended to ``scratch``, for a caller that removes it once done with
+    the result.
+    """
+    compiled = compile_simulation(design_source, testbench_source, simulator)
+    if scratch is not None and compiled.workdir.parts:
+        scratch.append(compiled.workdir)
+    if compiled.failure:
+        return compiled.failure
+    if seeds:
+        return _sweep(compiled, list(seeds), stop_when)
+    result = run_simulation(compiled, workdir=compiled.workdir)
+    result.resources.add(compiled.usage)
+    return result
+
+
+def _sweep(
+    compiled: CompiledSim, seeds: list[int], stop_when: Callable[[list[SimResult]], bool] | None
+) -> SimResult:
+    from concurrent.futures import ThreadPoolExecutor
+
+    def run(seed: int) -> SimResult:
+        workdir = Path(tempfile.mkdtemp(prefix=f"seed{seed}_", dir=compiled.workdir))
+        result = run_simulation(compiled, [f"+seed={seed}"], workdir)
+        result.seed = seed
+        return result
+
+    jobs = settings.sim_jobs or max(1, cores.budget() // compiled.threads)
+    runs: list[SimResult] = []
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        for i in range(0, len(seeds), jobs):
+            wave = list(pool.map(bind(run), seeds[i:i + jobs]))
+            runs.extend(wave)
+            if not all(r.success for r in wave) or (stop_when and stop_when(wave)):
+                break
+
+    failed = [r for r in runs if not r.success]
+    first = failed[0] if failed else runs[0]
+    usage = ResourceUsage()
+    usage.add(compiled.usage)
+    for r in runs:
+        usage.add(r.resources)
+    return replace(
+        first,
+        success=not failed,
+        errors=[f"[seed {r.seed}] {e}" for r in failed for e in r.errors],
+        resources=usage,
+        seed_runs=runs,
+    )
+
+
+@dataclass
+class CompiledSim:
+    """A compiled testbench that can be run any number of times."""
+    simulator: str
+    workdir: Path
+    command: list[str] = field(default_factory=list)  # run command; plusargs are appended
+    threads: int = 1  # cores one run occupies
+    build_config: dict | None = None  # Verilator build/optimization choices
+    usage: ResourceUsage = field(default_factory=ResourceUsage)
+    failure: SimResult | None = None  # set when compilation failed
+
+
+def compile_simulation(
+    design_source: str | Sequence[str],
+    testbench_source: str,
+    simulator: str | None = None,
+) -> CompiledSim:
+    """Compile design + testbench once (through the compile cache)."""
     sim = simulator or settings.default_simulator
+    design_sources = [design_source] if isinstance(design_source, str) else list(design_source)
 
-    if sim == "iverilog":
-        return _run_iverilog(design_source, testbench_source)
-    elif sim == "verilator":
-        return _run_verilator(design_source, testbench_source)
-    else:
-        raise ValueError(f"Unknown simulator: {sim}")
+    with span("compile", simulator=sim):
+        if sim == "iverilog":
+            return _compile_iverilog(design_sources, testbench_source)
+        elif sim == "verilator":
+            return _compile_verilator(design_sources, testbench_source)
+        else:
+            raise ValueError(f"Unknown simulator: {sim}")
+
+
+def run_simulation(
+    compiled: CompiledSim,
+    plusargs: Sequence[str] = (),
+    workdir: Path | None = None,
+) -> SimResult:
+    """Run a compiled simulation with extra ``+name=value`` plusargs.
 
+    Each run gets its own working directory (dump.vcd, trace file) unless
+    ``workdir`` is given, so runs of one compile may execute concurrently.
+    ``resources`` covers this run only, not the compile.
+    """
+    if compiled.failure:
+        return compiled.failure
+    workdir = workdir or Path(tempfile.mkdtemp(prefix="fpga_testgen_run_"))
+    with span("simulate", simulator=compiled.simulator, plusargs=" ".join(plusargs)), \
+            cores.lease(compiled.threads, minimum=compiled.threads):
+        job = _run_job([*compiled.command, *plusargs], workdir, "sim", watch=workdir / "dump.vcd")
+    result = _finish(workdir, job, job.usage)
+    result.build_config = compiled.build_config
+    return result
 
-def _run_iverilog(design_source: str, testbench_source: str) -> SimResult:
+
+def _compile_iverilog(design_sources: list[str], testbench_source: str) -> CompiledSim:
     if not shutil.which("iverilog"):
-        return SimResult(
+        return CompiledSim("iverilog", Path(), failure=SimResult(
             success=False, stdout="", stderr="",
             errors=["iverilog not found. Install with: sudo dnf install iverilog"],
-        )
+        ))
 
     tmpdir = Path(tempfile.mkdtemp(prefix="fpga_testgen_"))
-    design_file = tmpdir / "design.v"
-    tb_file = tmpdir / "tb.v"
+    compiled = CompiledSim("iverilog", tmpdir)
+
     out_file = tmpdir / "out.vvp"
-    vcd_file = tmpdir / "dump.vcd"
+    files = _write_sources(tmpdir, design_sources, testbench_source)
+    key = _cache_key("iverilog", design_sources, testbench_source)
 
-    design_file.write_text(design_source)
-    tb_file.write_text(testbench_source)
+    if not (settings.compile_cache and _cache_fetch(key, out_file)):
+        job = _run_job(["iverilog", "-o", str(out_file), *map(str, files)], tmpdir, "compile")
+        compiled.usage.add(job.usage)
+        if job.returncode != 0 or job.limit_error:
+            compiled.failure = _compile_failed(job, compiled.usage)
+            return compiled
+        if settings.compile_cache:
+            _cache_store(key, out_file)
 
-    # Compile
-    compile_result = subprocess.run(
-        ["iverilog", "-o", str(out_file), str(design_file), str(tb_file)],
-        capture_output=True, text=True, timeout=settings.sim_timeout,
-        cwd=str(tmpdir),
-    )
+    compiled.command = ["vvp", str(out_file)]
+    return compiled
 
-    if compile_result.returncode != 0:
-        errors = _parse_errors(compile_result.stderr)
-        if not errors:
-            errors = [compile_result.stderr.strip()]
-        return SimResult(
-            success=False,
-            stdout=compile_result.stdout,
-            stderr=compile_result.stderr,
-            errors=errors,
-        )
 
-    # Run simulation
-    try:
-        sim_result = subprocess.run(
-            ["vvp", str(out_file)],
-            capture_output=True, text=True, timeout=settings.sim_timeout,
-            cwd=str(tmpdir),
-        )
-    except subprocess.TimeoutExpired:
-        return SimResult(
-            success=False, stdout="", stderr="",
-            errors=["Simulation timed out (possible infinite loop)"],
-        )
+def verilator_config(design_sources: Sequence[str]) -> dict:
+    """Thread count and optimization flags for a Verilator build.
 
-    test_errors = _check_test_results(sim_result.stdout)
-    vcd_path = vcd_file if vcd_file.exists() else None
+    With ``verilator_threads = 0`` only designs of at least
+    ``verilator_mt_min_lines`` lines are multithreaded (smaller models lose
+    more to thread synchronization than they gain), with one more thread
+    per ``verilator_mt_min_lines`` lines, up to ``verilator_max_threads``
+    and the core budget. The count depends only on the design and the
+    settings, never on current load, so it can key the compile cache;
+    load is accounted for by the core lease at run time.
+    """
+    threads = settings.verilator_threads
+    if threads <= 0:
+        lines = sum(src.count("\n") for src in design_sources)
+        threads = 1
+        if lines >= settings.verilator_mt_min_lines:
+            threads = max(1, min(
+                settings.verilator_max_threads, cores.budget(), lines // settings.verilator_mt_min_lines + 1
+            ))
+    return {
+        "threads": threads,
+        "opt": settings.verilator_opt,
+        "x_assign": settings.verilator_x_assign,
+        "build_jobs": 0,  # filled in from the core lease at build time
+    }
 
-    return SimResult(
-        success=sim_result.returncode == 0 and not test_errors,
-        stdout=sim_result.stdout,
-        stderr=sim_result.stderr,
-        vcd_path=vcd_path,
-        errors=test_errors or _parse_errors(sim_result.stderr),
-    )
+
+def _verilator_cmd(files: Sequence[Path], config: dict) -> list[str]:
+    cmd = ["verilator", "--binary", "--trace", "-Wno-fatal", "-o", "sim"]
+    if config["opt"]:
+        cmd.append(config["opt"])
+    if config["x_assign"]:
+        cmd += ["--x-assign", config["x_assign"]]
+    if config["threads"] > 1:
+        cmd += ["--threads", str(config["threads"])]
+    if config["build_jobs"]:
+        cmd += ["-j", str(config["build_jobs"])]
+    return cmd + [str(f) for f in files]
 
 
-def _run_verilator(design_source: str, testbench_source: str) -> SimResult:
+def _compile_verilator(design_sources: list[str], testbench_source: str) -> CompiledSim:
     if not shutil.which("verilator"):
-        return SimResult(
+        return CompiledSim("verilator", Path(), failure=SimResult(
             success=False, stdout="", stderr="",
             errors=["verilator not found. Install with: sudo dnf install verilator"],
-        )
+        ))
 
     tmpdir = Path(tempfile.mkdtemp(prefix="fpga_testgen_"))
-    design_file = tmpdir / "design.v"
-    tb_file = tmpdir / "tb.v"
-    vcd_file = tmpdir / "dump.vcd"
+    config = verilator_config(design_sources)
+    compiled = CompiledSim("verilator", tmpdir, threads=config["threads"], build_config=config)
 
-    design_file.write_text(design_source)
-    tb_file.write_text(testbench_source)
-
-    # Compile with Verilator
-    compile_result = subprocess.run(
-        ["verilator", "--binary", "--trace", "-Wno-fatal",
-         "-o", "sim", str(design_file), str(tb_file)],
-        capture_output=True, text=True, timeout=settings.sim_timeout,
-        cwd=str(tmpdir),
-    )
-
-    if compile_result.returncode != 0:
-        errors = _parse_errors(compile_result.stderr)
-        if not errors:
-            errors = [compile_result.stderr.strip()]
-        return SimResult(
-            success=False,
-            stdout=compile_result.stdout,
-            stderr=compile_result.stderr,
-            errors=errors,
-        )
-
-    # Find and run the binary
     sim_binary = tmpdir / "obj_dir" / "sim"
-    if not sim_binary.exists():
-        return SimResult(
-            success=False, stdout="", stderr="",
-            errors=["Verilator binary not found after compilation"],
-        )
+    files = _write_sources(tmpdir, design_sources, testbench_source)
+    flags = f"{config['opt']} {config['x_assign']} {config['threads']}"  # build_jobs does not change the binary
+    key = _cache_key("verilator", design_sources, testbench_source, flags)
 
-    try:
-        sim_result = subprocess.run(
-            [str(sim_binary)],
-            capture_output=True, text=True, timeout=settings.sim_timeout,
-            cwd=str(tmpdir),
-        )
-    except subprocess.TimeoutExpired:
-        return SimResult(
-            success=False, stdout="", stderr="",
-            errors=["Simulation timed out (possible infinite loop)"],
-        )
+    if not (settings.compile_cache and _cache_fetch(key, sim_binary)):
+        with cores.lease(settings.verilator_build_jobs or cores.budget()) as jobs:
+            config["build_jobs"] = jobs
+            job = _run_job(_verilator_cmd(files, config), tmpdir, "compile")
+        compiled.usage.add(job.usage)
+        if job.returncode != 0 or job.limit_error:
+            compiled.failure = _compile_failed(job, compiled.usage)
+            return compiled
 
-    test_errors = _check_test_results(sim_result.stdout)
-    vcd_path = vcd_file if vcd_file.exists() else None
+        # Find the binary
+        if not sim_binary.exists():
+            compiled.failure = SimResult(
+                success=False, stdout="", stderr="",
+                errors=["Verilator binary not found after compilation"],
+                resources=compiled.usage,
+            )
+            return compiled
+        if settings.compile_cache:
+            _cache_store(key, sim_binary)
 
-    return SimResult(
-        success=sim_result.returncode == 0 and not test_errors,
-        stdout=sim_result.stdout,
-        stderr=sim_result.stderr,
-        vcd_path=vcd_path,
-        errors=test_errors or _parse_errors(sim_result.stderr),
-    )
+    compiled.command = [str(sim_binary)]
+    return compiled
@@ -0,0 +1,191 @@
+"""Deterministic template-based testbench synthesis (no LLM)."""
+
+from __future__ import annotations
+from .schemas import VerilogModule, VerilogPort, is_active_low
+
+TRACE_FILE = "trace.txt"
+EXHAUSTIVE_MAX_BITS = 8
+RANDOM_VECTORS = 64
+
+
+def _decl(kind: str, port: VerilogPort) -> str:
+    w = f"[{port.width - 1}:0] " if port.width > 1 else ""
+    return f"    {kind} {w}{port.name};"
+
+
+def _random_expr(width: int) -> str:
+    words = (width + 31) // 32
+    if words == 1:
+        return "$random(seed)"
+    return "{" + ", ".join(["$random(seed)"] * words) + "}"
+
+
+def synthesize_testbench(module: VerilogModule, trace: bool = False) -> tuple[str, str]:
+    """Build a stimulus testbench straight from the module port list.
+
+    The testbench drives exhaustive (<= 8 input bits) or boundary + random
+    stimulus and flags any X/Z on the outputs. Random vectors are seeded
+    from the ``+seed=N`` plusarg (default 1). With ``trace=True`` the
+    outputs are instead recorded to TRACE_FILE once per vector (golden
+    capture) and never judged. Returns (testbench_code, description) like
+    ``generate_testbench``.
+    """
+    clk = module.clock
+    inputs = module.data_inputs
+    # Every reset-named input is pulsed together with the primary reset
+    resets = [p for p in module.inputs if p is not clk and p not in inputs]
+    outputs = module.outputs
+    inouts = [p for p in module.ports if p.direction == "inout"]
+    total_input_bits = module.total_input_bits
+    exhaustive = total_input_bits <= EXHAUSTIVE_MAX_BITS
+
+    tb_name = f"tb_{module.name}"
+    lines = ["`timescale 1ns/1ps", "", f"module {tb_name};", ""]
+    for p in ([clk] if clk else []) + resets + inputs:
+        lines.append(_decl("reg", p))
+    for p in outputs + inouts:
+        lines.append(_decl("wire", p))
+    lines += [
+        "",
+        "    integer pass_count = 0;",
+        "    integer fail_count = 0;",
+        "    integer i;",
+        "    integer seed = 1;",
+    ]
+    if trace:
+        lines.append("    integer trace_fd;")
+    lines += [
+        "",
+        f"    {module.name} dut (",
+        ",\n".join(f"        .{p.name}({p.name})" for p in module.ports),
+        "    );",
+        "",
+    ]
+
+    if clk:
+        lines += [
+            "    initial begin",
+            f"        {clk.name} = 0;",
+            f"        forever #5 {clk.name} = ~{clk.name};",
+            "    end",
+            "",
+        ]
+
+    lines += [
+        "    initial begin",
+        '        $dumpfile("dump.vcd");',
+        f"        $dumpvars(0, {tb_name});",
+        "    end",
+        "",
+        "    initial begin",
+        "        #100000;",
+        '        $display("Timeout");',
+        "        $finish;",
+        "    end",
+        "",
+        "    task check_outputs;",
+        "        begin",
+    ]
+    if trace:
+        if outputs:
+            fmt = " ".join(["%b"] * len(outputs))
+            lines.append(f'            $fdisplay(trace_fd, "{fmt}", {", ".join(p.name for p in outputs)});')
+        lines.append("            pass_count = pass_count + 1;")
+    elif outputs:
+        out_concat = "{" + ", ".join(p.name for p in outputs) + "}"
+        lines += [
+            f"            if (^{out_concat} === 1'bx) begin",
+            "                fail_count = fail_count + 1;",
+            f'                $display("FAIL: unknown output value %b at time %0t", {out_concat}, $time);',
+            "            end else begin",
+            "                pass_count = pass_count + 1;",
+            "            end",
+        ]
+    else:
+        lines.append("            pass_count = pass_count + 1;")
+    lines += ["        end", "    endtask", ""]
+
+    # Stimulus application: sample on the next rising edge for sequential
+    # designs, after a settle delay for combinational ones.
+    if clk:
+        settle = f"@(posedge {clk.name}); #1;"
+        pre = f"@(negedge {clk.name}); "
+    else:
+        settle = "#10;"
+        pre = ""
+
+    lines += [
+        "    initial begin",
+        '        if (!$value$plusargs("seed=%d", seed)) seed = 1;',
+    ]
+    if trace:
+        lines.append(f'        trace_fd = $fopen("{TRACE_FILE}", "w");')
+    for p in inputs:
+        lines.append(f"        {p.name} = 0;")
+    if resets:
+        for p in resets:
+            lines.append(f"        {p.name} = {0 if is_active_low(p.name) else 1};")
+        if clk:
+            lines += [f"        repeat (2) @(posedge {clk.name});", f"        @(negedge {clk.name});"]
+        else:
+            lines.append("        #20;")
+        for p in resets:
+            lines.append(f"        {p.name} = {1 if is_active_low(p.name) else 0};")
+
+    if not inputs:
+        lines += [
+            f"        repeat ({RANDOM_VECTORS}) begin",
+            f"            {settle}",
+            "            check_outputs;",
+            "        end",
+        ]
+    elif exhaustive:
+        in_concat = "{" + ", ".join(p.name for p in inputs) + "}"
+        lines += [
+            f"        for (i = 0; i < {1 << total_input_bits}; i = i + 1) begin",
+            f"            {pre}{in_concat} = i;",
+            f"            {settle}",
+            "            check_outputs;",
+            "        end",
+        ]
+    else:
+        for fill in ("0", "1"):
+            assigns = " ".join(f"{p.name} = {{{p.width}{{1'b{fill}}}}};" for p in inputs)
+            lines += [f"        {pre}{assigns}", f"        {settle}", "        check_outputs;"]
+        lines.append(f"        for (i = 0; i < {RANDOM_VECTORS}; i = i + 1) begin")
+        if pre:
+            lines.append(f"            {pre.strip()}")
+        for p in inputs:
+            lines.append(f"            {p.name} = {_random_expr(p.width)};")
+        lines += [f"            {settle}", "            check_outputs;", "        end"]
+
+    if trace:
+        lines.append("        $fclose(trace_fd);")
+    lines += [
+        "        if (fail_count == 0)",
+        '            $display("PASS: %0d tests passed", pass_count);',
+        "        else",
+        '            $display("FAIL: %0d tests failed", fail_count);',
+        "        $finish;",
+        "    end",
+        "",
+        "endmodule",
+        "",
+    ]
+
+    if not inputs:
+        stimulus = f"free-running for {RANDOM_VECTORS} cycles"
+    elif exhaustive:
+        stimulus = f"exhaustive stimulus over {total_input_bits} input bits"
+    else:
+        stimulus = f"boundary values plus {RANDOM_VECTORS} random vectors"
+    scaffolding = []
+    if clk:
+        scaffolding.append(f"clock on {clk.name}")
+    if resets:
+        scaffolding.append(f"reset via {', '.join(p.name for p in resets)}")
+    desc = f"Template testbench: {stimulus}"
+    if scaffolding:
+        desc += f" ({', '.join(scaffolding)})"
+    desc += "; outputs recorded for golden comparison." if trace else "; outputs checked for X/Z."
+    return "\n".join(lines), desc
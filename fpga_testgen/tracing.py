@@ -0,0 +1,133 @@
+"""Lightweight span tracing, exported as Chrome trace-event JSON.
+
+Spans are recorded only while a ``profile()`` block is active in the
+current context; otherwise ``span()`` is a no-op. The trace opens in
+chrome://tracing, Perfetto or speedscope (flame chart per thread), so
+overlapping compiles and runs of a batch show up side by side.
+
+Spans marked ``profile=True`` (Python hot paths such as VCD analysis) can
+also run under cProfile; their merged stats are written next to the trace
+as ``<trace>.prof`` for snakeviz/flameprof.
+"""
+
+from __future__ import annotations
+import contextvars
+import os
+import threading
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, ContextManager, TypeVar
+
+if TYPE_CHECKING:
+    import cProfile
+
+T = TypeVar("T")
+
+_current: contextvars.ContextVar[Tracer | None] = contextvars.ContextVar("fpga_testgen_tracer", default=None)
+_profiling = threading.local()  # cProfile nests badly; one profiled span per thread at a time
+
+
+class Tracer:
+    """Collects complete ("X") events from any number of threads."""
+
+    def __init__(self, python_profile: bool = False) -> None:
+        self.python_profile = python_profile
+        self.events: list[dict] = []
+        self._profiles: list[cProfile.Profile] = []
+        self._threads: set[int] = set()
+        self._lock = threading.Lock()
+        self._origin = time.perf_counter_ns()
+
+    @contextmanager
+    def span(self, name: str, category: str, profile: bool, args: dict[str, Any]) -> Iterator[None]:
+        prof = self._start_profile() if profile and self.python_profile else None
+        start = time.perf_counter_ns()
+        try:
+            yield
+        except BaseException as exc:
+            args["error"] = type(exc).__name__
+            raise
+        finally:
+            end = time.perf_counter_ns()
+            if prof:
+                prof.disable()
+                _profiling.active = False
+            self._record(name, category, start, end, args, prof)
+
+    def _start_profile(self) -> cProfile.Profile | None:
+        if getattr(_profiling, "active", False):
+            return None
+        import cProfile
+
+        prof = cProfile.Profile()
+        try:
+            prof.enable()
+        except ValueError:  # another profiler owns the interpreter (3.12+)
+            return None
+        _profiling.active = True
+        return prof
+
+    def _record(
+        self, name: str, category: str, start: int, end: int, args: dict, prof: cProfile.Profile | None
+    ) -> None:
+        tid = threading.get_native_id()
+        event = {
+            "name": name, "cat": category, "ph": "X",
+            "ts": (start - self._origin) / 1000, "dur": (end - start) / 1000,
+            "pid": os.getpid(), "tid": tid,
+            "args": {k: v if isinstance(v, (int, float, bool)) else str(v) for k, v in args.items()},
+        }
+        with self._lock:
+            if tid not in self._threads:
+                self._threads.add(tid)
+                self.events.append({
+                    "name": "thread_name", "ph": "M", "pid": os.getpid(), "tid": tid,
+                    "args": {"name": threading.current_thread().name},
+                })
+            self.events.append(event)
+            if prof:
+                self._profiles.append(prof)
+
+    def write(self, path: Path) -> None:
+        """Write the trace JSON to ``path`` and cProfile stats to ``path.prof``."""
+        import json
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            events, profiles = list(self.events), list(self._profiles)
+        path.write_text(json.dumps({"traceEvents": events, "displayTimeUnit": "ms"}))
+        if profiles:
+            import pstats
+
+            stats = pstats.Stats(profiles[0])
+            for prof in profiles[1:]:
+                stats.add(prof)
+            stats.dump_stats(path.with_name(f"{path.name}.prof"))
+
+
+def span(name: str, category: str = "stage", profile: bool = False, **args: Any) -> ContextManager[None]:
+    """Time the enclosed block as one span (no-op unless tracing is on)."""
+    tracer = _current.get()
+    if tracer is None:
+        return nullcontext()
+    return tracer.span(name, category, profile, args)
+
+
+def bind(fn: Callable[..., T]) -> Callable[..., T]:
+    """Carry the current tracer into pool threads (``pool.map(bind(fn), ...)``)."""
+    ctx = contextvars.copy_context()
+    return lambda *a, **kw: ctx.copy().run(fn, *a, **kw)
+
+
+@contextmanager
+def profile(path: Path, python: bool = False) -> Iterator[Tracer]:
+    """Trace everything run in this context and write the trace to ``path``."""
+    tracer = Tracer(python_profile=python)
+    token = _current.set(tracer)
+    try:
+        yield tracer
+    finally:
+        _current.reset(token)
+        tracer.write(path)
@@ -0,0 +1,191 @@
+"""Multi-resolution waveform index for browsing large VCDs in the web UI."""
+
+from __future__ import annotations
+import os
+import uuid
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+import numpy as np
+from .config import settings
+
+MAX_BUCKETS = 4096  # buckets in the finest summary level
+FANOUT = 4          # each coarser level merges this many buckets
+_VALUE_MASK = (1 << 63) - 1
+
+
+@dataclass
+class WaveformIndex:
+    """Per-signal change arrays plus min/max summaries per time bucket.
+
+    Values are int64 with X/Z encoded as -1 (signals wider than 63 bits keep
+    their low 63 bits). Summary level ``k`` uses buckets of
+    ``bucket * FANOUT**k`` time units; a bucket's ``lo``/``hi`` cover every
+    value held during it, so ``lo == -1`` marks a bucket that saw X/Z and
+    ``lo != hi`` marks activity.
+    """
+    signals: list[str]
+    widths: list[int]
+    end_time: int
+    bucket: int
+    times: list[np.ndarray]   # per signal, int64 change times
+    values: list[np.ndarray]  # per signal, int64 values after each change
+    lo: list[np.ndarray]      # per level, (signals, buckets) int64
+    hi: list[np.ndarray]
+    changes: list[np.ndarray]  # per level, (signals, buckets) int32 change counts
+
+    def value_at(self, sig: int, t: int) -> int:
+        i = np.searchsorted(self.times[sig], t, side="right") - 1
+        return int(self.values[sig][i]) if i >= 0 else -1
+
+    def window(self, signals: list[str], start: int, end: int, points: int = 1000) -> list[dict]:
+        """Signals over ``[start, end]`` with at most ~``points`` entries each.
+
+        A signal with few enough changes in the window comes back as raw
+        ``changes``; otherwise as ``buckets`` from the finest summary level
+        whose bucket size covers the window in ``points`` buckets.
+        """
+        start, end = max(0, start), max(start, min(end, self.end_time))
+        size = self.bucket
+        level = 0
+        while (end - start) // size + 1 > points and level + 1 < len(self.lo):
+            size *= FANOUT
+            level += 1
+        b0, b1 = start // size, end // size + 1
+
+        out = []
+        for name in signals:
+            sig = self.signals.index(name)
+            t = self.times[sig]
+            i0 = np.searchsorted(t, start, side="right")
+            i1 = np.searchsorted(t, end, side="right")
+            entry: dict = {"name": name, "width": self.widths[sig], "initial": self.value_at(sig, start)}
+            if i1 - i0 <= points:
+                entry.update(kind="changes", times=t[i0:i1].tolist(), values=self.values[sig][i0:i1].tolist())
+            else:
+                entry.update(
+                    kind="buckets",
+                    bucket=size,
+                    times=(np.arange(b0, b1, dtype=np.int64) * size).tolist(),
+                    lo=self.lo[level][sig, b0:b1].tolist(),
+                    hi=self.hi[level][sig, b0:b1].tolist(),
+                    changes=self.changes[level][sig, b0:b1].tolist(),
+                )
+            out.append(entry)
+        return out
+
+
+def _decode(raw: str) -> int:
+    try:
+        return int(raw, 2) & _VALUE_MASK
+    except ValueError:
+        return -1  # X/Z anywhere in the vector
+
+
+def _summarize(times: np.ndarray, values: np.ndarray, size: int, buckets: int):
+    """Finest-level lo/hi/change count for one signal."""
+    starts = np.arange(buckets, dtype=np.int64) * size
+    held = np.searchsorted(times, starts, side="right") - 1
+    carried = np.where(held >= 0, values[np.maximum(held, 0)], -1)
+    lo, hi = carried.copy(), carried.copy()
+    counts = np.zeros(buckets, dtype=np.int32)
+    if len(times):
+        ids = times // size
+        ids_u, first = np.unique(ids, return_index=True)
+        lo[ids_u] = np.minimum(lo[ids_u], np.minimum.reduceat(values, first))
+        hi[ids_u] = np.maximum(hi[ids_u], np.maximum.reduceat(values, first))
+        counts[ids_u] = np.diff(np.append(first, len(ids)))
+    return lo, hi, counts
+
+
+def _coarsen(arr: np.ndarray, ufunc: np.ufunc, fill: int) -> np.ndarray:
+    pad = (-arr.shape[1]) % FANOUT
+    if pad:
+        arr = np.pad(arr, ((0, 0), (0, pad)), constant_values=fill)
+    return ufunc.reduce(arr.reshape(arr.shape[0], -1, FANOUT), axis=2)
+
+
+def build_index(vcd_path: Path) -> WaveformIndex:
+    """Convert a VCD into a WaveformIndex (every signal, every scope)."""
+    from vcdvcd import VCDVCD
+
+    vcd = VCDVCD(str(vcd_path))
+    names = sorted(vcd.signals)
+    end_time = max([int(vcd.endtime)] + [vcd[n].tv[-1][0] for n in names if vcd[n].tv])
+    bucket = max(1, -(-(end_time + 1) // MAX_BUCKETS))
+    nbuckets = (end_time // bucket) + 1
+
+    times, values, widths = [], [], []
+    lo = np.empty((len(names), nbuckets), dtype=np.int64)
+    hi = np.empty_like(lo)
+    changes = np.empty((len(names), nbuckets), dtype=np.int32)
+    for i, name in enumerate(names):
+        sig = vcd[name]
+        decoded: dict[str, int] = {}
+        tv = sig.tv
+        t = np.fromiter((ts for ts, _ in tv), dtype=np.int64, count=len(tv))
+        v = np.fromiter(
+            (decoded[raw] if raw in decoded else decoded.setdefault(raw, _decode(raw)) for _, raw in tv),
+            dtype=np.int64, count=len(tv),
+        )
+        times.append(t)
+        values.append(v)
+        widths.append(int(sig.size))
+        lo[i], hi[i], changes[i] = _summarize(t, v, bucket, nbuckets)
+
+    los, his, counts = [lo], [hi], [changes]
+    while los[-1].shape[1] > 1:
+        los.append(_coarsen(los[-1], np.minimum, np.iinfo(np.int64).max))
+        his.append(_coarsen(his[-1], np.maximum, -1))
+        counts.append(_coarsen(counts[-1], np.add, 0))
+    return WaveformIndex(names, widths, end_time, bucket, times, values, los, his, counts)
+
+
+# --- Storage under <cache_dir>/waveforms ---
+
+def _root() -> Path:
+    return settings.cache_dir / "waveforms"
+
+
+def save_index(index: WaveformIndex) -> str:
+    """Store an index and return its id; old indexes are evicted by mtime."""
+    root = _root()
+    root.mkdir(parents=True, exist_ok=True)
+    waveform_id = uuid.uuid4().hex
+    arrays = {
+        "signals": np.array(index.signals, dtype=str),
+        "widths": np.array(index.widths, dtype=np.int64),
+        "meta": np.array([index.end_time, index.bucket, len(index.lo)], dtype=np.int64),
+    }
+    for i, (t, v) in enumerate(zip(index.times, index.values)):
+        arrays[f"t{i}"], arrays[f"v{i}"] = t, v
+    for k in range(len(index.lo)):
+        arrays[f"lo{k}"], arrays[f"hi{k}"], arrays[f"n{k}"] = index.lo[k], index.hi[k], index.changes[k]
+    tmp = root / f".{waveform_id}.{os.getpid()}.npz"
+    np.savez(tmp, **arrays)
+    os.replace(tmp, root / f"{waveform_id}.npz")
+
+    entries = sorted(root.glob("*.npz"), key=lambda p: p.stat().st_mtime)
+    for old in entries[:max(0, len(entries) - settings.waveform_cache_entries)]:
+        old.unlink(missing_ok=True)
+    return waveform_id
+
+
+@lru_cache(maxsize=8)
+def load_index(waveform_id: str) -> WaveformIndex:
+    if not waveform_id.isalnum():
+        raise FileNotFoundError(waveform_id)
+    with np.load(_root() / f"{waveform_id}.npz", allow_pickle=False) as data:
+        end_time, bucket, levels = (int(x) for x in data["meta"])
+        n = len(data["signals"])
+        return WaveformIndex(
+            signals=[str(s) for s in data["signals"]],
+            widths=[int(w) for w in data["widths"]],
+            end_time=end_time,
+            bucket=bucket,
+            times=[data[f"t{i}"] for i in range(n)],
+            values=[data[f"v{i}"] for i in range(n)],
+            lo=[data[f"lo{k}"] for k in range(levels)],
+            hi=[data[f"hi{k}"] for k in range(levels)],
+            changes=[data[f"n{k}"] for k in range(levels)],
+        )
@@ -0,0 +1,309 @@
+"""Remote simulation workers and the client-side dispatcher.
+
+A worker is a small HTTP daemon (``fpga-testgen worker``) exposing:
+
+- ``GET /capabilities``: simulators installed, core budget, jobs running
+- ``POST /simulate``: JSON ``{design_sources, testbench, simulator, seeds,
+  saturate}``, answered with ``{"result": SimResult}``
+
+Sources travel with every request and nothing but the result comes back:
+paths into the worker's scratch space are dropped, and coverage is
+computed on the worker (where the VCD is) and returned as a compact
+``CoverageReport`` in ``SimResult.coverage``.
+
+``simulate()`` routes through ``Dispatcher`` when ``settings.sim_workers``
+lists worker URLs. Workers run the Verilog they are sent (``$system``
+included), so they listen on localhost by default; when
+``settings.worker_token`` is set, requests must carry it as a bearer token.
+"""
+
+from __future__ import annotations
+import hmac
+import json
+import shutil
+import threading
+import time
+import urllib.error
+import urllib.request
+from collections.abc import Callable, Sequence
+from dataclasses import asdict, dataclass
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from .config import settings
+from .schemas import CoverageReport, Diagnostic, ResourceUsage, SimResult
+
+PROTOCOL = 1
+SIMULATORS = ("iverilog", "verilator")
+_LOCAL_PATHS = ("vcd_path", "trace_path", "stdout_path", "stderr_path")
+
+
+# --- Wire format ---
+
+def encode_result(result: SimResult) -> dict:
+    data = asdict(result)
+    _drop_paths(data)
+    return data
+
+
+def _drop_paths(data: dict) -> None:
+    for key in _LOCAL_PATHS:
+        data[key] = None
+    for run in data["seed_runs"]:
+        _drop_paths(run)
+
+
+def decode_result(data: dict) -> SimResult:
+    return SimResult(**{
+        **data,
+        "resources": ResourceUsage(**data["resources"]) if data["resources"] else None,
+        "diagnostics": [Diagnostic(**d) for d in data["diagnostics"]],
+        "seed_runs": [decode_result(r) for r in data["seed_runs"]],
+        "coverage": CoverageReport(**data["coverage"]) if data["coverage"] else None,
+    })
+
+
+# --- Worker side ---
+
+def capabilities(active: int = 0) -> dict:
+    from . import cores
+
+    return {
+        "protocol": PROTOCOL,
+        "simulators": [s for s in SIMULATORS if shutil.which(s)],
+        "cores": cores.budget(),
+        "active": active,
+    }
+
+
+def run_job(request: dict, scratch: list[Path]) -> SimResult:
+    """Simulate one shipped job locally and attach its coverage.
+
+    The job's directories are appended to ``scratch``; the caller removes
+    them once the result is encoded.
+    """
+    from .design import DesignGraph
+    from .pipeline import _analyze, _CoverageSweep
+    from .simulator import simulate_local
+
+    design_sources, testbench = request["design_sources"], request["testbench"]
+    graph = DesignGraph.from_source(design_sources[0])
+    for i, source in enumerate(design_sources[1:], 1):
+        graph.add_source(f"design_{i}.v", source)
+    try:
+        module = graph.top_module(graph.resolve_top(testbench=testbench))
+    except (KeyError, ValueError):
+        module = None
+
+    seeds = request.get("seeds")
+    if not seeds:
+        result = simulate_local(design_sources, testbench, request.get("simulator"), scratch=scratch)
+        if result.success and module:
+            result.coverage = _analyze(result, module)
+        return result
+
+    sweep = _CoverageSweep(module) if module else None
+    stop_when = None
+    if sweep:
+        # The client's stop_when cannot cross the wire; the coverage-saturation
+        # rule the pipeline uses stands in for it when the client asked to stop early
+        stop_when = sweep if request.get("saturate") else (lambda wave: sweep(wave) and False)
+    result = simulate_local(design_sources, testbench, request.get("simulator"), seeds, stop_when, scratch)
+    if result.success and sweep:
+        result.coverage = sweep.merged
+    return result
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: WorkerServer
+    server_version = f"fpga-testgen-worker/{PROTOCOL}"
+
+    def _authorized(self) -> bool:
+        token = self.server.token
+        if not token:
+            return True
+        if hmac.compare_digest(self.headers.get("Authorization", ""), f"Bearer {token}"):
+            return True
+        self._send(401, {"error": "missing or wrong worker token"})
+        return False
+
+    def do_GET(self) -> None:
+        if not self._authorized():
+            return
+        if self.path != "/capabilities":
+            return self._send(404, {"error": "not found"})
+        self._send(200, capabilities(self.server.active))
+
+    def do_POST(self) -> None:
+        if not self._authorized():
+            return
+        if self.path != "/simulate":
+            return self._send(404, {"error": "not found"})
+        try:
+            request = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+        except ValueError as e:
+            return self._send(400, {"error": f"bad request: {e}"})
+
+        scratch: list[Path] = []
+        with self.server.lock:
+            self.server.active += 1
+        try:
+            body = {"result": encode_result(run_job(request, scratch))}
+        except Exception as e:
+            return self._send(500, {"error": f"{type(e).__name__}: {e}"})
+        finally:
+            with self.server.lock:
+                self.server.active -= 1
+            for path in scratch:
+                shutil.rmtree(path, ignore_errors=True)
+        self._send(200, body)
+
+    def _send(self, status: int, body: dict) -> None:
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format: str, *args) -> None:
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+class WorkerServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address: tuple[str, int], verbose: bool = False, token: str = "") -> None:
+        super().__init__(address, _Handler)
+        self.active = 0
+        self.lock = threading.Lock()
+        self.verbose = verbose
+        self.token = token
+
+
+# --- Client side ---
+
+@dataclass
+class _Worker:
+    url: str
+    simulators: tuple[str, ...] = ()
+    cores: int = 1
+    remote_active: int = 0  # jobs running there at the last poll (all clients)
+    inflight: int = 0  # jobs this process has sent and not yet got back
+    healthy: bool = False
+    polled_at: float = 0.0
+
+    @property
+    def load(self) -> float:
+        return (self.remote_active + self.inflight) / max(1, self.cores)
+
+
+class Dispatcher:
+    """Sends each job to the least loaded healthy worker that has its simulator.
+
+    Capabilities and load are polled every ``settings.worker_refresh``
+    seconds; a worker that cannot be reached is skipped until the next
+    poll. An error the worker reports for the job itself comes back as a
+    failed result instead, since another worker would fail the same way.
+    Without any usable worker the job runs locally.
+    """
+
+    def __init__(self, urls: Sequence[str]) -> None:
+        self.workers = [_Worker(url.rstrip("/")) for url in urls]
+        self._lock = threading.Lock()
+
+    def _request(self, url: str, data: bytes | None = None) -> urllib.request.Request:
+        headers = {"Content-Type": "application/json"}
+        if settings.worker_token:
+            headers["Authorization"] = f"Bearer {settings.worker_token}"
+        return urllib.request.Request(url, data=data, headers=headers)
+
+    def _poll(self, worker: _Worker) -> None:
+        try:
+            with urllib.request.urlopen(self._request(f"{worker.url}/capabilities"), timeout=5) as resp:
+                caps = json.loads(resp.read())
+            worker.simulators = tuple(caps["simulators"])
+            worker.cores = caps["cores"]
+            worker.remote_active = caps["active"]
+            worker.healthy = caps.get("protocol") == PROTOCOL
+        except (OSError, ValueError, KeyError):
+            worker.healthy = False
+        worker.polled_at = time.monotonic()
+
+    def _acquire(self, simulator: str, exclude: set[str]) -> _Worker | None:
+        now = time.monotonic()
+        stale = [w for w in self.workers if now - w.polled_at >= settings.worker_refresh]
+        for worker in stale:
+            self._poll(worker)
+        with self._lock:
+            usable = [
+                w for w in self.workers
+                if w.healthy and simulator in w.simulators and w.url not in exclude
+            ]
+            if not usable:
+                return None
+            worker = min(usable, key=lambda w: w.load)
+            worker.inflight += 1
+            return worker
+
+    def _release(self, worker: _Worker, failed: bool) -> None:
+        with self._lock:
+            worker.inflight -= 1
+            if failed:
+                worker.healthy = False
+
+    def simulate(
+        self,
+        design_source: str | Sequence[str],
+        testbench_source: str,
+        simulator: str | None = None,
+        seeds: Sequence[int] | None = None,
+        stop_when: Callable[[list[SimResult]], bool] | None = None,
+    ) -> SimResult:
+        from .simulator import simulate_local
+
+        sim = simulator or settings.default_simulator
+        design_sources = [design_source] if isinstance(design_source, str) else list(design_source)
+        body = json.dumps({
+            "design_sources": design_sources,
+            "testbench": testbench_source,
+            "simulator": sim,
+            "seeds": list(seeds) if seeds else None,
+            "saturate": stop_when is not None,
+        }).encode()
+
+        tried: set[str] = set()
+        while (worker := self._acquire(sim, tried)) is not None:
+            tried.add(worker.url)
+            failed = True
+            try:
+                req = self._request(f"{worker.url}/simulate", body)
+                with urllib.request.urlopen(req, timeout=settings.worker_timeout) as resp:
+                    result = decode_result(json.loads(resp.read())["result"])
+                failed = False
+            except urllib.error.HTTPError as e:
+                if e.code in (401, 404):
+                    continue  # misconfigured worker; it sits out until the next poll
+                failed = False
+                result = SimResult(success=False, stdout="", stderr="",
+                                   errors=[f"Worker {worker.url} failed the job: {_error_text(e)}"])
+            except (OSError, ValueError, KeyError, TypeError):
+                continue  # try the next worker; this one sits out until the next poll
+            finally:
+                self._release(worker, failed)
+            result.worker = worker.url
+            return result
+        return simulate_local(design_sources, testbench_source, sim, seeds, stop_when)
+
+
+def _error_text(error: urllib.error.HTTPError) -> str:
+    try:
+        return json.loads(error.read())["error"]
+    except (OSError, ValueError, KeyError, TypeError):
+        return f"HTTP {error.code}"
+
+
+@lru_cache(maxsize=4)
+def get_dispatcher(urls: str) -> Dispatcher:
+    return Dispatcher([u.strip() for u in urls.split(",") if u.strip()])
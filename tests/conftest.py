@@ -1,3 +1,17 @@
 from pathlib import Path
+import pytest
 
 FIXTURES = Path(__file__).parent / "fixtures"
+
+
+@pytest.fixture(autouse=True)
+def _isolated_cache_dir(tmp_path_factory, monkeypatch):
+    """Keep caches, core leases and history out of the real home directory."""
+    cache_dir = tmp_path_factory.mktemp("cache")
+    monkeypatch.setenv("CACHE_DIR", str(cache_dir))
+    try:
+        from fpga_testgen.config import settings
+
+        monkeypatch.setattr(settings, "cache_dir", cache_dir)
+    except ImportError:
+        pass  # settings need pydantic-settings; tests without it never touch the cache
@@ -0,0 +1,94 @@
+"""Tests for the artifact store and its download endpoint."""
+
+import gzip
+import os
+import pytest
+
+pytest.importorskip("pydantic_settings")
+
+from fpga_testgen.artifacts import ArtifactStore  # noqa: E402
+
+
+def test_put_read_and_range(tmp_path):
+    store = ArtifactStore(tmp_path / "a", max_bytes=1 << 20)
+    src = tmp_path / "sim.stdout"
+    src.write_bytes(bytes(range(256)) * 1000)
+    artifact = store.put_file(src, "stdout.log", "log")
+    assert artifact.size == 256000
+    assert store.get(artifact.id).name == "stdout.log"
+    assert b"".join(store.read(artifact.id)) == src.read_bytes()
+    assert b"".join(store.read(artifact.id, 10, 19)) == bytes(range(10, 20))
+    assert gzip.decompress(b"".join(store.read_gzip(artifact.id))) == src.read_bytes()
+    assert store.get("missing") is None
+    assert store.get("../etc") is None
+
+
+def test_lru_eviction_by_size(tmp_path):
+    store = ArtifactStore(tmp_path / "a", max_bytes=2500)
+    first = store.put_text("x" * 1000, "a.log", "log")
+    second = store.put_text("y" * 1000, "b.log", "log")
+    meta = store.root / f"{first.id}.json"
+    os.utime(meta, (1, 1))
+    os.utime(store.root / f"{second.id}.json", (0, 0))  # least recently used
+    store.put_text("z" * 1000, "c.log", "log")
+    assert store.get(second.id) is None
+    assert store.get(first.id) is not None
+
+
+def test_eviction_skips_entries_removed_by_another_process(tmp_path):
+    store = ArtifactStore(tmp_path / "a", max_bytes=1500)
+    first = store.put_text("x" * 1000, "a.log", "log")
+    (store.root / "gone.json").symlink_to(store.root / "deleted-meanwhile.json")
+    second = store.put_text("y" * 1000, "b.log", "log")
+    assert store.get(first.id) is None
+    assert store.get(second.id) is not None
+
+
+def test_only_spilled_output_and_requested_vcd_are_stored(tmp_path, monkeypatch):
+    pytest.importorskip("fastapi")
+    from fpga_testgen import artifacts, server
+    from fpga_testgen.schemas import SimResult
+
+    store = ArtifactStore(tmp_path / "a", max_bytes=1 << 20)
+    monkeypatch.setattr(artifacts, "get_store", lambda: store)
+    vcd = tmp_path / "dump.vcd"
+    vcd.write_text("$enddefinitions $end\n")
+    log = tmp_path / "sim.stdout"
+    log.write_text("line\n" * 100)
+
+    small = SimResult(success=True, stdout="PASS", stderr="", vcd_path=vcd)
+    assert server._store_artifacts(small) == {}
+    assert list(store.root.iterdir()) == []
+    assert set(server._store_artifacts(small, keep_vcd=True)) == {"vcd"}
+
+    spilled = SimResult(success=True, stdout="PASS ...", stderr="", vcd_path=vcd, stdout_path=log)
+    assert set(server._store_artifacts(spilled)) == {"stdout"}
+
+
+def test_download_endpoint(tmp_path, monkeypatch):
+    pytest.importorskip("fastapi")
+    pytest.importorskip("httpx")
+    from fastapi.testclient import TestClient
+    from fpga_testgen import artifacts, server
+
+    store = ArtifactStore(tmp_path / "a", max_bytes=1 << 20)
+    monkeypatch.setattr(artifacts, "get_store", lambda: store)
+    body = "".join(f"line {i}\n" for i in range(5000))
+    artifact = store.put_text(body, "stdout.log", "log")
+    client = TestClient(server.app)
+
+    r = client.get(f"/api/artifacts/{artifact.id}", headers={"Range": "bytes=0-9"})
+    assert r.status_code == 206
+    assert r.content == body[:10].encode()
+    assert r.headers["content-range"] == f"bytes 0-9/{len(body)}"
+
+    r = client.get(f"/api/artifacts/{artifact.id}", headers={"Range": "bytes=-7"})
+    assert r.content == b"e 4999\n"
+
+    r = client.get(f"/api/artifacts/{artifact.id}", headers={"Accept-Encoding": "gzip"})
+    assert r.status_code == 200
+    assert r.headers["content-encoding"] == "gzip"
+    assert r.text == body  # transparently decompressed by the client
+
+    assert client.get(f"/api/artifacts/{artifact.id}", headers={"Range": "bytes=999999-"}).status_code == 416
+    assert client.get("/api/artifacts/nope").status_code == 404
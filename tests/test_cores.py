@@ -0,0 +1,65 @@
+"""Tests for the shared core budget and Verilator build configuration."""
+
+import pytest
+
+pytest.importorskip("pydantic_settings")
+
+from fpga_testgen import cores, simulator  # noqa: E402
+from fpga_testgen.config import settings  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def budget(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "cache_dir", tmp_path)
+    monkeypatch.setattr(settings, "core_budget", 8)
+
+
+def test_leases_share_the_budget():
+    with cores.lease(6) as first:
+        assert first == 6
+        assert cores.free_cores() == 2
+        with cores.lease(6) as second:
+            assert second == 2
+            with cores.lease(4) as third:
+                assert third == 1  # exhausted budget still grants the minimum
+    assert cores.free_cores() == 8
+
+
+def test_dead_process_leases_are_reclaimed(tmp_path):
+    root = tmp_path / "cores"
+    root.mkdir()
+    (root / "999999999-stale.lease").write_text("8")
+    assert cores.free_cores() == 8
+    assert not (root / "999999999-stale.lease").exists()
+
+
+def test_small_designs_build_single_threaded(monkeypatch):
+    monkeypatch.setattr(settings, "verilator_mt_min_lines", 100)
+    assert simulator.verilator_config(["module m; endmodule\n"])["threads"] == 1
+    big = "wire w;\n" * 200
+    assert simulator.verilator_config([big])["threads"] == 3
+    assert simulator.verilator_config(["wire w;\n" * 5000])["threads"] == 8  # core budget
+
+
+def test_thread_count_ignores_current_load(monkeypatch):
+    monkeypatch.setattr(settings, "verilator_mt_min_lines", 100)
+    big = "wire w;\n" * 400
+    idle = simulator.verilator_config([big])
+    with cores.lease(7):
+        assert simulator.verilator_config([big]) == idle
+
+
+def test_explicit_threads_and_flags(monkeypatch):
+    monkeypatch.setattr(settings, "verilator_threads", 4)
+    config = simulator.verilator_config(["module m; endmodule\n"])
+    config["build_jobs"] = 6
+    cmd = simulator._verilator_cmd([], config)
+    assert cmd[cmd.index("--threads") + 1] == "4"
+    assert cmd[cmd.index("-j") + 1] == "6"
+    assert "-O3" in cmd and cmd[cmd.index("--x-assign") + 1] == "fast"
+
+
+def test_cache_key_depends_on_flags():
+    a = simulator._cache_key("verilator", ["module m; endmodule"], "", "-O3 fast 1")
+    b = simulator._cache_key("verilator", ["module m; endmodule"], "", "-O3 fast 4")
+    assert a != b
@@ -0,0 +1,61 @@
+"""Tests for VCD coverage analysis."""
+
+from pathlib import Path
+import pytest
+
+pytest.importorskip("vcdvcd")
+
+from fpga_testgen.coverage import analyze_coverage  # noqa: E402
+from fpga_testgen.parser import parse_verilog  # noqa: E402
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+
+def _vcd(states: list[str]) -> str:
+    lines = [
+        "$timescale 1ns $end",
+        "$scope module tb $end",
+        "$scope module dut $end",
+        "$var reg 2 ! state [1:0] $end",
+        "$var wire 1 \" sensor $end",
+        "$upscope $end",
+        "$upscope $end",
+        "$enddefinitions $end",
+    ]
+    for t, s in enumerate(states):
+        lines += [f"#{t * 10}", f"b{s} !", f"{t % 2}\""]
+    return "\n".join(lines) + "\n"
+
+
+def test_fsm_state_and_transition_coverage(tmp_path):
+    module = parse_verilog((FIXTURES / "fsm.v").read_text())
+    vcd = tmp_path / "dump.vcd"
+    # IDLE -> GREEN -> YELLOW -> IDLE (via reset); RED never reached
+    vcd.write_text(_vcd(["xx", "00", "01", "10", "00"]))
+
+    report = analyze_coverage(vcd, module)
+    fsm = report.fsm_coverage
+    assert fsm["state_register"] == "state"
+    assert fsm["visited_states"] == [0, 1, 2]
+    assert fsm["coverage_pct"] == 75.0
+    assert fsm["transition_coverage_pct"] == 50.0
+    assert ["YELLOW", "IDLE", 1] in fsm["visited_transitions"]
+
+
+def test_merge_seed_coverage(tmp_path):
+    from fpga_testgen.coverage import merge_coverage
+
+    module = parse_verilog((FIXTURES / "fsm.v").read_text())
+    reports = []
+    for i, states in enumerate((["00", "01", "10", "00"], ["00", "11", "00"])):
+        vcd = tmp_path / f"dump{i}.vcd"
+        vcd.write_text(_vcd(states))
+        reports.append(analyze_coverage(vcd, module))
+
+    merged = merge_coverage(reports)
+    fsm = merged.fsm_coverage
+    assert fsm["visited_states"] == [0, 1, 2, 3]
+    assert fsm["coverage_pct"] == 100.0
+    assert ["IDLE", "GREEN", 1] in fsm["visited_transitions"]
+    assert fsm["transition_coverage_pct"] >= max(r.fsm_coverage["transition_coverage_pct"] for r in reports)
+    assert merged.total_score >= max(r.total_score for r in reports)
@@ -0,0 +1,100 @@
+"""Tests for the hierarchical design graph."""
+
+from fpga_testgen.design import DesignGraph
+from fpga_testgen.parser import parse_modules
+
+ADDER = """
+module adder #(parameter W = 4) (input [3:0] a, input [3:0] b, output [3:0] s);
+    assign s = a + b;
+endmodule
+"""
+
+ACC = """
+module acc(input clk, input [3:0] x, output reg [3:0] q);
+    wire [3:0] sum;
+    adder #(.W(4)) u_add (.a(q), .b(x), .s(sum));
+    always @(posedge clk) q <= sum;
+endmodule
+"""
+
+TOP = """
+module top(input clk, input [3:0] x, output [3:0] q);
+    acc u_acc (.clk(clk), .x(x), .q(q));
+endmodule
+"""
+
+OTHER = """
+module blinky(input clk, output reg led);
+    always @(posedge clk) led <= ~led;
+endmodule
+"""
+
+
+def _graph() -> DesignGraph:
+    graph = DesignGraph()
+    for name, src in [("adder.v", ADDER), ("acc.v", ACC), ("top.v", TOP), ("blinky.v", OTHER)]:
+        graph.add_source(name, src)
+    return graph
+
+
+def test_parse_modules_and_instances():
+    mods = parse_modules(ADDER + ACC)
+    assert [m.name for m in mods] == ["adder", "acc"]
+    assert mods[1].instances == ["adder"]
+    assert mods[0].instances == []
+
+
+def test_calls_with_a_space_are_not_instances():
+    src = """
+module top(input clk, input a, output reg y, output z);
+    function bar(input v); bar = ~v; endfunction
+    assign z = bar (a);
+    initial begin
+        wait (a);
+        disable blk;
+        y = bar (a);
+    end
+    adder#(4)u_add(.a(a));
+    acc  u_acc  (.clk(clk));
+endmodule
+"""
+    graph = DesignGraph.from_source(src)
+    assert graph.top_module("top").instances == ["adder", "acc"]
+    assert graph.missing("top") == ["adder", "acc"]
+
+
+def test_dependencies_and_files():
+    graph = _graph()
+    assert graph.tops() == ["top", "blinky"]
+    assert graph.dependencies("top") == ["adder", "acc", "top"]
+    assert graph.files_for("top") == ["adder.v", "acc.v", "top.v"]
+    assert graph.files_for("blinky") == ["blinky.v"]
+    assert graph.dependents("adder") == {"acc", "top"}
+
+
+def test_resolve_top_from_testbench():
+    graph = _graph()
+    tb = "module tb; reg clk; wire led; blinky dut (.clk(clk), .led(led)); endmodule"
+    assert graph.resolve_top(testbench=tb) == "blinky"
+    assert graph.resolve_top("acc") == "acc"
+
+
+def test_leaf_edit_invalidates_only_dependents():
+    graph = _graph()
+    before = {n: graph.digest(n) for n in graph.nodes}
+    graph.add_source("adder.v", ADDER.replace("a + b", "a - b"))
+    after = {n: graph.digest(n) for n in graph.nodes}
+    changed = {n for n in before if before[n] != after[n]}
+    assert changed == {"adder", "acc", "top"}
+
+
+def test_comment_edit_keeps_digest():
+    graph = _graph()
+    before = graph.digest("top")
+    graph.add_source("adder.v", "// header comment\n" + ADDER)
+    assert graph.digest("top") == before
+
+
+def test_missing_submodule():
+    graph = DesignGraph.from_source(TOP)
+    assert graph.missing("top") == ["acc"]
@@ -0,0 +1,90 @@
+"""Tests for candidate testbench fingerprints and the dedup index."""
+
+import pytest
+
+pytest.importorskip("pydantic_settings")
+
+from fpga_testgen import fingerprint, pipeline  # noqa: E402
+from fpga_testgen.config import settings  # noqa: E402
+from fpga_testgen.parser import parse_verilog  # noqa: E402
+from fpga_testgen.schemas import SimResult  # noqa: E402
+
+CHECKS = "".join(f"    a = 8'd{v}; #1 if (y !== a) $display(\"FAIL: {v}\");\n" for v in (1, 2, 4, 8, 16, 32))
+TB = """module tb;
+  reg [7:0] a;
+  wire [7:0] y;
+  buf8 dut(.a(a), .y(y));
+  initial begin
+    $dumpfile("dump.vcd");
+    a = 8'hFF;  // all ones
+    if (a !== 8'hff) $display("FAIL: a=%h", a);
+    else $display("PASS: 1 tests passed");
+""" + CHECKS + """    $finish;
+  end
+endmodule
+"""
+
+
+def test_cosmetic_changes_keep_fingerprint():
+    cosmetic = (
+        TB.replace("  ", "\t").replace("// all ones", "/* max */")
+        .replace("8'hFF", "8'hF_F")
+        .replace('"PASS: 1 tests passed"', '"ok, all good"')
+        .replace('"FAIL: a=%h"', '"fail! got %h"')
+    )
+    assert fingerprint.fingerprint(cosmetic) == fingerprint.fingerprint(TB)
+
+
+def test_functional_changes_change_fingerprint():
+    base = fingerprint.fingerprint(TB)
+    assert fingerprint.fingerprint(TB.replace("!==", "===")) != base
+    assert fingerprint.fingerprint(TB.replace('"dump.vcd"', '"wave.vcd"')) != base
+    # Whether a message prints FAIL decides the outcome
+    assert fingerprint.fingerprint(TB.replace('"FAIL: a=%h"', '"mismatch a=%h"')) != base
+    # ... and a fail_count summary is not a failure, however it is spelled
+    assert fingerprint.fingerprint(TB.replace('"FAIL: a=%h"', '"fail_count=%0d"')) != base
+    assert (fingerprint.fingerprint(TB.replace('"FAIL: a=%h"', '"fail_count=%0d"'))
+            == fingerprint.fingerprint(TB.replace('"FAIL: a=%h"', '"mismatch a=%h"')))
+
+
+def test_index_lru_and_nearest():
+    index = fingerprint.CandidateIndex(max_entries=2)
+    failed = SimResult(success=False, stdout="", stderr="", errors=["FAIL: a=00"])
+    index.add("d1", TB, failed, None)
+    assert index.lookup("d1", TB.replace("  ", " ")).sim_result is failed
+    assert index.lookup("d2", TB) is None
+
+    edited = TB.replace("$finish;", "#10 $finish;")
+    other, score = index.nearest("d1", edited)
+    assert other.sim_result is failed and settings.near_duplicate_threshold <= score < 1.0
+
+    index.add("d1", edited, failed, None)
+    index.lookup("d1", TB)  # refresh TB, so "edited" is least recently used
+    index.add("d1", TB.replace("8'hFF", "8'h00"), failed, None)
+    assert len(index) == 2
+    assert index.lookup("d1", edited) is None
+
+
+def test_pipeline_answers_duplicates_from_index(monkeypatch):
+    module = parse_verilog("module m(input a, output y); assign y = a; endmodule")
+    calls = []
+
+    def fake_simulate(design_sources, testbench, simulator, module):
+        calls.append(testbench)
+        return SimResult(success=False, stdout="", stderr="", errors=["FAIL: a=00"]), None
+
+    monkeypatch.setattr(pipeline, "_simulate", fake_simulate)
+    monkeypatch.setattr(settings, "candidate_dedup", True)
+    fingerprint.get_index.cache_clear()
+
+    result, _, hints = pipeline._evaluate("k", [], TB, None, module)
+    assert not result.success and hints == []
+    result, _, hints = pipeline._evaluate("k", [], TB.replace("// all ones", ""), None, module)
+    assert len(calls) == 1
+    assert result.errors == ["FAIL: a=00"]
+    assert "identical" in hints[0]
+
+    _, _, hints = pipeline._evaluate("k", [], TB.replace("$finish;", "#10 $finish;"), None, module)
+    assert len(calls) == 2
+    assert "% the same" in hints[0]
+    fingerprint.get_index.cache_clear()
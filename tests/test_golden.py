@@ -0,0 +1,55 @@
+"""Tests for golden output trace comparison."""
+
+import pytest
+
+pytest.importorskip("numpy")
+pytest.importorskip("pydantic_settings")
+
+from fpga_testgen.golden import compare_traces, load_trace, read_trace, save_trace  # noqa: E402
+from fpga_testgen.parser import parse_verilog  # noqa: E402
+
+SRC = """
+module pair(input [3:0] a, output [3:0] y, output z);
+    assign y = a;
+    assign z = ^a;
+endmodule
+"""
+
+
+def _trace(tmp_path, text, name="trace.txt"):
+    path = tmp_path / name
+    path.write_text(text)
+    return read_trace(path, parse_verilog(SRC))
+
+
+def test_read_trace_packs_values(tmp_path):
+    trace = _trace(tmp_path, "0011 0\n1111 0\nxx01 1\n")
+    assert trace.signals == ["y", "z"]
+    assert trace.samples == 3
+    assert trace.values[:, 0].tolist() == [3, 15, 1]
+    assert trace.xmask[:, 0].tolist() == [0, 0, 12]
+
+
+def test_identical_traces_match(tmp_path):
+    golden = _trace(tmp_path, "0011 0\n1111 0\n")
+    assert compare_traces(golden, _trace(tmp_path, "0011 0\n1111 0\n", "b.txt")) == []
+
+
+def test_mismatch_reported(tmp_path):
+    golden = _trace(tmp_path, "0011 0\n1111 0\n")
+    errors = compare_traces(golden, _trace(tmp_path, "0011 0\n1110 0\n", "b.txt"))
+    assert errors == ["FAIL: sample 1: y expected 4'hf got 4'he"]
+
+
+def test_golden_x_is_dont_care(tmp_path):
+    golden = _trace(tmp_path, "xx11 0\n")
+    assert compare_traces(golden, _trace(tmp_path, "1011 0\n", "b.txt")) == []
+    assert compare_traces(_trace(tmp_path, "1011 0\n", "c.txt"), golden) != []
+
+
+def test_save_load_roundtrip(tmp_path):
+    golden = _trace(tmp_path, "0011 0\n1111 1\n")
+    save_trace(golden, tmp_path / "g.npz")
+    loaded = load_trace(tmp_path / "g.npz")
+    assert loaded.signals == golden.signals
+    assert compare_traces(golden, loaded) == []
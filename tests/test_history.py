@@ -0,0 +1,91 @@
+"""Tests for the run history store."""
+
+import pytest
+
+pytest.importorskip("pydantic_settings")
+
+from fpga_testgen.history import RunStore  # noqa: E402
+from fpga_testgen.parser import parse_verilog  # noqa: E402
+from fpga_testgen.schemas import CoverageReport, PipelineResult, SimResult  # noqa: E402
+
+SRC = "module inv(input a, output y); assign y = ~a; endmodule"
+
+
+def _result(passed: bool, score: float | None = None, source: str = "llm") -> PipelineResult:
+    coverage = CoverageReport({"y": 100.0}, 100.0, None, score) if score is not None else None
+    return PipelineResult(
+        module=parse_verilog(SRC),
+        testbench=f"// tb {source} {score}",
+        description="desc",
+        sim_result=SimResult(success=passed, stdout="PASS" if passed else "", stderr="",
+                             errors=[] if passed else ["FAIL: y"]),
+        coverage=coverage,
+        attempts=1,
+        source=source,
+    )
+
+
+def test_record_and_get(tmp_path):
+    store = RunStore(tmp_path / "h.db")
+    run_id = store.record(_result(False), "abc", "iverilog")
+    run = store.get(run_id)
+    assert run.module_name == "inv"
+    assert not run.passed
+    assert run.errors == ["FAIL: y"]
+    assert run.coverage is None
+    assert store.get(run_id + 1) is None
+
+
+def test_keyset_pagination(tmp_path):
+    store = RunStore(tmp_path / "h.db")
+    ids = [store.record(_result(i % 2 == 0, 50.0), "abc", "iverilog") for i in range(7)]
+    page = store.query(limit=3)
+    assert [r.id for r in page] == ids[::-1][:3]
+    assert page[0].testbench == ""  # summaries omit the blobs
+    rest = store.query(before=page[-1].id, limit=10)
+    assert [r.id for r in rest] == ids[::-1][3:]
+    assert all(r.passed for r in store.query(passed=True))
+    assert len(store.query(passed=False)) == 3
+    assert store.query(module_name="other") == []
+
+
+def test_find_passing_prefers_best_score(tmp_path):
+    store = RunStore(tmp_path / "h.db")
+    store.record(_result(False), "abc", "iverilog")
+    assert store.find_passing("abc", "iverilog") is None
+    store.record(_result(True, 60.0, "template"), "abc", "iverilog")
+    best = store.record(_result(True, 95.0), "abc", "iverilog")
+    store.record(_result(True, 99.0), "abc", "verilator")
+    hit = store.find_passing("abc", "iverilog")
+    assert hit.id == best
+    assert hit.coverage.total_score == 95.0
+    assert store.find_passing("other", "iverilog") is None
+
+
+def test_find_passing_min_score(tmp_path):
+    store = RunStore(tmp_path / "h.db")
+    store.record(_result(True, 40.0, "template"), "abc", "iverilog")
+    store.record(_result(True), "abc", "iverilog")  # passed without coverage
+    assert store.find_passing("abc", "iverilog", 80.0) is None
+    assert store.find_passing("abc", "iverilog").coverage.total_score == 40.0
+
+
+def test_pipeline_skips_low_coverage_history(tmp_path, monkeypatch):
+    from fpga_testgen import history, pipeline
+    from fpga_testgen.config import settings
+    from fpga_testgen.design import DesignGraph
+
+    monkeypatch.setattr(settings, "history_db", tmp_path / "h.db")
+    monkeypatch.setattr(settings, "coverage_target", 80.0)
+    history.get_store.cache_clear()
+    monkeypatch.setattr(pipeline, "_generate", lambda *a: _result(True, 90.0))
+    try:
+        graph = DesignGraph.from_source(SRC)
+        store = history.get_store()
+        store.record(_result(True, 40.0, "template"), graph.digest("inv"), "iverilog")
+
+        assert pipeline.run_pipeline(graph, simulator="iverilog").source == "llm"
+        assert pipeline.run_pipeline(graph, simulator="iverilog").source == "history"
+        assert pipeline.run_pipeline(graph, simulator="iverilog", reuse=False).source == "llm"
+    finally:
+        history.get_store.cache_clear()
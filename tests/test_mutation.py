@@ -0,0 +1,116 @@
+"""Tests for batched mutation testing."""
+
+from pathlib import Path
+from fpga_testgen import mutation, simulator
+from fpga_testgen.parser import parse_modules
+from fpga_testgen.schemas import SimResult
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+
+def test_alu_mutants_are_guarded():
+    src = (FIXTURES / "alu.v").read_text()
+    (mutated,), mutants = mutation.generate_mutants([src], max_mutants=0)
+    kinds = {m.kind for m in mutants}
+    assert kinds == {"operator", "constant"}
+    assert any(m.original == "a + b" and m.mutated == "a - b" for m in mutants)
+    assert any(m.original == "~a" and m.mutated == "a" for m in mutants)
+    assert [m.id for m in mutants] == list(range(1, len(mutants) + 1))
+    assert "integer fpga_testgen_mutant = 0;" in mutated
+    assert '$value$plusargs("mutant=%d", fpga_testgen_mutant)' in mutated
+    assert "(fpga_testgen_mutant == 1) ? (a - b) : (a + b)" in mutated
+    # Still one parseable module with the same interface
+    (module,) = parse_modules(mutated)
+    assert [p.name for p in module.ports] == ["a", "b", "op", "result", "zero"]
+
+
+def test_conditions_and_replications():
+    src = (FIXTURES / "counter.v").read_text()
+    _, mutants = mutation.generate_mutants([src], max_mutants=0)
+    described = [m.describe() for m in mutants]
+    assert "line 14: condition !rst_n -> !(!rst_n)" in described
+    assert "line 17: operator count + 1'b1 -> count - 1'b1" in described
+    assert "line 15: constant {WIDTH{1'b0}} -> {WIDTH{(1'b0 ^ 1'b1)}}" in described
+    # Parameter declarations are never mutated
+    assert not any("WIDTH = " in m.original for m in mutants)
+
+
+def test_ignores_comments_declarations_and_loops():
+    src = """
+    module m(input [3:0] a, output reg [3:0] y);
+        localparam K = 4'd3;  // y = a + 1;
+        integer i;
+        always @(*) begin
+            y = 0;
+            for (i = 0; i < 4; i = i + 1)
+                y[i] = a[3 - i];
+        end
+    endmodule
+    """
+    _, mutants = mutation.generate_mutants([src], max_mutants=0)
+    assert [(m.kind, m.original, m.mutated) for m in mutants] == [("constant", "0", "(0 ^ 1'b1)")]
+
+
+def test_budget_keeps_spread_subset():
+    src = (FIXTURES / "alu.v").read_text()
+    _, everything = mutation.generate_mutants([src], max_mutants=0)
+    _, subset = mutation.generate_mutants([src], max_mutants=4)
+    assert len(subset) == 4
+    assert subset[0].describe() == everything[0].describe()
+    assert subset[-1].describe() == everything[-1].describe()
+
+
+def test_score_compiles_once(monkeypatch):
+    compiles, runs = [], []
+
+    def fake_compile(sources, tb, sim=None):
+        compiles.append(sources)
+        return simulator.CompiledSim("iverilog", Path("/nonexistent"))
+
+    def fake_run(compiled, plusargs=(), workdir=None):
+        runs.append(plusargs[0])
+        mid = int(plusargs[0].split("=")[1])
+        return SimResult(success=mid % 2 == 0, stdout="", stderr="")  # odd mutants killed
+
+    monkeypatch.setattr(simulator, "compile_simulation", fake_compile)
+    monkeypatch.setattr(simulator, "run_simulation", fake_run)
+    src = (FIXTURES / "alu.v").read_text()
+    report = mutation.run_mutation_testing([src], "module tb; endmodule", "iverilog", max_mutants=6, jobs=3)
+    assert len(compiles) == 1
+    assert sorted(runs) == [f"+mutant={i}" for i in range(7)]
+    assert (report.total, report.killed, report.score) == (6, 3, 50.0)
+    assert len(report.survivors) == 3
+
+
+def test_generate_conditions_and_constant_functions_stay_constant():
+    src = """
+module gen #(parameter W = 4) (input clk, input [W-1:0] a, output [W-1:0] y, output reg q);
+    function integer clog2(input integer v);
+        begin clog2 = 0; while (v > 1) begin v = v >> 1; clog2 = clog2 + 1; end end
+    endfunction
+    function pick(input x); if (x) pick = 1'b0; else pick = 1'b1; endfunction
+    localparam AW = clog2(W);
+    generate
+        if (W > 2) begin : wide
+            assign y = a + 1;
+        end else begin : narrow
+            assign y = a;
+        end
+    endgenerate
+    if (AW == 2) begin : bare
+        defparam u.N = 3;
+    end
+    always @(posedge clk)
+        if (a == 0) q <= pick(a[0]);
+        else q <= 1'b0;
+endmodule
+"""
+    (mutated,), mutants = mutation.generate_mutants([src], max_mutants=0)
+    assert "if (W > 2)" in mutated and "if (AW == 2)" in mutated
+    assert "clog2 = clog2 + 1;" in mutated  # called from a localparam
+    assert "N = 3;" in mutated
+    originals = {(m.kind, m.original) for m in mutants}
+    assert ("operator", "a + 1") in originals  # assign inside generate is runtime
+    assert ("condition", "a == 0") in originals
+    assert ("condition", "x") in originals  # ordinary function
+    assert not any("W" in m.original or "clog2" in m.original or "v" == m.original for m in mutants)
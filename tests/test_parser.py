@@ -1,7 +1,8 @@
 """Tests for RTL parser."""
 
 from pathlib import Path
-from fpga_testgen.parser import parse_verilog
+import pytest
+from fpga_testgen.parser import eval_const_expr, parse_verilog
 
 FIXTURES = Path(__file__).parent / "fixtures"
 
@@ -13,11 +14,55 @@ def test_counter_module():
     assert len(mod.ports) == 5
     names = {p.name for p in mod.ports}
     assert names == {"clk", "rst_n", "enable", "count", "overflow"}
-    # count should have width > 1 — but it uses parameter WIDTH-1
-    # regex picks up WIDTH-1:0 as-is, so width defaults to 1 for parameterized
+    # count is declared [WIDTH-1:0] with WIDTH = 8
+    count = next(p for p in mod.ports if p.name == "count")
+    assert count.width == 8
     clk = next(p for p in mod.ports if p.name == "clk")
     assert clk.direction == "input"
     assert clk.width == 1
+    assert mod.clock is clk
+    assert mod.reset.name == "rst_n"
+    assert mod.reset_active_low
+    assert [p.name for p in mod.data_inputs] == ["enable"]
+    assert mod.total_input_bits == 1
+
+
+def test_parameter_override():
+    src = (FIXTURES / "counter.v").read_text()
+    mod = parse_verilog(src, overrides={"WIDTH": 16})
+    count = next(p for p in mod.ports if p.name == "count")
+    assert count.width == 16
+    assert mod.parameters == ["WIDTH=16"]
+
+
+def test_const_expr():
+    params = {"W": 8, "DEPTH": 16}
+    assert eval_const_expr("W-1", params) == 7
+    assert eval_const_expr("2*W-1", params) == 15
+    assert eval_const_expr("$clog2(DEPTH)-1", params) == 3
+    assert eval_const_expr("8'hFF", params) == 255
+    assert eval_const_expr("W > 4 ? W : 4", params) == 8
+    assert eval_const_expr("1 << 2 + 1") == 8
+    assert eval_const_expr("2 ** 3 ** 2") == 512
+    with pytest.raises(ValueError):
+        eval_const_expr("UNKNOWN + 1", params)
+
+
+def test_dependent_parameters_and_body_ports():
+    src = """
+    module fifo(clk, din, dout);
+        parameter W = 4, DEPTH = 8;
+        localparam AW = $clog2(DEPTH);
+        input clk;
+        input [2*W-1:0] din;
+        output [AW:0] dout;
+    endmodule
+    """
+    mod = parse_verilog(src)
+    assert mod.param_values == {"W": 4, "DEPTH": 8, "AW": 3}
+    assert mod.parameters == ["W=4", "DEPTH=8"]
+    widths = {p.name: p.width for p in mod.ports}
+    assert widths == {"clk": 1, "din": 8, "dout": 4}
 
 
 def test_alu_module():
@@ -47,6 +92,7 @@ def test_fsm_module():
     param_names = [p.split("=")[0] for p in mod.parameters]
     assert "IDLE" in param_names
     assert "RED" in param_names
+    assert mod.state_params == {"IDLE": 0, "GREEN": 1, "YELLOW": 2, "RED": 3}
 
 
 def test_non_ansi_style():
@@ -77,3 +123,45 @@ def test_comments_stripped():
     assert len(mod.ports) == 2
     data = next(p for p in mod.ports if p.name == "data")
     assert data.width == 4
+
+
+def test_fsm_inferred_from_structure():
+    mod = parse_verilog((FIXTURES / "fsm.v").read_text())
+    assert len(mod.fsms) == 1
+    fsm = mod.fsms[0]
+    assert fsm.state_reg == "state"
+    assert fsm.transitions == [("IDLE", "GREEN"), ("GREEN", "YELLOW"), ("YELLOW", "RED"), ("RED", "IDLE")]
+
+
+def test_two_process_fsm_with_custom_names():
+    src = """
+    module handshake(input clk, input rst, input go, input ack, output busy);
+        localparam [1:0] PARK = 2'd0, ARM = 2'd1, FIRE = 2'd2;
+        reg [1:0] mode_q, mode_d;
+        always @(posedge clk)
+            if (rst) mode_q <= PARK;
+            else mode_q <= mode_d;
+        always @(*) begin
+            mode_d = mode_q;
+            case (mode_q)
+                PARK: if (go) mode_d = ARM;
+                ARM:  mode_d = ack ? FIRE : ARM;
+                FIRE: mode_d = PARK;
+                default: mode_d = PARK;
+            endcase
+        end
+        assign busy = (mode_q != PARK);
+    endmodule
+    """
+    mod = parse_verilog(src)
+    assert len(mod.fsms) == 1
+    fsm = mod.fsms[0]
+    assert fsm.state_reg == "mode_q"
+    assert fsm.next_reg == "mode_d"
+    assert fsm.states == {"PARK": 0, "ARM": 1, "FIRE": 2}
+    assert set(fsm.transitions) == {("PARK", "ARM"), ("ARM", "FIRE"), ("FIRE", "PARK")}
+
+
+def test_case_on_input_is_not_fsm():
+    src = (FIXTURES / "alu.v").read_text()
+    assert parse_verilog(src).fsms == []
@@ -0,0 +1,79 @@
+"""Tests for the pre-flight elaboration check."""
+
+import os
+import pytest
+
+pytest.importorskip("pydantic_settings")
+
+from fpga_testgen import preflight  # noqa: E402
+from fpga_testgen.config import settings  # noqa: E402
+
+IVERILOG_OUT = """\
+tb.v:7: syntax error
+tb.v:7: error: Invalid module instantiation
+tb.v:12: warning: Port 2 (b) of adder expects 8 bits, got 4.
+tb.v:12:        : Padding 4 high bits of the port.
+I give up.
+"""
+
+VERILATOR_OUT = """\
+%Warning-WIDTHTRUNC: tb.v:12:15: Operator ASSIGN expects 4 bits on the Assign RHS
+                              : ... note: In instance 'tb'
+%Error: design.v:3:5: Can't find definition of variable: 'q'
+%Error: Exiting due to 1 error(s)
+"""
+
+
+def test_parse_iverilog():
+    diags = preflight.parse_diagnostics(IVERILOG_OUT, "iverilog")
+    assert [(d.file, d.line, d.severity) for d in diags] == [
+        ("tb.v", 7, "error"), ("tb.v", 7, "error"), ("tb.v", 12, "warning"),
+    ]
+    assert diags[2].message.endswith("Padding 4 high bits of the port.")
+
+
+def test_parse_verilator():
+    diags = preflight.parse_diagnostics(VERILATOR_OUT, "verilator")
+    assert [(d.file, d.line, d.severity, d.code) for d in diags] == [
+        ("tb.v", 12, "warning", "WIDTHTRUNC"), ("design.v", 3, "error", None),
+    ]
+
+
+def test_errors_carry_source_line():
+    diags = preflight.parse_diagnostics("tb.v:2: error: Unknown module type: addr", "iverilog")
+    lines = preflight.format_diagnostics(diags, ["module adder; endmodule"], "module tb;\n  addr u0();\nendmodule")
+    assert lines == ["tb.v:2: error: Unknown module type: addr\n    2 | addr u0();"]
+
+
+@pytest.fixture
+def fake_iverilog(tmp_path, monkeypatch):
+    """An ``iverilog`` that rejects any tb.v containing 'bad' and counts its calls."""
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    calls = tmp_path / "calls"
+    script = bin_dir / "iverilog"
+    script.write_text(
+        "#!/bin/sh\n"
+        f"echo x >> {calls}\n"
+        "if [ -f tb.v ] && grep -n bad tb.v >/dev/null; then\n"
+        "  echo \"tb.v:$(grep -n bad tb.v | cut -d: -f1): error: bad statement\" >&2\n"
+        "  echo '1 error(s) during elaboration.' >&2; exit 1\n"
+        "fi\n"
+    )
+    script.chmod(0o755)
+    monkeypatch.setenv("PATH", f"{bin_dir}{os.pathsep}{os.environ['PATH']}")
+    monkeypatch.setattr(settings, "cache_dir", tmp_path / "cache")
+    return lambda: len(calls.read_text().splitlines()) if calls.exists() else 0
+
+
+def test_preflight_rejects_and_caches(fake_iverilog):
+    design = ["module m; endmodule\n"]
+    failure = preflight.preflight(design, "module tb;\n  bad;\nendmodule\n", "iverilog")
+    assert not failure.success
+    assert failure.diagnostics[0].line == 2
+    assert failure.errors[0].endswith("2 | bad;")
+
+    assert preflight.preflight(design, "module tb;\nendmodule\n", "iverilog") is None
+    assert preflight.check_design(design, "m", "iverilog") == []
+    assert preflight.check_design(design, "m", "iverilog") == []
+    assert fake_iverilog() == 3  # the repeated design check came from the cache
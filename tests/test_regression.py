@@ -0,0 +1,58 @@
+"""Tests for incremental regression."""
+
+import shutil
+from pathlib import Path
+from fpga_testgen import regression, simulator
+from fpga_testgen.schemas import SimResult
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+
+def _setup(tmp_path, monkeypatch):
+    for name in ("alu.v", "alu_tb.v", "counter.v", "counter_tb.v", "fsm.v", "traffic_light_tb.v"):
+        shutil.copy(FIXTURES / name, tmp_path / name)
+    calls = []
+
+    def fake_simulate(design, testbench, sim=None):
+        calls.append(testbench)
+        return SimResult(success=True, stdout="PASS", stderr="")
+
+    monkeypatch.setattr(simulator, "simulate", fake_simulate)
+    return calls
+
+
+def test_only_changed_pairs_rerun(tmp_path, monkeypatch):
+    calls = _setup(tmp_path, monkeypatch)
+    first = regression.run_regression(tmp_path, simulator="iverilog", jobs=2)
+    assert [e.testbench for e in first] == ["alu_tb.v", "counter_tb.v", "traffic_light_tb.v"]
+    assert [e.top for e in first] == ["alu", "counter", "traffic_light"]
+    assert len(calls) == 3 and not any(e.reused for e in first)
+
+    # Comment-only edits do not invalidate anything
+    calls.clear()
+    alu = tmp_path / "alu.v"
+    alu.write_text("// reviewed\n" + alu.read_text())
+    second = regression.run_regression(tmp_path, simulator="iverilog")
+    assert calls == [] and all(e.reused for e in second)
+
+    # A real RTL change re-runs just its testbench
+    alu.write_text(alu.read_text().replace("a + b", "a - b"))
+    third = regression.run_regression(tmp_path, simulator="iverilog")
+    assert len(calls) == 1
+    assert [e.reused for e in third] == [False, True, True]
+
+
+def test_force_and_simulator_change_rerun(tmp_path, monkeypatch):
+    calls = _setup(tmp_path, monkeypatch)
+    regression.run_regression(tmp_path, simulator="iverilog")
+    regression.run_regression(tmp_path, simulator="verilator")
+    regression.run_regression(tmp_path, simulator="verilator", force=True)
+    assert len(calls) == 9
+
+
+def test_orphan_testbench(tmp_path, monkeypatch):
+    _setup(tmp_path, monkeypatch)
+    (tmp_path / "ghost_tb.v").write_text("module tb; ghost g (); endmodule\n")
+    entries = {e.testbench: e for e in regression.run_regression(tmp_path, simulator="iverilog")}
+    assert not entries["ghost_tb.v"].passed
+    assert "no design module" in entries["ghost_tb.v"].errors[0]
@@ -0,0 +1,76 @@
+"""Test the pre-forking server: several workers, shared job table, clean drain."""
+
+import json
+import os
+import signal
+import socket
+import subprocess
+import sys
+import time
+import urllib.request
+from pathlib import Path
+import pytest
+
+pytest.importorskip("uvicorn")
+pytest.importorskip("fastapi")
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _get(url: str) -> dict:
+    with urllib.request.urlopen(url, timeout=5) as resp:
+        return json.loads(resp.read())
+
+
+def test_prefork_serves_and_drains(tmp_path):
+    port = _free_port()
+    env = {
+        **os.environ,
+        "CACHE_DIR": str(tmp_path),
+        "PYTHONPATH": str(Path(__file__).parent.parent),
+    }
+    code = (
+        "from fpga_testgen.serving import serve; "
+        f"serve('127.0.0.1', {port}, workers=2, preload=True, drain_timeout=5, log_level='warning')"
+    )
+    proc = subprocess.Popen([sys.executable, "-c", code], env=env, stderr=subprocess.PIPE, text=True)
+    try:
+        for _ in range(100):
+            try:
+                assert _get(f"http://127.0.0.1:{port}/api/health")["status"] == "ok"
+                break
+            except OSError:
+                time.sleep(0.1)
+        else:
+            pytest.fail("server did not come up")
+        assert _get(f"http://127.0.0.1:{port}/api/jobs") == {"running": 0, "pids": [], "jobs": []}
+        assert (tmp_path / "shared.db").exists()
+    finally:
+        proc.send_signal(signal.SIGTERM)
+        _, err = proc.communicate(timeout=20)
+    assert proc.returncode == 0, err
+    assert "with 2 workers" in err
+
+
+def test_workers_failing_at_startup_are_reported_and_not_restarted(tmp_path):
+    env = {
+        **os.environ,
+        "CACHE_DIR": str(tmp_path),
+        "PYTHONPATH": str(Path(__file__).parent.parent),
+    }
+    code = (
+        "from fpga_testgen import serving\n"
+        "def broken(*args):\n"
+        "    raise RuntimeError('bad worker config')\n"
+        "serving._worker = broken\n"
+        f"serving.serve('127.0.0.1', {_free_port()}, workers=1)\n"
+    )
+    proc = subprocess.run([sys.executable, "-c", code], env=env, capture_output=True, text=True, timeout=30)
+    assert proc.returncode == 1
+    assert proc.stderr.count("RuntimeError: bad worker config") == 3
+    assert "not restarting it" in proc.stderr
+    assert "All server workers failed to start" in proc.stderr
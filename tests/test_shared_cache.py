@@ -0,0 +1,118 @@
+"""Tests for the cross-process SQLite cache and job table."""
+
+import pytest
+
+pytest.importorskip("pydantic_settings")
+
+from fpga_testgen.shared_cache import SharedCache  # noqa: E402
+
+
+def test_values_are_shared_between_connections(tmp_path):
+    a = SharedCache(tmp_path / "shared.db", 1 << 20)
+    b = SharedCache(tmp_path / "shared.db", 1 << 20)
+    a.put("parse", "k", ("module", 1))
+    assert b.get("parse", "k") == ("module", 1)
+    assert b.get("llm", "k") is None
+
+
+def test_memoize_computes_once(tmp_path):
+    cache = SharedCache(tmp_path / "shared.db", 1 << 20)
+    calls = []
+    compute = lambda: calls.append(1) or "tb"  # noqa: E731
+    assert cache.memoize("llm", "prompt", compute) == "tb"
+    assert cache.memoize("llm", "prompt", compute) == "tb"
+    assert len(calls) == 1
+
+
+def test_eviction_drops_least_recently_read(tmp_path):
+    cache = SharedCache(tmp_path / "shared.db", 2500)
+    for key in "abc":
+        cache.put("ns", key, b"x" * 1000)
+    assert cache.get("ns", "a") is None  # over the cap: oldest went first
+    cache.get("ns", "b")
+    cache.put("ns", "d", b"x" * 1000)
+    assert cache.get("ns", "b") is not None
+    assert cache.get("ns", "c") is None
+
+
+def test_jobs_visible_until_finished(tmp_path):
+    a = SharedCache(tmp_path / "shared.db", 1 << 20)
+    b = SharedCache(tmp_path / "shared.db", 1 << 20)
+    with a.job("generate", "alu") as job_id:
+        jobs = b.jobs()
+        assert [(j["id"], j["kind"], j["detail"]) for j in jobs] == [(job_id, "generate", "alu")]
+    assert b.jobs() == []
+
+
+def test_jobs_of_dead_processes_are_dropped(tmp_path):
+    cache = SharedCache(tmp_path / "shared.db", 1 << 20)
+    cache._db.execute(
+        "INSERT INTO jobs (id, kind, pid, started_at, detail) VALUES ('x', 'simulate', 999999999, 0, '')"
+    )
+    assert cache.jobs() == []
+
+
+def test_shared_parses(tmp_path, monkeypatch):
+    from fpga_testgen import design, shared_cache
+    from fpga_testgen.config import settings
+
+    monkeypatch.setattr(settings, "cache_dir", tmp_path)
+    monkeypatch.setattr(design, "_shared_parse", None)
+    other = SharedCache(tmp_path / "shared.db", 1 << 20)
+    other.put("parse-oldparser", "k", ("stale",))
+    other.put("llm", "k", "kept")
+    shared_cache._open.cache_clear()
+    shared_cache.share_parses()
+    try:
+        source = "module shared_leaf(input a, output y); assign y = a; endmodule\n"
+        design.DesignGraph.from_source(source)
+        rows = other._db.execute("SELECT namespace, COUNT(*) FROM entries GROUP BY namespace").fetchall()
+        assert dict(rows) == {shared_cache._parse_namespace(): 1, "llm": 1}
+    finally:
+        design._parse_file.cache_clear()
+        shared_cache._open.cache_clear()
+
+
+def test_only_passing_llm_answers_are_shared(monkeypatch):
+    import json
+    from types import SimpleNamespace
+    from fpga_testgen import generator, pipeline, shared_cache
+    from fpga_testgen.config import settings
+    from fpga_testgen.parser import parse_verilog
+    from fpga_testgen.schemas import SimResult
+
+    answers = iter(["bad 1", "good 1", "bad 2", "good 2"])
+    calls = []
+
+    def generate_content(model, contents, config):
+        calls.append(contents[0]["parts"][0]["text"])
+        return SimpleNamespace(text=json.dumps({"testbench": next(answers), "description": ""}))
+
+    def evaluate(design_key, design_sources, testbench, simulator, module):
+        ok = testbench.startswith("good")
+        return SimResult(success=ok, stdout="", stderr="", errors=[] if ok else ["FAIL: y"]), None, []
+
+    client = SimpleNamespace(models=SimpleNamespace(generate_content=generate_content))
+    monkeypatch.setattr(generator, "_create_client", lambda: client)
+    monkeypatch.setattr(pipeline, "_evaluate", evaluate)
+    monkeypatch.setattr(settings, "shared_cache", True)
+    monkeypatch.setattr(settings, "preflight", False)
+    shared_cache._open.cache_clear()
+    module = parse_verilog("module inv(input a, output y); assign y = ~a; endmodule")
+
+    def run():
+        return pipeline._generate(module, [module.raw_source], None, 3, False, "key")
+
+    try:
+        assert run().testbench == "good 1"
+        assert len(calls) == 2
+        # The failing first answer is not replayed: the API is asked again
+        second = run()
+        assert calls[2] == calls[0]
+        assert second.testbench == "good 2"
+        assert len(calls) == 4
+        # A passing answer is shared: its feedback prompt is answered from the cache
+        monkeypatch.setattr(generator, "_create_client", lambda: pytest.fail("API called"))
+        assert generator.generate_testbench(module, ["FAIL: y"], "bad 2") == ("good 2", "")
+    finally:
+        shared_cache._open.cache_clear()
@@ -0,0 +1,132 @@
+"""Tests for isolated simulator job execution."""
+
+import sys
+from pathlib import Path
+import pytest
+
+pytest.importorskip("pydantic_settings")
+
+from fpga_testgen import simulator  # noqa: E402
+from fpga_testgen.config import settings  # noqa: E402
+
+
+def test_job_captures_output_and_usage(tmp_path):
+    job = simulator._run_job(
+        [sys.executable, "-c", "print('PASS'); import sys; print('warn', file=sys.stderr)"],
+        tmp_path, "sim",
+    )
+    assert job.returncode == 0
+    assert job.limit_error is None
+    assert job.stdout.strip() == "PASS"
+    assert "warn" in job.stderr
+    assert job.usage.peak_rss_kb > 0
+
+
+def test_job_timeout_kills_process_group(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "sim_timeout", 1)
+    # The leader spawns a grandchild that would outlive a plain kill()
+    script = (
+        "import subprocess, sys, time;"
+        "subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(30)']);"
+        "time.sleep(30)"
+    )
+    job = simulator._run_job([sys.executable, "-c", script], tmp_path, "sim")
+    assert job.limit_error.startswith("timed out")
+    assert job.returncode != 0
+
+
+def test_job_vcd_cap(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "sim_max_vcd_mb", 1)
+    script = (
+        "import time\n"
+        "with open('dump.vcd', 'w') as f:\n"
+        "    while True:\n"
+        "        f.write('x' * 65536); f.flush(); time.sleep(0.001)\n"
+    )
+    job = simulator._run_job([sys.executable, "-c", script], tmp_path, "sim", watch=tmp_path / "dump.vcd")
+    assert job.limit_error == "VCD exceeded 1 MB"
+    assert "stopped" in simulator._finish(tmp_path, job, job.usage).errors[0]
+
+
+def test_job_file_size_limit(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "sim_max_output_mb", 1)
+    # Python ignores SIGXFSZ, so use a plain C tool like the simulators are
+    job = simulator._run_job(["sh", "-c", "head -c 4194304 /dev/zero > big.bin"], tmp_path, "sim")
+    assert job.limit_error == "output file exceeded 1 MB"
+
+
+@pytest.mark.parametrize("prlimit", [True, False])
+def test_job_limits_via_prlimit_or_trampoline(tmp_path, monkeypatch, prlimit):
+    if prlimit and not simulator._prlimit():
+        pytest.skip("prlimit not installed")
+    if not prlimit:
+        monkeypatch.setattr(simulator, "_prlimit", lambda: None)
+    monkeypatch.setattr(settings, "sim_max_output_mb", 1)
+    monkeypatch.setattr(settings, "sim_cpu_limit", 7)
+    job = simulator._run_job(["sh", "-c", "ulimit -t; head -c 4194304 /dev/zero > big.bin"], tmp_path, "sim")
+    assert job.stdout.strip() == "7"
+    assert job.limit_error == "output file exceeded 1 MB"
+
+
+def test_job_limits_from_concurrent_threads(tmp_path, monkeypatch):
+    from concurrent.futures import ThreadPoolExecutor
+
+    monkeypatch.setattr(settings, "sim_max_output_mb", 1)
+    cmd = ["sh", "-c", "sleep 0.1; head -c 4194304 /dev/zero > big.bin"]
+    dirs = [tmp_path / str(i) for i in range(8)]
+    for d in dirs:
+        d.mkdir()
+    with ThreadPoolExecutor(8) as pool:
+        jobs = list(pool.map(lambda d: simulator._run_job(cmd, d, "sim"), dirs))
+    assert all(job.limit_error == "output file exceeded 1 MB" for job in jobs)
+
+
+def _seeded(workdir: Path, script: str) -> simulator.CompiledSim:
+    # Stand-in for a compiled testbench: reads +seed=N like $value$plusargs
+    prelude = "import sys; seed = int(sys.argv[1].split('=')[1]);"
+    return simulator.CompiledSim("iverilog", workdir, command=[sys.executable, "-c", prelude + script])
+
+
+def test_seed_sweep_runs_every_seed(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "sim_jobs", 2)
+    result = simulator._sweep(_seeded(tmp_path, "print('PASS: seed', seed)"), [1, 2, 3], None)
+    assert result.success
+    assert [r.seed for r in result.seed_runs] == [1, 2, 3]
+    assert "PASS: seed 3" in result.seed_runs[2].stdout
+
+
+def test_seed_sweep_stops_early(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "sim_jobs", 2)
+    waves = []
+    result = simulator._sweep(_seeded(tmp_path, "print('PASS')"), list(range(1, 9)), lambda w: waves.append(w) or len(waves) == 2)
+    assert result.success
+    assert len(result.seed_runs) == 4
+
+
+def test_seed_sweep_reports_failing_seed(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "sim_jobs", 4)
+    result = simulator._sweep(_seeded(tmp_path, "print('FAIL: bad' if seed == 3 else 'PASS')"), [1, 2, 3, 4, 5, 6], None)
+    assert not result.success
+    assert len(result.seed_runs) == 4  # the failing wave ends the sweep
+    assert result.seed == 3
+    assert result.errors and result.errors[0].startswith("[seed 3] ")
+
+
+def test_large_output_is_spilled(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "inline_output_kb", 1)
+    script = "for i in range(5000): print('line', i)\nprint('FAIL: late mismatch')"
+    job = simulator._run_job([sys.executable, "-c", script], tmp_path, "sim")
+    assert job.stdout_spilled
+    assert len(job.stdout) < 1200
+    assert job.stdout.startswith("line 0\n")
+    assert "bytes truncated" in job.stdout
+    result = simulator._finish(tmp_path, job, job.usage)
+    assert result.stdout_path == tmp_path / "sim.stdout"
+    assert result.errors == ["FAIL: late mismatch"]
+
+
+def test_error_lines_are_capped(tmp_path):
+    job = simulator._run_job([sys.executable, "-c", "for i in range(80): print('FAIL:', i)"], tmp_path, "sim")
+    errors = simulator._finish(tmp_path, job, job.usage).errors
+    assert len(errors) == simulator.MAX_ERRORS + 1
+    assert errors[-1] == "... 30 more"
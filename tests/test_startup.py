@@ -0,0 +1,57 @@
+"""Startup-time budget for CLI subcommands.
+
+Each probe runs in a fresh interpreter, imports the CLI plus the modules a
+subcommand imports, and records the wall time and ``sys.modules``. Override
+the budget with FPGA_TESTGEN_STARTUP_BUDGET_MS on slow machines.
+"""
+
+import json
+import os
+import subprocess
+import sys
+import pytest
+
+pytest.importorskip("click")
+
+BUDGET = os.environ.get("FPGA_TESTGEN_STARTUP_BUDGET_MS")
+RUNS = 3
+HEAVY = ("google.genai", "vcdvcd", "pydantic_settings", "pydantic", "fastapi", "uvicorn", "numpy")
+
+# Modules each subcommand imports before doing real work
+COMMANDS = {
+    "parse": ["fpga_testgen.parser"],
+    "simulate": ["fpga_testgen.design", "fpga_testgen.simulator"],
+    "generate": ["fpga_testgen.design", "fpga_testgen.pipeline"],
+}
+
+_PROBE = """
+import json, sys, time
+t = time.perf_counter()
+import fpga_testgen.cli
+for name in {modules!r}:
+    __import__(name)
+elapsed = (time.perf_counter() - t) * 1000
+print(json.dumps({{"ms": elapsed, "modules": sorted(sys.modules)}}))
+"""
+
+
+def _probe(modules: list[str]) -> dict:
+    out = subprocess.run(
+        [sys.executable, "-c", _PROBE.format(modules=modules)],
+        capture_output=True, text=True, check=True,
+    )
+    return json.loads(out.stdout)
+
+
+@pytest.mark.parametrize("command", sorted(COMMANDS))
+def test_no_heavy_imports(command):
+    loaded = set(_probe(COMMANDS[command])["modules"])
+    assert not [m for m in HEAVY if m in loaded]
+
+
+@pytest.mark.skipif(BUDGET is None, reason="set FPGA_TESTGEN_STARTUP_BUDGET_MS to check startup time")
+@pytest.mark.parametrize("command", ["parse", "simulate"])
+def test_startup_budget(command):
+    budget = float(BUDGET)
+    best = min(_probe(COMMANDS[command])["ms"] for _ in range(RUNS))
+    assert best < budget, f"{command} startup took {best:.1f} ms (budget {budget} ms)"
@@ -0,0 +1,59 @@
+"""Tests for span tracing and Chrome trace export."""
+
+import json
+import pstats
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+
+from fpga_testgen import tracing
+
+
+def _spans(path):
+    return [e for e in json.loads(path.read_text())["traceEvents"] if e["ph"] == "X"]
+
+
+def test_span_is_noop_without_profile():
+    with tracing.span("idle"):
+        pass
+    assert tracing._current.get() is None
+
+
+def test_profile_records_nested_and_pooled_spans(tmp_path):
+    trace = tmp_path / "trace.json"
+
+    def work(i):
+        with tracing.span("simulate", seed=i):
+            return i
+
+    with tracing.profile(trace):
+        with tracing.span("generate", module="adder"):
+            with ThreadPoolExecutor(max_workers=2) as pool:
+                assert list(pool.map(tracing.bind(work), range(4))) == [0, 1, 2, 3]
+
+    spans = _spans(trace)
+    assert sorted(e["name"] for e in spans) == ["generate"] + ["simulate"] * 4
+    outer = next(e for e in spans if e["name"] == "generate")
+    assert outer["args"] == {"module": "adder"}
+    for e in spans:
+        assert outer["ts"] <= e["ts"] and e["ts"] + e["dur"] <= outer["ts"] + outer["dur"] + 1
+    names = [e for e in json.loads(trace.read_text())["traceEvents"] if e["ph"] == "M"]
+    assert {e["tid"] for e in names} == {e["tid"] for e in spans}
+
+
+def test_failed_span_records_error(tmp_path):
+    trace = tmp_path / "trace.json"
+    with pytest.raises(RuntimeError), tracing.profile(trace):
+        with tracing.span("compile"):
+            raise RuntimeError("boom")
+    assert _spans(trace)[0]["args"]["error"] == "RuntimeError"
+
+
+def test_python_profile_of_hot_spans(tmp_path):
+    trace = tmp_path / "trace.json"
+    with tracing.profile(trace, python=True):
+        with tracing.span("coverage", profile=True):
+            sorted(str(i) for i in range(1000))
+        with tracing.span("llm"):
+            pass
+    stats = pstats.Stats(str(tmp_path / "trace.json.prof"))
+    assert any(func[2] == "<genexpr>" for func in stats.stats)
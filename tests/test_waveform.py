@@ -0,0 +1,64 @@
+"""Tests for the multi-resolution waveform index."""
+
+import pytest
+
+pytest.importorskip("numpy")
+pytest.importorskip("vcdvcd")
+pytest.importorskip("pydantic_settings")
+
+from fpga_testgen import waveform  # noqa: E402
+from fpga_testgen.config import settings  # noqa: E402
+
+
+def _vcd(tmp_path, cycles: int):
+    lines = [
+        "$timescale 1ns $end",
+        "$scope module tb $end",
+        "$var reg 1 ! clk $end",
+        "$var reg 4 \" count [3:0] $end",
+        "$upscope $end",
+        "$enddefinitions $end",
+        "#0", "0!", "bx \"",
+    ]
+    for c in range(1, cycles + 1):
+        lines += [f"#{c * 5}", f"{c % 2}!"]
+        if c % 2 == 0:
+            lines.append(f"b{format((c // 2) % 16, 'b')} \"")
+    path = tmp_path / "dump.vcd"
+    path.write_text("\n".join(lines) + "\n")
+    return path
+
+
+def test_small_window_returns_raw_changes(tmp_path):
+    index = waveform.build_index(_vcd(tmp_path, 20))
+    assert index.signals == ["tb.clk", "tb.count[3:0]"]
+    assert index.widths == [1, 4]
+    assert index.end_time == 100
+    (count,) = index.window(["tb.count[3:0]"], 0, 30)
+    assert count["kind"] == "changes"
+    assert count["initial"] == -1  # X at time 0
+    assert count["times"] == [10, 20, 30]
+    assert count["values"] == [1, 2, 3]
+
+
+def test_large_window_is_bounded_and_summarized(tmp_path):
+    index = waveform.build_index(_vcd(tmp_path, 20000))
+    assert len(index.lo) > 1
+    clk, count = index.window(["tb.clk", "tb.count[3:0]"], 0, index.end_time, points=100)
+    assert clk["kind"] == count["kind"] == "buckets"
+    assert len(clk["times"]) <= 101
+    assert set(clk["lo"]) == {0} and set(clk["hi"]) == {1}
+    assert count["lo"][0] == -1  # the X at time 0 survives summarization
+    assert max(count["hi"]) == 15
+    assert sum(clk["changes"]) == 20001
+
+
+def test_save_and_load(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "cache_dir", tmp_path / "cache")
+    index = waveform.build_index(_vcd(tmp_path, 40))
+    waveform_id = waveform.save_index(index)
+    loaded = waveform.load_index(waveform_id)
+    assert loaded.signals == index.signals
+    assert loaded.window(["tb.clk"], 0, 50) == index.window(["tb.clk"], 0, 50)
+    with pytest.raises(FileNotFoundError):
+        waveform.load_index("../etc")
@@ -0,0 +1,190 @@
+"""Tests for remote simulation workers (two local worker processes)."""
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+import pytest
+
+pytest.importorskip("pydantic_settings")
+pytest.importorskip("vcdvcd")
+
+from fpga_testgen import simulator, worker  # noqa: E402
+from fpga_testgen.config import settings  # noqa: E402
+
+DESIGN = "module inv(input a, output y);\n  assign y = ~a;\nendmodule\n"
+TB = "module inv_tb;\n  reg a;\n  wire y;\n  inv dut(.a(a), .y(y));\nendmodule\n"
+
+VCD = """$timescale 1ns $end
+$scope module inv_tb $end
+$scope module dut $end
+$var wire 1 ! a $end
+$var wire 1 " y $end
+$upscope $end
+$upscope $end
+$enddefinitions $end
+#0
+0!
+1"
+#10
+1!
+0"
+#20
+0!
+1"
+"""
+
+_WORKER = """
+from fpga_testgen.worker import WorkerServer
+server = WorkerServer(("127.0.0.1", 0))
+print(server.server_address[1], flush=True)
+server.serve_forever()
+"""
+
+
+def _fake_simulators(root: Path) -> Path:
+    """A fake iverilog/vvp that dump a fixed VCD; returns their directory."""
+    bin_dir = root / "bin"
+    bin_dir.mkdir()
+    (root / "dump.vcd").write_text(VCD)
+    (bin_dir / "iverilog").write_text('#!/bin/sh\nwhile [ "$1" != "-o" ]; do shift; done\ntouch "$2"\n')
+    (bin_dir / "vvp").write_text(f'#!/bin/sh\ncp {root / "dump.vcd"} dump.vcd\necho "PASS: $*"\n')
+    for f in bin_dir.iterdir():
+        f.chmod(0o755)
+    return bin_dir
+
+
+@pytest.fixture(scope="module")
+def workers(tmp_path_factory):
+    """Two worker processes running the fake simulators."""
+    root = tmp_path_factory.mktemp("workers")
+    bin_dir = _fake_simulators(root)
+
+    env = {
+        **os.environ,
+        "PATH": f"{bin_dir}{os.pathsep}{os.environ['PATH']}",
+        "CACHE_DIR": str(root / "cache"),
+        "PYTHONPATH": str(Path(__file__).parent.parent),
+        "SIM_WORKERS": "",
+    }
+    procs = [
+        subprocess.Popen([sys.executable, "-c", _WORKER], env=env, stdout=subprocess.PIPE, text=True)
+        for _ in range(2)
+    ]
+    try:
+        yield [f"http://127.0.0.1:{int(p.stdout.readline())}" for p in procs]
+    finally:
+        for p in procs:
+            p.terminate()
+            p.wait()
+
+
+@pytest.fixture
+def dispatch(workers, monkeypatch):
+    monkeypatch.setattr(settings, "sim_workers", ",".join(workers))
+    worker.get_dispatcher.cache_clear()
+    yield worker.get_dispatcher(settings.sim_workers)
+    worker.get_dispatcher.cache_clear()
+
+
+def test_remote_simulation_returns_result_and_coverage(dispatch, workers):
+    result = simulator.simulate([DESIGN], TB, "iverilog")
+    assert result.success, result.errors
+    assert result.worker in workers
+    assert "PASS" in result.stdout
+    assert result.vcd_path is None  # the VCD stays on the worker
+    assert result.coverage.overall_toggle == 100.0
+
+
+def test_seed_sweep_runs_remotely(dispatch):
+    result = simulator.simulate([DESIGN], TB, "iverilog", seeds=[1, 2, 3])
+    assert result.success
+    assert [r.seed for r in result.seed_runs] == [1, 2, 3]
+    assert "+seed=3" in result.seed_runs[2].stdout
+    assert result.coverage is not None
+
+
+def test_jobs_are_spread_over_workers(dispatch, workers):
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(lambda _: simulator.simulate([DESIGN], TB, "iverilog"), range(16)))
+    assert all(r.success for r in results)
+    assert {r.worker for r in results} == set(workers)
+
+
+def test_unsupported_simulator_runs_locally(dispatch, monkeypatch):
+    monkeypatch.setattr(simulator.shutil, "which", lambda name: None)
+    result = simulator.simulate([DESIGN], TB, "verilator")
+    assert result.worker is None
+    assert "verilator not found" in result.errors[0]
+
+
+@pytest.fixture
+def local_worker(tmp_path, monkeypatch):
+    """An in-process worker whose scratch directories go to ``tmp_path / "tmp"``."""
+    monkeypatch.setenv("PATH", f"{_fake_simulators(tmp_path)}{os.pathsep}{os.environ['PATH']}")
+    monkeypatch.setattr(tempfile, "tempdir", str(tmp_path / "tmp"))
+    (tmp_path / "tmp").mkdir()
+    server = worker.WorkerServer(("127.0.0.1", 0), token="s3cret")
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def _post(url: str, body: dict, token: str | None = "s3cret") -> dict:
+    headers = {"Authorization": f"Bearer {token}"} if token else {}
+    req = urllib.request.Request(f"{url}/simulate", data=json.dumps(body).encode(), headers=headers)
+    with urllib.request.urlopen(req, timeout=30) as resp:
+        return json.loads(resp.read())
+
+
+def test_worker_removes_scratch_directories(local_worker, tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "compile_cache", False)
+    job = {"design_sources": [DESIGN], "testbench": TB, "simulator": "iverilog"}
+    assert _post(local_worker, {**job, "seeds": [1, 2, 3]})["result"]["success"]
+    assert _post(local_worker, job)["result"]["success"]
+    assert list((tmp_path / "tmp").iterdir()) == []
+
+
+def test_worker_requires_token(local_worker):
+    with pytest.raises(urllib.error.HTTPError) as e:
+        _post(local_worker, {}, token="wrong")
+    assert e.value.code == 401
+
+
+def test_job_error_is_a_failed_result_not_a_dead_worker(local_worker, monkeypatch):
+    def broken(request, scratch):
+        raise RuntimeError("cannot parse design")
+
+    monkeypatch.setattr(worker, "run_job", broken)
+    monkeypatch.setattr(settings, "worker_token", "s3cret")
+    dispatcher = worker.Dispatcher([local_worker])
+    result = dispatcher.simulate([DESIGN], TB, "iverilog")
+    assert not result.success
+    assert result.worker == local_worker
+    assert "cannot parse design" in result.errors[0]
+    assert dispatcher.workers[0].healthy
+
+
+def test_wire_format_round_trip():
+    from fpga_testgen.schemas import Diagnostic, ResourceUsage, SimResult
+
+    result = SimResult(
+        success=False, stdout="out", stderr="err", vcd_path=Path("/tmp/x/dump.vcd"),
+        errors=["tb.v:3: error: x"], diagnostics=[Diagnostic("tb.v", 3, "error", "x")],
+        resources=ResourceUsage(1.5, 2048, 10),
+        seed_runs=[SimResult(success=True, stdout="", stderr="", seed=1)],
+    )
+    decoded = worker.decode_result(worker.encode_result(result))
+    assert decoded.vcd_path is None
+    assert decoded.diagnostics == result.diagnostics
+    assert decoded.resources == result.resources
+    assert decoded.seed_runs[0].seed == 1
@@ -1,4 +1,4 @@
-import type { GenerateResponse, HealthResponse } from "./types";
+import type { GenerateResponse, HealthResponse, WaveformResponse } from "./types";
 
 const BASE = "/api";
 
@@ -19,3 +19,17 @@ export async function generateTestbench(rtl: string): Promise<GenerateResponse>
   }
   return res.json();
 }
+
+export async function fetchWaveform(
+  id: string, start: number, end: number | null, signals: string[], points: number,
+): Promise<WaveformResponse> {
+  const params = new URLSearchParams({ id, start: String(start), points: String(points) });
+  if (end !== null) params.set("end", String(end));
+  if (signals.length) params.set("signals", signals.join(","));
+  const res = await fetch(`${BASE}/waveform?${params}`);
+  if (!res.ok) {
+    const err = await res.json().catch(() => ({ detail: res.statusText }));
+    throw new Error(err.detail || "Waveform request failed");
+  }
+  return res.json();
+}
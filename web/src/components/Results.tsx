@@ -1,8 +1,9 @@
 import { useState } from "react";
 import MonacoEditor from "@monaco-editor/react";
 import type { GenerateResponse } from "../types";
+import { Waveform } from "./Waveform";
 
-type Tab = "testbench" | "simulation" | "coverage";
+type Tab = "testbench" | "simulation" | "coverage" | "waveform";
 
 interface Props {
   result: GenerateResponse | null;
@@ -26,6 +27,7 @@ export function Results({ result }: Props) {
     { key: "testbench", label: "Testbench" },
     { key: "simulation", label: "Simulation" },
     { key: "coverage", label: "Coverage" },
+    ...(result.waveform_id ? [{ key: "waveform" as Tab, label: "Waveform" }] : []),
   ];
 
   return (
@@ -48,7 +50,7 @@ export function Results({ result }: Props) {
         ))}
         <div style={{ flex: 1 }} />
         <div style={{ padding: "8px 12px", fontSize: 12, color: "#8b949e" }}>
-          {result.attempts} attempt{result.attempts > 1 ? "s" : ""} | {result.module.name}
+          {result.attempts} attempt{result.attempts > 1 ? "s" : ""} | {result.source} | {result.module.name}
         </div>
       </div>
 
@@ -87,6 +89,15 @@ export function Results({ result }: Props) {
                 ))}
               </div>
             )}
+            {Object.keys(result.artifacts).length > 0 && (
+              <div style={{ display: "flex", gap: 12, marginBottom: 8, fontSize: 12 }}>
+                {Object.entries(result.artifacts).map(([key, a]) => (
+                  <a key={key} href={`/api/artifacts/${a.id}`} download={a.name} style={{ color: "#58a6ff" }}>
+                    {a.name} ({(a.size / 1024).toFixed(1)} KB)
+                  </a>
+                ))}
+              </div>
+            )}
             <pre style={{ fontFamily: "monospace", fontSize: 12, whiteSpace: "pre-wrap", background: "#161b22", padding: 12, borderRadius: 6, border: "1px solid #30363d", maxHeight: 400, overflow: "auto" }}>
               {result.sim_output || "(no output)"}
             </pre>
@@ -100,6 +111,9 @@ export function Results({ result }: Props) {
                 <div style={{ display: "grid", gridTemplateColumns: "1fr 1fr", gap: 12, marginBottom: 16 }}>
                   <ScoreCard label="Total Score" value={result.coverage.total_score} />
                   <ScoreCard label="Toggle Coverage" value={result.coverage.overall_toggle} />
+                  {result.mutation && result.mutation.total > 0 && (
+                    <ScoreCard label={`Mutation Score (${result.mutation.killed}/${result.mutation.total})`} value={result.mutation.score} />
+                  )}
                 </div>
 
                 <h3 style={{ fontSize: 14, marginBottom: 8 }}>Signal Toggle Coverage</h3>
@@ -128,11 +142,14 @@ export function Results({ result }: Props) {
 
                 {result.coverage.fsm_coverage && (
                   <div style={{ marginTop: 16 }}>
-                    <h3 style={{ fontSize: 14, marginBottom: 8 }}>FSM State Coverage</h3>
+                    <h3 style={{ fontSize: 14, marginBottom: 8 }}>FSM Coverage ({result.coverage.fsm_coverage.state_register})</h3>
                     <div style={{ fontSize: 13 }}>
                       <div>Coverage: {result.coverage.fsm_coverage.coverage_pct}%</div>
                       <div>Declared states: [{result.coverage.fsm_coverage.declared_states.join(", ")}]</div>
                       <div>Visited states: [{result.coverage.fsm_coverage.visited_states.join(", ")}]</div>
+                      {result.coverage.fsm_coverage.transition_coverage_pct !== null && (
+                        <div>Transition coverage: {result.coverage.fsm_coverage.transition_coverage_pct}%</div>
+                      )}
                     </div>
                   </div>
                 )}
@@ -144,6 +161,8 @@ export function Results({ result }: Props) {
             )}
           </div>
         )}
+
+        {tab === "waveform" && result.waveform_id && <Waveform waveformId={result.waveform_id} />}
       </div>
     </div>
   );
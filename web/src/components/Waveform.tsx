@@ -0,0 +1,132 @@
+import { useEffect, useState } from "react";
+import { fetchWaveform } from "../api";
+import type { WaveformResponse, WaveformSignal } from "../types";
+
+const ROW = 28;
+const LABEL = 160;
+const WIDTH = 800;
+
+interface Props {
+  waveformId: string;
+}
+
+export function Waveform({ waveformId }: Props) {
+  const [wave, setWave] = useState<WaveformResponse | null>(null);
+  const [selected, setSelected] = useState<string[]>([]);
+  const [view, setView] = useState<{ start: number; end: number | null }>({ start: 0, end: null });
+  const [error, setError] = useState<string | null>(null);
+
+  useEffect(() => {
+    fetchWaveform(waveformId, view.start, view.end, selected, WIDTH)
+      .then((w) => { setWave(w); setError(null); })
+      .catch((e: Error) => setError(e.message));
+  }, [waveformId, view, selected]);
+
+  if (error) return <div style={{ padding: 16, color: "#f85149" }}>{error}</div>;
+  if (!wave) return <div style={{ padding: 16, color: "#484f58" }}>Loading waveform...</div>;
+
+  const span = Math.max(1, wave.end - wave.start);
+  const zoom = (factor: number) => {
+    const mid = (wave.start + wave.end) / 2;
+    const half = Math.max(1, (span * factor) / 2);
+    setView({ start: Math.max(0, Math.floor(mid - half)), end: Math.min(wave.end_time, Math.ceil(mid + half)) });
+  };
+  const pan = (dir: number) => {
+    const shift = Math.round(span * 0.5 * dir);
+    const start = Math.min(Math.max(0, wave.start + shift), Math.max(0, wave.end_time - span));
+    setView({ start, end: start + span });
+  };
+  const x = (t: number) => LABEL + ((Math.min(Math.max(t, wave.start), wave.end) - wave.start) / span) * WIDTH;
+
+  const button = { padding: "4px 10px", background: "#21262d", color: "#c9d1d9", border: "1px solid #30363d", borderRadius: 4, cursor: "pointer", fontSize: 12 };
+
+  return (
+    <div style={{ padding: 16 }}>
+      <div style={{ display: "flex", gap: 6, alignItems: "center", marginBottom: 8, fontSize: 12 }}>
+        <button style={button} onClick={() => pan(-1)}>&larr;</button>
+        <button style={button} onClick={() => zoom(0.5)}>+</button>
+        <button style={button} onClick={() => zoom(2)}>&minus;</button>
+        <button style={button} onClick={() => pan(1)}>&rarr;</button>
+        <button style={button} onClick={() => setView({ start: 0, end: null })}>Fit</button>
+        <span style={{ color: "#8b949e" }}>{wave.start} &ndash; {wave.end} / {wave.end_time}</span>
+        <div style={{ flex: 1 }} />
+        <select
+          multiple
+          value={wave.data.map((d) => d.name)}
+          onChange={(e) => setSelected(Array.from(e.target.selectedOptions, (o) => o.value))}
+          style={{ background: "#161b22", color: "#c9d1d9", border: "1px solid #30363d", height: 64, fontSize: 11 }}
+        >
+          {wave.signals.map((s) => <option key={s} value={s}>{s}</option>)}
+        </select>
+      </div>
+      <svg width={LABEL + WIDTH + 8} height={wave.data.length * ROW + 4} style={{ background: "#0d1117" }}>
+        {wave.data.map((sig, i) => (
+          <g key={sig.name} transform={`translate(0, ${i * ROW + 4})`}>
+            <text x={4} y={ROW / 2 + 4} fill="#8b949e" fontSize={11} fontFamily="monospace">
+              {sig.name.split(".").slice(-1)[0]}
+            </text>
+            <Trace sig={sig} x={x} end={wave.end} />
+          </g>
+        ))}
+      </svg>
+    </div>
+  );
+}
+
+function Trace({ sig, x, end }: { sig: WaveformSignal; x: (t: number) => number; end: number }) {
+  const hiY = 4;
+  const loY = ROW - 8;
+
+  if (sig.kind === "buckets") {
+    // Summarized: flat where the value held steady, a filled band where it changed
+    return (
+      <>
+        {sig.times.map((t, j) => {
+          const lo = sig.lo![j];
+          const hi = sig.hi![j];
+          const x0 = x(t);
+          const w = Math.max(1, x(t + sig.bucket!) - x0);
+          const color = lo < 0 ? "#f85149" : "#3fb950";
+          if (lo === hi && sig.changes![j] === 0) {
+            const y = sig.width === 1 ? (hi ? hiY : loY) : (hiY + loY) / 2;
+            return <line key={j} x1={x0} x2={x0 + w} y1={y} y2={y} stroke={color} />;
+          }
+          return <rect key={j} x={x0} y={hiY} width={w} height={loY - hiY} fill={color} opacity={0.5} />;
+        })}
+      </>
+    );
+  }
+
+  const times = [x(-Infinity), ...sig.times.map(x), x(end)];
+  const values = [sig.initial, ...sig.values!];
+  if (sig.width === 1) {
+    const points: string[] = [];
+    values.forEach((v, j) => {
+      const y = v < 0 ? (hiY + loY) / 2 : v ? hiY : loY;
+      points.push(`${times[j]},${y}`, `${times[j + 1]},${y}`);
+    });
+    return <polyline points={points.join(" ")} fill="none" stroke="#3fb950" />;
+  }
+  return (
+    <>
+      {values.map((v, j) => {
+        const x0 = times[j];
+        const x1 = times[j + 1];
+        const color = v < 0 ? "#f85149" : "#3fb950";
+        return (
+          <g key={j}>
+            <polygon
+              points={`${x0},${(hiY + loY) / 2} ${x0 + 2},${hiY} ${x1 - 2},${hiY} ${x1},${(hiY + loY) / 2} ${x1 - 2},${loY} ${x0 + 2},${loY}`}
+              fill="none" stroke={color}
+            />
+            {x1 - x0 > 30 && (
+              <text x={x0 + 4} y={(hiY + loY) / 2 + 4} fill="#c9d1d9" fontSize={10} fontFamily="monospace">
+                {v < 0 ? "x" : v.toString(16)}
+              </text>
+            )}
+          </g>
+        );
+      })}
+    </>
+  );
+}
@@ -8,19 +8,35 @@ export interface ModuleInfo {
   name: string;
   ports: PortInfo[];
   parameters: string[];
+  param_values: Record<string, number>;
+  clock: string | null;
+  reset: string | null;
+  total_input_bits: number;
 }
 
 export interface CoverageInfo {
   toggle_coverage: Record<string, number>;
   overall_toggle: number;
   fsm_coverage: {
+    state_register: string;
+    state_names: Record<string, number>;
     declared_states: number[];
     visited_states: number[];
     coverage_pct: number;
+    declared_transitions: [string, string][];
+    visited_transitions: [string, string, number][];
+    transition_coverage_pct: number | null;
   } | null;
   total_score: number;
 }
 
+export interface ArtifactInfo {
+  id: string;
+  name: string;
+  kind: string;
+  size: number;
+}
+
 export interface GenerateResponse {
   testbench: string;
   description: string;
@@ -30,6 +46,38 @@ export interface GenerateResponse {
   sim_errors: string[];
   coverage: CoverageInfo | null;
   attempts: number;
+  source: string;
+  waveform_id: string | null;
+  mutation: {
+    total: number;
+    killed: number;
+    score: number;
+    survivors: string[];
+    errors: string[];
+  } | null;
+  artifacts: Record<string, ArtifactInfo>;
+}
+
+export interface WaveformSignal {
+  name: string;
+  width: number;
+  initial: number; // -1 = X/Z
+  kind: "changes" | "buckets";
+  times: number[];
+  values: number[] | null;
+  bucket: number | null;
+  lo: number[] | null;
+  hi: number[] | null;
+  changes: number[] | null;
+}
+
+export interface WaveformResponse {
+  signals: string[];
+  widths: number[];
+  end_time: number;
+  start: number;
+  end: number;
+  data: WaveformSignal[];
 }
 
 export interface HealthResponse {